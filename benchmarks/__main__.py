@@ -0,0 +1,67 @@
+import argparse
+import sys
+
+from benchmarks.load import LoadResult, run_load
+from benchmarks.micro import MicroResult, run_micro
+from benchmarks.results import compare_results, load_results, save_results
+
+def main() -> int:
+    """
+        Runs the benchmarks or compares two result files.
+
+            python -m benchmarks run --output before.json
+            python -m benchmarks run --skip-load --output after.json
+            python -m benchmarks compare before.json after.json
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Corax benchmark suite.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmarks and store the results as JSON")
+    run.add_argument("--output", "-o", default="benchmark-results.json")
+    run.add_argument("--skip-micro", action="store_true")
+    run.add_argument("--skip-load", action="store_true")
+    run.add_argument("--select", default="", help="only run microbenchmarks with this name prefix")
+    run.add_argument("--min-time", type=float, default=0.2, help="seconds per microbenchmark round")
+    run.add_argument("--rounds", type=int, default=5)
+    run.add_argument("--scenarios", default="hello,static")
+    run.add_argument("--engines", default="sync,async")
+    run.add_argument("--concurrency", default="1,16,64")
+    run.add_argument("--duration", type=float, default=5.0, help="seconds per load level")
+    run.add_argument("--warmup", type=float, default=1.0)
+    run.add_argument("--client-processes", type=int, default=0)
+
+    compare = commands.add_parser("compare", help="compare two result files")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+    compare.add_argument("--threshold", type=float, default=5.0, help="regression threshold in percent")
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        regressions = compare_results(load_results(args.baseline), load_results(args.candidate), args.threshold)
+        return 1 if regressions else 0
+
+    micro: list[MicroResult] = []
+    if not args.skip_micro:
+        micro = run_micro(args.min_time, args.rounds, args.select)
+
+    load: list[LoadResult] = []
+    if not args.skip_load:
+        concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+        for scenario in args.scenarios.split(","):
+            for engine in args.engines.split(","):
+                load += run_load(
+                    scenario,
+                    engine,
+                    concurrency_levels,
+                    args.duration,
+                    args.warmup,
+                    args.client_processes
+                )
+
+    save_results(args.output, micro, load)
+    print(f"Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
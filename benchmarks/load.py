@@ -0,0 +1,240 @@
+import asyncio
+import multiprocessing
+import os
+import socket
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from corax.async_server import AsyncCoraxServer
+from corax.config.server import ServerConfig
+from corax.handler.async_base import AsyncBaseHandler
+from corax.handler.base import BaseHandler
+from corax.handler.static import StaticHandler
+from corax.http.enums import HttpStatus
+from corax.http.headers import Headers
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse
+from corax.server import CoraxServer
+
+# The listener binds IPv6 sockets, the load goes through the IPv6 loopback.
+HOST = "::1"
+HELLO_BODY = b"Hello, World!"
+# Size of the file served by the static scenario.
+STATIC_FILE_SIZE = 4096
+
+@dataclass(frozen=True, slots=True)
+class LoadResult:
+    """
+        The throughput and latency of one load run, latencies are in
+        milliseconds.
+    """
+    scenario: str
+    engine: str
+    concurrency: int
+    requests: int
+    errors: int
+    duration: float
+    rps: float
+    p50_ms: float
+    p99_ms: float
+    p999_ms: float
+
+def hello_response(request: CoraxRequest) -> CoraxResponse:
+    """
+        Builds the fixed plain-text response of the hello scenario.
+    """
+    headers = Headers()
+    headers["Content-Type"] = "text/plain"
+    return CoraxResponse(request.http_version, HttpStatus.OK, headers, HELLO_BODY)
+
+class HelloHandler(BaseHandler):
+    """
+        Answers every request with a short plain-text body.
+    """
+    def handle(self, request: CoraxRequest) -> CoraxResponse:
+        return hello_response(request)
+
+class AsyncHelloHandler(AsyncBaseHandler):
+    """
+        Answers every request with a short plain-text body, on the event loop.
+    """
+    async def handle(self, request: CoraxRequest) -> CoraxResponse:
+        return hello_response(request)
+
+def serve(engine: str, scenario: str, port: int, folder: str, worker_threads: int) -> None:
+    """
+        Runs a corax instance for a scenario, in a child process.
+    """
+    config = ServerConfig(worker_threads=worker_threads, max_keep_alive_requests=1 << 30)
+    handler: BaseHandler = HelloHandler()
+    if scenario == "static":
+        handler = StaticHandler(folder, cache_size=1048576)
+
+    if engine == "async":
+        async_handler: BaseHandler | AsyncBaseHandler = handler
+        if scenario != "static":
+            async_handler = AsyncHelloHandler()
+        AsyncCoraxServer(HOST, port, async_handler, config).main_loop()
+    else:
+        CoraxServer(HOST, port, handler, config).main_loop()
+
+def free_port() -> int:
+    """
+        Returns a loopback port nothing listens on.
+    """
+    with socket.socket(socket.AF_INET6) as probe:
+        probe.bind((HOST, 0))
+        return probe.getsockname()[1]
+
+def wait_for_port(port: int, timeout: float = 10.0) -> None:
+    """
+        Waits until the server accepts connections.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Nothing is listening on port {port}.")
+            time.sleep(0.05)
+
+async def _connection_loop(
+    port: int,
+    raw_request: bytes,
+    start: float,
+    deadline: float,
+    latencies: list[float]
+) -> int:
+    """
+        Sends requests over one keep-alive connection until the deadline,
+        recording the latencies measured after the warmup start.
+    """
+    errors = 0
+    reader, writer = await asyncio.open_connection(HOST, port)
+    try:
+        while (sent_at := time.perf_counter()) < deadline:
+            writer.write(raw_request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            content_length = 0
+            for line in head.split(b"\r\n"):
+                name, _, value = line.partition(b":")
+                if name.lower() == b"content-length":
+                    content_length = int(value)
+            await reader.readexactly(content_length)
+
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors += 1
+            elif sent_at >= start:
+                latencies.append(time.perf_counter() - sent_at)
+    except (OSError, asyncio.IncompleteReadError):
+        errors += 1
+    finally:
+        writer.close()
+    return errors
+
+async def _client(port: int, uri: str, connections: int, warmup: float, duration: float) -> tuple[list[float], int]:
+    """
+        Runs the connections of one client process.
+    """
+    raw_request = f"GET {uri} HTTP/1.1\r\nHost: [{HOST}]:{port}\r\n\r\n".encode("utf-8")
+    start = time.perf_counter() + warmup
+    deadline = start + duration
+
+    latencies: list[float] = []
+    errors = await asyncio.gather(*(
+        _connection_loop(port, raw_request, start, deadline, latencies)
+        for _ in range(connections)
+    ))
+    return latencies, sum(errors)
+
+def client_process(port: int, uri: str, connections: int, warmup: float, duration: float) -> tuple[list[float], int]:
+    """
+        Entry point of a load generating process.
+    """
+    return asyncio.run(_client(port, uri, connections, warmup, duration))
+
+def percentile(sorted_values: list[float], quantile: float) -> float:
+    """
+        Returns a quantile of already sorted values, 0 when there are none.
+    """
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(quantile * len(sorted_values)), len(sorted_values) - 1)]
+
+def run_load(
+    scenario: str,
+    engine: str,
+    concurrency_levels: list[int],
+    duration: float = 5.0,
+    warmup: float = 1.0,
+    client_processes: int = 0,
+    worker_threads: int = 0
+) -> list[LoadResult]:
+    """
+        Starts a corax instance on loopback and measures it at several
+        concurrency levels, one keep-alive connection per concurrent client.
+
+        The load is generated by asyncio clients spread over several
+        processes so the generator is not the bottleneck of the server.
+        Unless given, the sync engine gets a worker thread per connection
+        of the highest level, it would starve connections otherwise.
+    """
+    client_processes = client_processes or min(os.cpu_count() or 1, 4)
+    worker_threads = worker_threads or max(concurrency_levels)
+    context = multiprocessing.get_context("spawn")
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix="corax-load-") as folder:
+        Path(folder, "file.bin").write_bytes(os.urandom(STATIC_FILE_SIZE))
+        uri = "/file.bin" if scenario == "static" else "/"
+
+        port = free_port()
+        server = context.Process(
+            target=serve,
+            args=(engine, scenario, port, folder, worker_threads),
+            daemon=True
+        )
+        server.start()
+        try:
+            wait_for_port(port)
+            with context.Pool(client_processes) as pool:
+                for concurrency in concurrency_levels:
+                    processes = min(client_processes, concurrency)
+                    shares = [
+                        concurrency // processes + (index < concurrency % processes)
+                        for index in range(processes)
+                    ]
+                    outcomes = pool.starmap(
+                        client_process,
+                        [(port, uri, share, warmup, duration) for share in shares]
+                    )
+
+                    latencies = sorted(latency for outcome in outcomes for latency in outcome[0])
+                    errors = sum(outcome[1] for outcome in outcomes)
+                    result = LoadResult(
+                        scenario,
+                        engine,
+                        concurrency,
+                        len(latencies),
+                        errors,
+                        duration,
+                        len(latencies) / duration,
+                        percentile(latencies, 0.5) * 1000,
+                        percentile(latencies, 0.99) * 1000,
+                        percentile(latencies, 0.999) * 1000
+                    )
+                    print(
+                        f"{scenario:<8} {engine:<6} c={concurrency:<5} {result.rps:>10.0f} req/s"
+                        f"  p50={result.p50_ms:.2f}ms p99={result.p99_ms:.2f}ms"
+                        f" p999={result.p999_ms:.2f}ms errors={errors}"
+                    )
+                    results.append(result)
+        finally:
+            server.terminate()
+            server.join(5)
+
+    return results
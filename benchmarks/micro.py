@@ -0,0 +1,257 @@
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+
+from corax.handler.base import BaseHandler
+from corax.handler.response_cache import CachingHandler
+from corax.handler.router import Router
+from corax.handler.static import StaticHandler
+from corax.http.body import FileBody
+from corax.http.enums import HttpMethod, HttpStatus
+from corax.http.headers import Headers
+from corax.http.parser import RequestParser
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse
+from corax.http.serializer import ResponseSerializer
+
+# File sizes served by the StaticHandler benchmarks.
+STATIC_FILE_SIZES = (1024, 65536, 1048576)
+
+# Route counts of the Router benchmarks, lookups should not slow down.
+ROUTE_COUNTS = (10, 1000)
+
+@dataclass(frozen=True, slots=True)
+class MicroResult:
+    """
+        The timing of one microbenchmark, the mean and the best per-call
+        time are taken over several rounds.
+    """
+    name: str
+    iterations: int
+    mean_ns: float
+    min_ns: float
+    ops_per_second: float
+
+def measure(name: str, func: Callable[[], object], min_time: float = 0.2, rounds: int = 5) -> MicroResult:
+    """
+        Times a function, calling it in rounds long enough to last about
+        `min_time` seconds each.
+    """
+    iterations = 1
+    while True:
+        elapsed = _time_round(func, iterations)
+        if elapsed >= min_time * 1e9 / 10:
+            break
+        iterations *= 10
+    iterations = max(int(iterations * min_time * 1e9 / elapsed), 1)
+
+    per_call = [_time_round(func, iterations) / iterations for _ in range(rounds)]
+    mean_ns = sum(per_call) / rounds
+
+    return MicroResult(
+        name,
+        iterations,
+        mean_ns,
+        min(per_call),
+        1e9 / mean_ns
+    )
+
+def _time_round(func: Callable[[], object], iterations: int) -> int:
+    """
+        Returns the nanoseconds taken by calling a function repeatedly.
+    """
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        func()
+    return max(time.perf_counter_ns() - start, 1)
+
+def raw_request(method: str = "GET", uri: str = "/", header_count: int = 6, body: bytes = b"") -> bytes:
+    """
+        Builds a raw request with browser-like headers.
+    """
+    lines = [
+        f"{method} {uri} HTTP/1.1",
+        "Host: localhost:2004",
+        "User-Agent: Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0",
+        "Accept: text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language: en-US,en;q=0.5",
+        "Accept-Encoding: gzip, deflate, br, zstd",
+        "Connection: keep-alive",
+    ]
+    lines += [f"X-Extra-{index}: value-{index}" for index in range(header_count - 6)]
+    if body:
+        lines.append(f"Content-Length: {len(body)}")
+
+    return "\r\n".join(lines).encode("utf-8") + b"\r\n\r\n" + body
+
+def parser_benchmarks() -> Iterator[tuple[str, Callable[[], object]]]:
+    """
+        Yields the RequestParser cases.
+    """
+    small = raw_request()
+    many_headers = raw_request(header_count=40)
+    with_body = raw_request("POST", "/upload", body=b"x" * 4096)
+    chunked = (
+        b"POST /upload HTTP/1.1\r\nHost: localhost\r\nTransfer-Encoding: chunked\r\n\r\n"
+        + b"400\r\n" + b"x" * 1024 + b"\r\n"
+        + b"400\r\n" + b"x" * 1024 + b"\r\n"
+        + b"0\r\n\r\n"
+    )
+
+    yield "parser.get", lambda: RequestParser(small).parse()
+    yield "parser.get_40_headers", lambda: RequestParser(many_headers).parse()
+    yield "parser.post_4k_body", lambda: RequestParser(with_body).parse()
+    yield "parser.post_chunked_2k", lambda: RequestParser(chunked).parse()
+
+def serializer_benchmarks() -> Iterator[tuple[str, Callable[[], object]]]:
+    """
+        Yields the ResponseSerializer cases, on bodies of growing size.
+    """
+    for size in (16, 65536, 1048576):
+        body = b"x" * size
+
+        def serialize(body: bytes = body) -> object:
+            headers = Headers()
+            headers["Content-Type"] = "text/plain"
+            return ResponseSerializer(CoraxResponse("1.1", HttpStatus.OK, headers, body)).serialize_buffers()
+
+        yield f"serializer.buffers_{size}", serialize
+
+    body = b"x" * 65536
+
+    def serialize_joined() -> object:
+        headers = Headers()
+        headers["Content-Type"] = "text/plain"
+        return ResponseSerializer(CoraxResponse("1.1", HttpStatus.OK, headers, body)).serialize()
+
+    yield "serializer.joined_65536", serialize_joined
+
+def headers_benchmarks() -> Iterator[tuple[str, Callable[[], object]]]:
+    """
+        Yields the Headers cases, on parsed and on built headers.
+    """
+    request = RequestParser(raw_request(header_count=20)).parse()
+    parsed = request.headers
+
+    def build() -> Headers:
+        headers = Headers()
+        headers["Content-Type"] = "text/html"
+        headers["Content-Length"] = "1024"
+        headers["ETag"] = '"400-1"'
+        headers.add("Set-Cookie", "a=1")
+        headers.add("Set-Cookie", "b=2")
+        return headers
+
+    built = build()
+
+    yield "headers.parsed_get", lambda: parsed.get("Accept-Encoding")
+    yield "headers.parsed_missing", lambda: parsed.get("If-None-Match")
+    yield "headers.parsed_contains", lambda: "Transfer-Encoding" in parsed
+    yield "headers.build", build
+    yield "headers.built_get_all", lambda: built.get_all("Set-Cookie")
+    yield "headers.built_iterate", lambda: [built.get_all(key) for key in built]
+
+def static_benchmarks(folder: Path) -> Iterator[tuple[str, Callable[[], object]]]:
+    """
+        Yields the StaticHandler cases, with and without the content cache
+        and the path index, for several file sizes.
+    """
+    for size in STATIC_FILE_SIZES:
+        (folder / f"file-{size}.bin").write_bytes(b"x" * size)
+
+    handlers = {
+        "plain": StaticHandler(folder),
+        "cached": StaticHandler(folder, cache_size=8388608, cache_max_file_size=1048576),
+        "indexed": StaticHandler(folder, use_index=True, index_refresh_interval=0),
+    }
+    for label, handler in handlers.items():
+        for size in STATIC_FILE_SIZES:
+            request = RequestParser(raw_request(uri=f"/file-{size}.bin")).parse()
+
+            def handle(handler: StaticHandler = handler, request: CoraxRequest = request) -> object:
+                response = handler.handle(request)
+                if isinstance(response.body, FileBody):
+                    response.body.close()
+                return response
+
+            yield f"static.{label}_{size}", handle
+
+class FixedHandler(BaseHandler):
+    """
+        Answers every request with the same response, so the router
+        benchmarks time the routing alone.
+    """
+    def __init__(self) -> None:
+        """
+            Builds the response once.
+        """
+        self.response: CoraxResponse = CoraxResponse("1.1", HttpStatus.OK, Headers(), b"")
+
+    def handle(self, request: CoraxRequest) -> CoraxResponse:
+        """
+            Returns the prebuilt response.
+        """
+        return self.response
+
+def router_benchmarks() -> Iterator[tuple[str, Callable[[], object]]]:
+    """
+        Yields the Router cases, static and parameter routes, a 405 and a
+        miss, for several numbers of routes.
+    """
+    handler = FixedHandler()
+    for count in ROUTE_COUNTS:
+        router = Router()
+        for index in range(count):
+            router.add(f"/api/resource{index}/items", handler, (HttpMethod.GET, HttpMethod.POST))
+            router.add(f"/api/resource{index}/items/{{item}}/parts/{{part}}", handler)
+
+        last = count - 1
+        requests = {
+            "static": RequestParser(raw_request(uri=f"/api/resource{last}/items")).parse(),
+            "params": RequestParser(raw_request(uri=f"/api/resource{last}/items/42/parts/7")).parse(),
+            "not_allowed": RequestParser(raw_request(method="DELETE", uri=f"/api/resource{last}/items")).parse(),
+            "miss": RequestParser(raw_request(uri="/api/unknown/items")).parse(),
+        }
+        for label, request in requests.items():
+            def route(router: Router = router, request: CoraxRequest = request) -> object:
+                return router.handle(request)
+
+            yield f"router.{label}_{count}", route
+
+def cache_benchmarks() -> Iterator[tuple[str, Callable[[], object]]]:
+    """
+        Yields the CachingHandler cases, a hit and a response that bypasses
+        the cache.
+    """
+    cache = CachingHandler(FixedHandler(), default_ttl=3600.0)
+    hit = RequestParser(raw_request(uri="/cached")).parse()
+    bypass = RequestParser(raw_request(method="POST", uri="/cached")).parse()
+    cache.handle(hit)
+    yield "cache.hit", lambda: cache.handle(hit)
+    yield "cache.bypass", lambda: cache.handle(bypass)
+
+def run_micro(min_time: float = 0.2, rounds: int = 5, selected: str = "") -> list[MicroResult]:
+    """
+        Runs every microbenchmark whose name starts with `selected`.
+    """
+    with tempfile.TemporaryDirectory(prefix="corax-bench-") as folder:
+        cases = [
+            *parser_benchmarks(),
+            *serializer_benchmarks(),
+            *headers_benchmarks(),
+            *router_benchmarks(),
+            *cache_benchmarks(),
+            *static_benchmarks(Path(folder)),
+        ]
+
+        results = []
+        for name, func in cases:
+            if not name.startswith(selected):
+                continue
+            result = measure(name, func, min_time, rounds)
+            print(f"{name:<32} {result.mean_ns:>12.0f} ns/op {result.ops_per_second:>14.0f} op/s")
+            results.append(result)
+
+        return results
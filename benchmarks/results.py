@@ -0,0 +1,107 @@
+import json
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from benchmarks.load import LoadResult
+from benchmarks.micro import MicroResult
+
+def environment() -> dict[str, Any]:
+    """
+        Describes where the results were measured, so runs from different
+        machines or commits are not mistaken for each other.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+def save_results(path: str | Path, micro: list[MicroResult], load: list[LoadResult]) -> None:
+    """
+        Writes the results of a run as JSON.
+    """
+    document = {
+        "environment": environment(),
+        "micro": [asdict(result) for result in micro],
+        "load": [asdict(result) for result in load],
+    }
+    Path(path).write_text(json.dumps(document, indent=2) + "\n")
+
+def load_results(path: str | Path) -> dict[str, Any]:
+    """
+        Reads the results of a run written by `save_results`.
+    """
+    return json.loads(Path(path).read_text())
+
+def compare_results(baseline: dict[str, Any], candidate: dict[str, Any], threshold: float = 5.0) -> int:
+    """
+        Prints the changes between two runs and returns the number of
+        measurements that got worse by more than `threshold` percent.
+
+        Microbenchmarks compare the mean time per call, load runs compare
+        the throughput and the p99 latency.
+    """
+    regressions = 0
+
+    baseline_micro = {result["name"]: result for result in baseline.get("micro", [])}
+    for result in candidate.get("micro", []):
+        previous = baseline_micro.get(result["name"])
+        if previous is None:
+            continue
+        change = _change(previous["mean_ns"], result["mean_ns"])
+        regressed = change > threshold
+        regressions += regressed
+        print(
+            f"{result['name']:<32} {previous['mean_ns']:>12.0f} -> {result['mean_ns']:>12.0f} ns/op"
+            f" {change:>+8.1f}%{'  REGRESSION' if regressed else ''}"
+        )
+
+    baseline_load = {_load_key(result): result for result in baseline.get("load", [])}
+    for result in candidate.get("load", []):
+        previous = baseline_load.get(_load_key(result))
+        if previous is None:
+            continue
+        rps_change = -_change(previous["rps"], result["rps"])
+        p99_change = _change(previous["p99_ms"], result["p99_ms"])
+        regressed = rps_change > threshold or p99_change > threshold
+        regressions += regressed
+        print(
+            f"{result['scenario']:<8} {result['engine']:<6} c={result['concurrency']:<5}"
+            f" {previous['rps']:>10.0f} -> {result['rps']:>10.0f} req/s {-rps_change:>+8.1f}%"
+            f"  p99 {previous['p99_ms']:.2f} -> {result['p99_ms']:.2f}ms {p99_change:>+8.1f}%"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+
+    return regressions
+
+def _change(previous: float, current: float) -> float:
+    """
+        Returns the relative change between two measurements, in percent.
+    """
+    if not previous:
+        return 0.0
+    return (current - previous) / previous * 100
+
+def _load_key(result: dict[str, Any]) -> tuple[str, str, int]:
+    """
+        Identifies a load measurement across runs.
+    """
+    return result["scenario"], result["engine"], result["concurrency"]
@@ -0,0 +1,190 @@
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from collections import deque
+
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse
+
+logger = logging.getLogger(__name__)
+
+# The fields of an entry: wall clock time, client host, method, URI, HTTP
+# version, status code, Content-Length, handling time in seconds and
+# User-Agent.
+AccessRecord = tuple[float, str, str | None, str | None, str | None, int, str | None, float, str | None]
+
+class AccessLog:
+    """
+        A structured access log written in batches by a background thread.
+
+        Recording a request only appends a tuple of its fields to a deque,
+        they are formatted as JSON lines and written later, `batch_size`
+        entries at a time or every `flush_interval` seconds. Each batch is
+        one write to a file opened for appending, so forked workers can
+        share it. At most `queue_limit` entries wait for the writer, the
+        ones recorded past that are dropped and counted.
+    """
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        queue_limit: int = 65536
+    ) -> None:
+        """
+            Initializes a stopped access log writing to the file at `path`,
+            or to the standard output when `path` is "-".
+        """
+        self.path: str = path
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        self.queue_limit: int = queue_limit
+        self.records: deque[AccessRecord] = deque()
+        self.dropped: int = 0
+        self.wakeup: threading.Event = threading.Event()
+        self.stopping: bool = False
+        self.thread: threading.Thread | None = None
+        self.fd: int = -1
+
+    def start(self) -> None:
+        """
+            Opens the log and starts the writer thread of the calling
+            process, forked workers each start their own.
+        """
+        if self.path == "-":
+            self.fd = sys.stdout.fileno()
+        else:
+            self.fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+        self.stopping = False
+        self.thread = threading.Thread(target=self._run, name="corax-access-log", daemon=True)
+        self.thread.start()
+
+    def record(
+        self,
+        client_address: tuple,
+        request: CoraxRequest | None,
+        response: CoraxResponse,
+        duration: float
+    ) -> None:
+        """
+            Queues the entry of a request, `request` is None for requests
+            rejected before they could be parsed.
+        """
+        records = self.records
+        if len(records) >= self.queue_limit:
+            self.dropped += 1
+            return
+
+        if request is None:
+            records.append((
+                time.time(), client_address[0], None, None, None,
+                response.status.code, response.headers.get("Content-Length"), duration, None
+            ))
+        else:
+            records.append((
+                time.time(), client_address[0], request.method.value, request.uri, request.http_version,
+                response.status.code, response.headers.get("Content-Length"), duration,
+                request.headers.get("User-Agent")
+            ))
+        if len(records) >= self.batch_size:
+            self.wakeup.set()
+
+    def close(self) -> None:
+        """
+            Writes the queued entries and stops the writer thread.
+        """
+        if self.thread is None:
+            return
+
+        self.stopping = True
+        self.wakeup.set()
+        self.thread.join()
+        self.thread = None
+        if self.path != "-":
+            os.close(self.fd)
+        self.fd = -1
+
+    def _run(self) -> None:
+        """
+            Writes batches until the log is closed.
+        """
+        while not self.stopping:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            self._write_logged()
+        self._write_logged()
+
+    def _write_logged(self) -> None:
+        """
+            Writes a batch, logging the errors instead of letting them end
+            the writer thread.
+        """
+        try:
+            self._write_batch()
+        except Exception:
+            logger.exception("Could not write an access log batch to %s", self.path)
+
+        dropped = self.dropped
+        if dropped:
+            self.dropped -= dropped
+            logger.warning("Dropped %d access log entries, the writer fell behind", dropped)
+
+    def _write_batch(self) -> None:
+        """
+            Formats every queued entry and writes them at once.
+        """
+        records = self.records
+        lines = []
+        while records:
+            lines.append(format_record(*records.popleft()))
+        if not lines:
+            return
+
+        view = memoryview("".join(lines).encode("utf-8"))
+        try:
+            while view:
+                view = view[os.write(self.fd, view):]
+        except OSError as e:
+            logger.error("Could not write the access log to %s: %s", self.path, e)
+
+def format_record(
+    timestamp: float,
+    client: str,
+    method: str | None,
+    uri: str | None,
+    http_version: str | None,
+    status: int,
+    length: str | None,
+    duration: float,
+    user_agent: str | None
+) -> str:
+    """
+        Formats an access log entry as a JSON line.
+    """
+    entry = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(timestamp)),
+        "client": client,
+        "method": method,
+        "uri": uri,
+        "version": http_version,
+        "status": status,
+        "length": _parse_length(length),
+        "duration_ms": round(duration * 1000, 3),
+        "user_agent": user_agent,
+    }
+    return json.dumps(entry, separators=(",", ":")) + "\n"
+
+def _parse_length(length: str | None) -> int | None:
+    """
+        Reads a Content-Length value, None when it is missing or invalid.
+    """
+    if length is None:
+        return None
+    try:
+        return int(length)
+    except ValueError:
+        return None
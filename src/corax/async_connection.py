@@ -0,0 +1,266 @@
+import time
+import asyncio
+import logging
+
+from corax.access_log import AccessLog
+from corax.config.server import ServerConfig
+from corax.connection_base import BaseConnectionHandler
+from corax.errors.request import InvalidRequest
+from corax.handler.admin import AdminHandler
+from corax.handler.async_base import AsyncBaseHandler
+from corax.hooks import ConnectionHooks
+from corax.http.body import FileBody
+from corax.http.enums import HttpStatus, ParseStatus
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse, close_body
+from corax.http.serializer import Buffer, ResponseSerializer
+from corax.metrics import ServerMetrics
+
+logger = logging.getLogger(__name__)
+
+class AsyncConnectionHandler(BaseConnectionHandler):
+    """
+        Manages the complete lifecycle of a single client connection on an
+        asyncio event loop.
+    """
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        handler: AsyncBaseHandler,
+        config: ServerConfig | None = None,
+        metrics: ServerMetrics | None = None,
+        admin: AdminHandler | None = None,
+        hooks: ConnectionHooks | None = None,
+        access_log: AccessLog | None = None
+    ):
+        """
+            Initializes the handler for a specific client stream pair.
+
+            Timings are recorded into `metrics` and lifecycle events are
+            reported to `hooks` when given, requests for the `admin` paths
+            are answered by it instead of the handler. Every request is
+            entered into `access_log` when one is given.
+        """
+        super().__init__(writer.get_extra_info("peername"), config, metrics, admin, hooks, access_log)
+        self.reader: asyncio.StreamReader = reader
+        self.writer: asyncio.StreamWriter = writer
+        self.handler: AsyncBaseHandler = handler
+
+    async def handle(self) -> None:
+        """
+            Orchestrates the request-response cycles for the connection.
+
+            Follows the same keep-alive rules as ConnectionHandler, an idle
+            connection only costs a suspended coroutine.
+        """
+        self._opened()
+
+        try:
+            while True:
+                request = await self._read()
+                if request is None:
+                    break
+
+                response: CoraxResponse | None = None
+                try:
+                    response = await self._respond(request)
+                    serializer, keep_alive = self._serializer(request, response)
+                    await self._write(serializer)
+                except BaseException:
+                    # A streaming body that was not sent still holds its file.
+                    if response is not None:
+                        close_body(response)
+                    raise
+                finally:
+                    request.body.close()
+
+                self._written(request, response, serializer)
+                if not keep_alive:
+                    break
+
+            await self._flush()
+        except InvalidRequest as e:
+            logger.warning("Rejecting request from %s: %s", self.client_address, e)
+            await self._reject(e.status)
+        except Exception as e:
+            logger.error("Error handling connection: %s", e)
+            await self._flush_completed()
+        finally:
+            await self.close()
+            self._closed()
+
+    async def _respond(self, request: CoraxRequest) -> CoraxResponse:
+        """
+            Runs the handler, or the admin handler for its paths.
+        """
+        if not self.instrumented:
+            return await self.handler.handle(request)
+
+        started = self._handler_started(request)
+        if self.admin is not None and self._is_admin_request(request):
+            response = self.admin.handle(request)
+        else:
+            response = await self.handler.handle(request)
+        self._handler_finished(request, response, started)
+        return response
+
+    async def _read(self) -> CoraxRequest | None:
+        """
+            Takes the next request out of the parser, reading from the
+            stream only when the buffered bytes do not hold it yet.
+
+            Bytes following the request stay in the parser, so pipelined
+            requests are served in the order they were sent. Returns None
+            when the client closes the connection, or lets it sit idle past
+            the keep-alive timeout, before sending a request.
+        """
+        started = time.perf_counter() if self.parser.buffered else None
+        parse_time = 0.0
+
+        status = self.parser.feed()
+        while status is ParseStatus.NEED_MORE:
+            data = await self._recv()
+            if not data:
+                if self.parser.idle:
+                    return None
+                raise ConnectionError("Client closed the connection in the middle of a request.")
+
+            fed_at = time.perf_counter()
+            if started is None:
+                started = fed_at
+            status = self.parser.feed(data)
+            parse_time += time.perf_counter() - fed_at
+
+        return self._take_request(status, started, parse_time)
+
+    async def _recv(self) -> bytes:
+        """
+            Receives the next chunk from the stream.
+
+            Queued responses are flushed first, a pipelining client may wait
+            for them before sending anything else. Returns no data on EOF or
+            when an idle connection times out, a request that times out part
+            way raises RequestTimeout.
+        """
+        await self._flush()
+
+        try:
+            async with asyncio.timeout(self._read_timeout()):
+                data = await self.reader.read(self.config.recv_buffer_size)
+        except TimeoutError:
+            self._read_timed_out()
+            return b""
+
+        self._received(len(data))
+        return data
+
+    async def _write(self, serializer: ResponseSerializer) -> None:
+        """
+            Serializes a CoraxResponse and queues it for the client.
+
+            Responses to requests that were already buffered go out together
+            in a single write once the connection needs to read again.
+            Streaming bodies are written as they are produced, right after
+            the queued responses, waiting for the transport to drain.
+        """
+        if not serializer.is_streaming:
+            self._queue(serializer)
+            return
+
+        started = time.perf_counter()
+        try:
+            self.pending.append(serializer.serialize_head())
+            await self._send_pending()
+            file_body = serializer.file_body
+            if file_body is not None:
+                await self._sendfile(file_body)
+            else:
+                for buffers in serializer.iter_body_buffers():
+                    await self._send_buffers(buffers)
+        finally:
+            serializer.close()
+        self._streamed(serializer, started)
+
+    async def _sendfile(self, file_body: FileBody) -> None:
+        """
+            Sends a file region with zero-copy sendfile.
+
+            The loop falls back to reading and writing the file itself when
+            the transport or the platform can't use sendfile.
+        """
+        loop = asyncio.get_running_loop()
+        sent = await loop.sendfile(
+            self.writer.transport,
+            file_body.file,
+            file_body.offset,
+            file_body.length,
+            fallback=True
+        )
+        self._sent(sent)
+
+    async def _flush(self) -> None:
+        """
+            Writes every queued response as one vectored write and waits
+            for the transport to drain.
+        """
+        if not self.pending:
+            return
+
+        started = time.perf_counter()
+        await self._send_pending()
+        self._observe_write(started)
+
+    async def _flush_completed(self) -> None:
+        """
+            Writes the responses already produced for earlier pipelined
+            requests before the connection is dropped after an error.
+        """
+        try:
+            await self._flush()
+        except OSError as e:
+            logger.debug("Could not flush queued responses to %s: %s", self.client_address, e)
+
+    async def _send_pending(self) -> None:
+        """
+            Writes the queued buffers.
+        """
+        self._flushed(await self._send_buffers(self._take_pending()))
+
+    async def _send_buffers(self, buffers: list[Buffer]) -> int:
+        """
+            Writes a list of buffers as one vectored write, waits for the
+            transport to drain and returns the bytes written.
+        """
+        self.writer.writelines(buffers)
+        try:
+            async with asyncio.timeout(self.config.write_timeout):
+                await self.writer.drain()
+        except TimeoutError:
+            # Closing would still send what the transport buffered.
+            self.writer.transport.abort()
+            raise TimeoutError("timed out") from None
+
+        sent = sum(len(buffer) for buffer in buffers)
+        self._sent(sent)
+        return sent
+
+    async def _reject(self, status: HttpStatus) -> None:
+        """
+            Answers with an error status right before the connection closes.
+        """
+        try:
+            await self._write(self._rejection(status))
+            await self._flush()
+        except OSError as e:
+            logger.warning("Could not send %d to %s: %s", status.code, self.client_address, e)
+
+    async def close(self) -> None:
+        """
+            Closes the client stream.
+        """
+        try:
+            self.writer.close()
+            await self.writer.wait_closed()
+        except OSError as e:
+            logger.warning("Ignoring error while closing stream for %s: %s", self.client_address, e)
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from corax.access_log import AccessLog
+from corax.async_connection import AsyncConnectionHandler
+from corax.config.server import ServerConfig
+from corax.handler.admin import AdminHandler
+from corax.handler.async_base import AsyncBaseHandler, SyncHandlerAdapter
+from corax.handler.base import BaseHandler
+from corax.handler.static import StaticHandler
+from corax.hooks import ConnectionHooks
+from corax.metrics import ServerMetrics
+from corax.prefork import PreforkSupervisor
+from corax.profiler import SamplingProfiler
+from corax.server import (
+    build_access_log,
+    build_admin,
+    build_overload_payload,
+    profile_signals,
+    start_admin,
+)
+import corax.listener as listener
+
+logger = logging.getLogger(__name__)
+
+class AsyncCoraxServer:
+    """
+        An asyncio engine serving many connections from a single thread.
+
+        Synchronous handlers are accepted as well, they are run on a thread
+        pool sized by `ServerConfig.worker_threads` so they never block the
+        event loop.
+    """
+    host: str
+    port: int
+    handler: AsyncBaseHandler
+    config: ServerConfig
+    connection: listener.SocketListener
+    executor: ThreadPoolExecutor | None
+    metrics: ServerMetrics | None
+    profiler: SamplingProfiler | None
+    admin: AdminHandler | None
+    hooks: ConnectionHooks | None
+    access_log: AccessLog | None
+    active_connections: int
+    overload_payload: bytes
+    worker_index: int
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        handler: AsyncBaseHandler | BaseHandler,
+        config: ServerConfig | None = None,
+        hooks: ConnectionHooks | None = None
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.config = ServerConfig() if config is None else config
+        self.connection = listener.SocketListener(
+            (host, port),
+            reuse_port=self.config.reuse_port,
+            backlog=self.config.listen_backlog,
+            options=self.config.socket_options
+        )
+        self.executor = None
+        self.metrics = ServerMetrics() if self.config.metrics else None
+        self.profiler, self.admin = build_admin(self.config, self.metrics)
+        self.hooks = hooks
+        self.access_log = build_access_log(self.config)
+        self.active_connections = 0
+        self.overload_payload = build_overload_payload(self.config)
+        self.worker_index = 0
+
+        if isinstance(handler, BaseHandler):
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.config.worker_threads or None,
+                thread_name_prefix="corax-handler"
+            )
+            handler = SyncHandlerAdapter(handler, self.executor)
+        self.handler = handler
+
+    def main_loop(self) -> None:
+        if self.config.processes > 1:
+            self._supervise()
+            return
+
+        self._run()
+
+    def _supervise(self) -> None:
+        """
+            Runs one event loop in each of several forked worker processes.
+        """
+        supervisor = PreforkSupervisor(
+            self.config.processes,
+            self._run,
+            profile_signals(self.config)
+        )
+        try:
+            if not self.config.reuse_port:
+                self.connection.start()
+            supervisor.run()
+        finally:
+            self.connection.close()
+
+    def _run(self, worker_index: int = 0) -> None:
+        """
+            Runs the event loop until interrupted, as the given prefork
+            worker.
+        """
+        self.worker_index = worker_index
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            logger.info("Shutting down the server...")
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+            if self.access_log is not None:
+                self.access_log.close()
+            self.connection.close()
+
+    async def serve(self) -> None:
+        """
+            Starts listening and serves connections until cancelled.
+        """
+        if not self.connection.is_running:
+            self.connection.start()
+        server = await asyncio.start_server(
+            self._on_connection,
+            sock=self.connection.public_connection,
+            backlog=self.config.listen_backlog
+        )
+        logger.info("Async server started running on port %d", self.port)
+
+        inner = self.handler.handler if isinstance(self.handler, SyncHandlerAdapter) else self.handler
+        if isinstance(inner, StaticHandler):
+            logger.debug("Serving static files from %s", inner.base_folder)
+
+        start_admin(self.host, self.config, self.profiler, self.admin, self.worker_index)
+        if self.access_log is not None:
+            self.access_log.start()
+
+        async with server:
+            await server.serve_forever()
+
+    async def _on_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """
+            Runs the connection handler for a newly accepted stream, or
+            sheds it with the pre-serialized 503 past `max_connections`.
+        """
+        max_connections = self.config.max_connections
+        if max_connections and self.active_connections >= max_connections:
+            logger.warning("Server saturated, shedding connection from %s", writer.get_extra_info("peername"))
+            if self.metrics is not None:
+                self.metrics.shed_connections.inc()
+            writer.write(self.overload_payload)
+            writer.close()
+            return
+
+        connection_handler = AsyncConnectionHandler(
+            reader,
+            writer,
+            self.handler,
+            self.config,
+            self.metrics,
+            None if self.config.admin_port else self.admin,
+            self.hooks,
+            self.access_log
+        )
+        self.active_connections += 1
+        try:
+            await connection_handler.handle()
+        finally:
+            self.active_connections -= 1
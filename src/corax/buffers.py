@@ -0,0 +1,71 @@
+from collections import deque
+
+class BufferPool:
+    """
+        A pool of preallocated receive buffers shared by the connections.
+
+        Connections borrow a bytearray while they read a request and give
+        it back once the request is parsed, so reading never allocates new
+        buffers once the pool is warm. At most `max_buffers` idle buffers
+        are kept, extra ones are left to the garbage collector.
+    """
+    def __init__(self, buffer_size: int = 65536, max_buffers: int = 256) -> None:
+        """
+            Initializes an empty pool of `buffer_size` byte buffers.
+        """
+        if buffer_size < 1:
+            raise ValueError("Receive buffers must hold at least one byte.")
+
+        self.buffer_size: int = buffer_size
+        self.max_buffers: int = max_buffers
+        self.buffers: deque[bytearray] = deque()
+
+    def acquire(self) -> bytearray:
+        """
+            Takes an idle buffer out of the pool, or allocates a new one.
+        """
+        try:
+            return self.buffers.pop()
+        except IndexError:
+            return bytearray(self.buffer_size)
+
+    def release(self, buffer: bytearray) -> None:
+        """
+            Gives a buffer back to the pool.
+
+            The buffer must not be referenced anymore, no view of it may
+            outlive this call.
+        """
+        if len(buffer) == self.buffer_size and len(self.buffers) < self.max_buffers:
+            self.buffers.append(buffer)
+
+    def __len__(self) -> int:
+        """
+            Returns the number of idle buffers.
+        """
+        return len(self.buffers)
+
+class AdaptiveReadSize:
+    """
+        The number of bytes to ask for on the next read of a connection.
+
+        The size doubles every time a read fills it, up to `maximum`, and
+        halves when reads come back mostly empty, down to `minimum`. Small
+        requests are read with small calls and uploads with large ones.
+    """
+    def __init__(self, minimum: int = 4096, maximum: int = 65536) -> None:
+        """
+            Starts at the minimum size.
+        """
+        self.minimum: int = min(minimum, maximum)
+        self.maximum: int = maximum
+        self.size: int = self.minimum
+
+    def update(self, received: int) -> None:
+        """
+            Adjusts the size after a read that returned `received` bytes.
+        """
+        if received >= self.size:
+            self.size = min(self.size * 2, self.maximum)
+        elif received < self.size // 4:
+            self.size = max(self.size // 2, self.minimum)
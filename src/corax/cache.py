@@ -0,0 +1,127 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """
+        A snapshot of the counters of an LRUCache.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    entries: int
+    size: int
+
+class LRUCache(Generic[K, V]):
+    """
+        A thread-safe, least-recently-used cache bounded by a byte budget.
+
+        Every entry is stored with its size in bytes, the least recently
+        used entries are evicted until a new one fits in the budget.
+    """
+    def __init__(self, max_bytes: int) -> None:
+        """
+            Initializes an empty cache holding at most `max_bytes` bytes.
+        """
+        self.max_bytes: int = max_bytes
+        self.entries: OrderedDict[K, tuple[V, int]] = OrderedDict()
+        self.size: int = 0
+        self.lock: threading.Lock = threading.Lock()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.invalidations: int = 0
+
+    def get(self, key: K, is_valid: Callable[[V], bool] | None = None) -> V | None:
+        """
+            Returns the value stored for a key and marks it as recently used.
+
+            An entry rejected by `is_valid` is dropped and counted as a miss.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, size = entry
+            if is_valid is not None and not is_valid(value):
+                del self.entries[key]
+                self.size -= size
+                self.invalidations += 1
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: K, value: V, size: int) -> bool:
+        """
+            Stores a value, evicting old entries as needed.
+
+            Returns False if the value alone does not fit in the budget.
+        """
+        if size > self.max_bytes:
+            return False
+
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+
+            while self.entries and self.size + size > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+            self.entries[key] = (value, size)
+            self.size += size
+            return True
+
+    def pop(self, key: K) -> V | None:
+        """
+            Removes an entry and returns its value, if there was one.
+        """
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is None:
+                return None
+
+            self.size -= entry[1]
+            return entry[0]
+
+    def clear(self) -> None:
+        """
+            Removes every entry, the counters are kept.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self) -> CacheStats:
+        """
+            Returns a snapshot of the counters.
+        """
+        with self.lock:
+            return CacheStats(
+                self.hits,
+                self.misses,
+                self.evictions,
+                self.invalidations,
+                len(self.entries),
+                self.size
+            )
+
+    def __len__(self) -> int:
+        """
+            Returns the number of cached entries.
+        """
+        return len(self.entries)
@@ -1,12 +1,67 @@
+import os
+import queue
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from typing import Literal
 
 LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
 
-def setup_logging(level: LogLevel = "INFO") -> None:
+LOG_FORMAT = "%(asctime)s - [%(levelname)s] - %(name)s - (%(filename)s:%(lineno)d) - %(message)s"
+
+class BackgroundQueueHandler(QueueHandler):
+    """
+        Puts records on a queue that a background thread drains into the
+        real handlers, so logging never waits on their I/O.
+
+        The listener thread is restarted in forked children, and stopped
+        once the queue is drained when the handler is closed, which
+        `logging.shutdown()` does at exit.
+    """
+    def __init__(self, *handlers: logging.Handler) -> None:
+        """
+            Initializes the handler and starts the listener writing to
+            `handlers`.
+        """
+        super().__init__(queue.SimpleQueue())
+        self.targets: tuple[logging.Handler, ...] = handlers
+        self.listener: QueueListener | None = None
+        self._start_listener()
+        os.register_at_fork(after_in_child=self._restart_in_child)
+
+    def _start_listener(self) -> None:
+        """
+            Starts a listener thread draining the queue.
+        """
+        self.listener = QueueListener(self.queue, *self.targets, respect_handler_level=True)
+        self.listener.start()
+
+    def _restart_in_child(self) -> None:
+        """
+            Gives a forked child its own queue and listener, the thread of
+            the parent does not survive the fork.
+        """
+        if self.listener is None:
+            return
+        self.queue = queue.SimpleQueue()
+        self._start_listener()
+
+    def close(self) -> None:
+        """
+            Writes the queued records and stops the listener.
+        """
+        listener = self.listener
+        self.listener = None
+        if listener is not None:
+            listener.stop()
+        super().close()
+
+def setup_logging(level: LogLevel = "INFO", queued: bool = False) -> None:
     """
         Configures the root logger, if no log level is
         set it uses INFO.
+
+        When `queued` is set, records are written by a background thread
+        and logging calls only enqueue them.
     """
 
     root_logger = logging.getLogger()
@@ -17,9 +72,10 @@ def setup_logging(level: LogLevel = "INFO") -> None:
         root_logger.handlers.clear()
 
     handler = logging.StreamHandler()
-    formatter = logging.Formatter(
-        "%(asctime)s - [%(levelname)s] - %(name)s - (%(filename)s:%(lineno)d) - %(message)s"
-    )
+    formatter = logging.Formatter(LOG_FORMAT)
 
     handler.setFormatter(formatter)
-    root_logger.addHandler(handler)
+    if queued:
+        root_logger.addHandler(BackgroundQueueHandler(handler))
+    else:
+        root_logger.addHandler(handler)
@@ -0,0 +1,136 @@
+from dataclasses import dataclass
+from enum import Enum
+
+class OverflowPolicy(str, Enum):
+    """
+        Decides what happens to a new connection when the worker queue is full.
+    """
+    BLOCK = "block"
+    REJECT = "reject"
+    CALLER_RUNS = "caller_runs"
+
+@dataclass(frozen=True, slots=True)
+class SocketOptions:
+    """
+        TCP options set on the listening socket, accepted connections
+        inherit them. Zero values keep the system defaults, options the
+        platform lacks are skipped with a warning.
+    """
+    # Disables Nagle's algorithm so small responses, and a response head
+    # followed by a sendfile body, are not held back waiting for an ACK.
+    no_delay: bool = True
+
+    # Kernel buffer sizes in bytes, SO_SNDBUF and SO_RCVBUF.
+    send_buffer: int = 0
+    receive_buffer: int = 0
+
+    # Linux TCP_DEFER_ACCEPT: seconds a connection may wait for its first
+    # bytes before being handed to accept.
+    defer_accept: int = 0
+
+    # Length of the TCP_FASTOPEN queue, requests may arrive with the SYN.
+    fast_open: int = 0
+
+    # Keep-alive probes on idle connections: seconds of idleness before
+    # the first probe, seconds between probes and unanswered probes
+    # before the connection is dropped.
+    keep_alive: bool = False
+    keep_alive_idle: int = 0
+    keep_alive_interval: int = 0
+    keep_alive_count: int = 0
+
+@dataclass(frozen=True, slots=True)
+class ServerConfig:
+    """
+        Tunable settings for a CoraxServer.
+
+        The defaults reproduce the original behavior: every connection is
+        handled inline on the accepting thread.
+    """
+    # Concurrency: 0 worker threads means connections are handled inline.
+    worker_threads: int = 0
+    queue_limit: int = 64
+    overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK
+
+    # Processes: more than 1 forks workers under a supervising master, each
+    # worker binds its own SO_REUSEPORT listener or inherits the master's one.
+    processes: int = 1
+    reuse_port: bool = False
+
+    # Persistent connections: an idle connection is closed after the
+    # timeout (seconds), and after serving the maximum number of requests.
+    # The sync engine only keeps connections open with worker threads.
+    keep_alive: bool = True
+    keep_alive_timeout: float = 5.0
+    max_keep_alive_requests: int = 100
+
+    # Timeouts (seconds): a new connection must start its first request
+    # within idle_timeout and a request head must be complete header_timeout
+    # after its first byte, late requests are answered with a 408. Reading
+    # a body and writing a response may each stall for body_timeout and
+    # write_timeout.
+    idle_timeout: float = 10.0
+    header_timeout: float = 10.0
+    body_timeout: float = 30.0
+    write_timeout: float = 30.0
+
+    # Overload protection: past max_connections concurrent connections per
+    # process (0 for no limit), or when the worker queue rejects one, new
+    # connections get a 503 with Retry-After: retry_after and are closed.
+    # listen_backlog bounds the kernel queue of connections not accepted yet.
+    max_connections: int = 1024
+    retry_after: int = 1
+    listen_backlog: int = 1024
+
+    # Listening socket: its TCP options, and how many pending connections
+    # the sync engine accepts per wakeup, more than 1 makes the listener
+    # non-blocking. The asyncio loop already drains pending connections.
+    socket_options: SocketOptions = SocketOptions()
+    accept_batch: int = 16
+
+    # Request limits: size in bytes of the request line plus headers, and
+    # number of header fields.
+    max_header_size: int = 16384
+    max_header_count: int = 100
+
+    # Request bodies: larger bodies are rejected with 413 before being
+    # read, bodies past the spool threshold are moved to a temporary file.
+    max_body_size: int = 10485760
+    body_spool_threshold: int = 1048576
+
+    # Receive buffers: requests are read into pooled buffers of
+    # recv_buffer_size bytes, at most recv_pool_size idle buffers are kept,
+    # and read sizes adapt between recv_min_size and the buffer size.
+    recv_buffer_size: int = 65536
+    recv_min_size: int = 4096
+    recv_pool_size: int = 256
+
+    # Metrics: when enabled, request counts, traffic and phase latencies
+    # are recorded and served in the Prometheus text format on metrics_path.
+    metrics: bool = False
+    metrics_path: str = "/metrics"
+
+    # Access log: one JSON line per request, appended to the access_log
+    # file ("-" for the standard output, empty disables it) by a background
+    # thread in batches of access_log_batch_size entries, or every
+    # access_log_flush_interval seconds. Entries recorded while
+    # access_log_queue_limit of them wait for the writer are dropped.
+    access_log: str = ""
+    access_log_batch_size: int = 256
+    access_log_flush_interval: float = 1.0
+    access_log_queue_limit: int = 65536
+
+    # Profiling: the sampling profiler runs for profile_duration seconds
+    # when a worker receives profile_signal (e.g. "SIGUSR2") or a POST to
+    # profile_path, empty values disable the triggers. Collapsed stacks
+    # are written to profile_directory.
+    profile_signal: str = ""
+    profile_path: str = ""
+    profile_duration: float = 30.0
+    profile_interval: float = 0.005
+    profile_directory: str = "."
+
+    # Admin endpoints (metrics, profiling) are served on the main port, or
+    # on a separate admin_port when it is not 0. Prefork worker i uses
+    # admin_port + i, each worker keeps its own metrics.
+    admin_port: int = 0
@@ -1,16 +1,28 @@
+import time
 import socket
 import logging
-from dataclasses import replace
 
+from corax.access_log import AccessLog
+from corax.buffers import AdaptiveReadSize, BufferPool
+from corax.config.server import ServerConfig
+from corax.connection_base import BaseConnectionHandler
+from corax.errors.request import InvalidRequest
+from corax.handler.admin import AdminHandler
 from corax.handler.base import BaseHandler
-from corax.http.parser import RequestParser
+from corax.hooks import ConnectionHooks
+from corax.http.body import FileBody
+from corax.http.enums import HttpStatus, ParseStatus
 from corax.http.request import CoraxRequest
-from corax.http.response import CoraxResponse
-from corax.http.serializer import ResponseSerializer
+from corax.http.response import CoraxResponse, close_body
+from corax.http.serializer import Buffer, ResponseSerializer
+from corax.metrics import ServerMetrics
 
 logger = logging.getLogger(__name__)
 
-class ConnectionHandler:
+# Most buffers a single sendmsg call is given, below the usual IOV_MAX.
+MAX_IOVECS = 512
+
+class ConnectionHandler(BaseConnectionHandler):
     """
         Manages the complete lifecycle of a single client connection.
     """
@@ -18,79 +30,276 @@ class ConnectionHandler:
         self,
         connection_socket: socket.socket,
         client_address: tuple[str, int, str, str],
-        handler: BaseHandler
+        handler: BaseHandler,
+        config: ServerConfig | None = None,
+        buffer_pool: BufferPool | None = None,
+        metrics: ServerMetrics | None = None,
+        admin: AdminHandler | None = None,
+        hooks: ConnectionHooks | None = None,
+        access_log: AccessLog | None = None
     ):
         """
-            Initializes the handler for a specific client socket.
+            Initializes the handler for a specific client socket, receive
+            buffers are borrowed from `buffer_pool` when one is shared.
+
+            Timings are recorded into `metrics` and lifecycle events are
+            reported to `hooks` when given, requests for the `admin` paths
+            are answered by it instead of the handler. Every request is
+            entered into `access_log` when one is given.
         """
+        super().__init__(client_address, config, metrics, admin, hooks, access_log)
         self.connection_socket: socket.socket = connection_socket
-        self.client_address: tuple[str, int, str, str] = client_address
         self.handler: BaseHandler = handler
+        self.buffer_pool: BufferPool = BufferPool(
+            self.config.recv_buffer_size,
+            max_buffers=1
+        ) if buffer_pool is None else buffer_pool
+        self.read_size: AdaptiveReadSize = AdaptiveReadSize(
+            self.config.recv_min_size,
+            self.buffer_pool.buffer_size
+        )
+        self.accepted_at: float = time.perf_counter()
+        self.timeout: float | None = None
 
     def handle(self) -> None:
         """
-            Orchestrates the full request-response cycle for the connection.
+            Orchestrates the request-response cycles for the connection.
+
+            The connection is kept open between requests as long as both
+            sides agree to it, it stays idle for less than the keep-alive
+            timeout and the per-connection request cap is not reached.
         """
+        if self.metrics is not None:
+            self.metrics.accept_wait.observe(time.perf_counter() - self.accepted_at)
+        self._opened()
+
         try:
-            request = self._read()
-            response = self.handler.handle(request)
-            self._write(response)
+            while True:
+                request = self._read()
+                if request is None:
+                    break
+
+                response: CoraxResponse | None = None
+                try:
+                    response = self._respond(request)
+                    serializer, keep_alive = self._serializer(request, response)
+                    self._write(serializer)
+                except BaseException:
+                    # A streaming body that was not sent still holds its file.
+                    if response is not None:
+                        close_body(response)
+                    raise
+                finally:
+                    request.body.close()
+
+                self._written(request, response, serializer)
+                if not keep_alive:
+                    break
+
+            self._flush()
+        except InvalidRequest as e:
+            logger.warning("Rejecting request from %s: %s", self.client_address, e)
+            self._reject(e.status)
         except Exception as e:
-            logger.error(f"Error handling connection: {e}")
+            logger.error("Error handling connection: %s", e)
+            self._flush_completed()
+        finally:
+            self.close()
+            self._closed()
+
+    def _respond(self, request: CoraxRequest) -> CoraxResponse:
+        """
+            Runs the handler, or the admin handler for its paths.
+        """
+        if not self.instrumented:
+            return self.handler.handle(request)
+
+        started = self._handler_started(request)
+        if self.admin is not None and self._is_admin_request(request):
+            response = self.admin.handle(request)
+        else:
+            response = self.handler.handle(request)
+        self._handler_finished(request, response, started)
+        return response
+
+    def _read(self) -> CoraxRequest | None:
+        """
+            Takes the next request out of the parser, reading from the
+            socket only when the buffered bytes do not hold it yet.
+
+            Bytes following the request stay in the parser, so pipelined
+            requests are served in the order they were sent. Returns None
+            when the client closes the connection, or lets it sit idle past
+            the keep-alive timeout, before sending a request.
+
+            Reads go into a buffer borrowed from the pool for the duration
+            of the request and are fed to the parser as memoryview slices.
+        """
+        started = time.perf_counter() if self.parser.buffered else None
+        parse_time = 0.0
+
+        status = self.parser.feed()
+        if status is ParseStatus.NEED_MORE:
+            buffer = self.buffer_pool.acquire()
+            try:
+                with memoryview(buffer) as view:
+                    while status is ParseStatus.NEED_MORE:
+                        received = self._recv_into(view)
+                        if not received:
+                            if self.parser.idle:
+                                return None
+                            raise ConnectionError("Client closed the connection in the middle of a request.")
+
+                        fed_at = time.perf_counter()
+                        if started is None:
+                            started = fed_at
+                        status = self.parser.feed(view[:received])
+                        parse_time += time.perf_counter() - fed_at
+            finally:
+                self.buffer_pool.release(buffer)
+
+        return self._take_request(status, started, parse_time)
+
+    def _recv_into(self, view: memoryview) -> int:
+        """
+            Receives the next chunk from the socket into a buffer and
+            returns its size.
+
+            Queued responses are flushed first, a pipelining client may wait
+            for them before sending anything else. Returns 0 on EOF or when
+            an idle connection times out, a request that times out part way
+            raises RequestTimeout.
+        """
+        self._flush()
+        self._set_timeout(self._read_timeout())
+        try:
+            received = self.connection_socket.recv_into(view, self.read_size.size)
+        except TimeoutError:
+            self._read_timed_out()
+            return 0
+
+        self.read_size.update(received)
+        self._received(received)
+        return received
+
+    def _set_timeout(self, timeout: float) -> None:
+        """
+            Sets the socket timeout, skipping the system call when it
+            does not change.
+        """
+        if timeout != self.timeout:
+            self.connection_socket.settimeout(timeout)
+            self.timeout = timeout
+
+    def _write(self, serializer: ResponseSerializer) -> None:
+        """
+            Serializes a CoraxResponse and queues it for the client.
+
+            Responses to requests that were already buffered go out together
+            in a single vectored send once the connection needs to read
+            again. Streaming bodies are sent as they are produced, right
+            after the queued responses.
+        """
+        if not serializer.is_streaming:
+            self._queue(serializer)
+            return
+
+        started = time.perf_counter()
+        try:
+            self.pending.append(serializer.serialize_head())
+            self._send_pending()
+            file_body = serializer.file_body
+            if file_body is not None:
+                self._sendfile(file_body)
+            else:
+                for buffers in serializer.iter_body_buffers():
+                    self._send_buffers(buffers)
         finally:
-            self._close()
-            logger.debug("Connection with the client closed successfully")
+            serializer.close()
+        self._streamed(serializer, started)
 
-    def _read(self) -> CoraxRequest:
+    def _sendfile(self, file_body: FileBody) -> None:
         """
-            Reads from the socket and parses the data into a CoraxRequest.
+            Sends a file region with zero-copy sendfile.
+
+            socket.sendfile falls back to plain sends by itself on platforms
+            without os.sendfile and for files it can't map.
         """
-        buffer = b""
-        separator = b"\r\n\r\n"
-        while True:
-            data = self.connection_socket.recv(1024)
-            buffer += data
+        self._set_timeout(self.config.write_timeout)
+        sent = self.connection_socket.sendfile(file_body.file, file_body.offset, file_body.length)
+        self._sent(sent)
 
-            if separator in buffer:
-                break
+    def _flush(self) -> None:
+        """
+            Sends every queued response at once.
+        """
+        if not self.pending:
+            return
 
-        header_end_index = buffer.find(separator)
-        raw_request_head = buffer[:header_end_index + len(separator)]
-        body_so_far = buffer[header_end_index + len(separator):]
+        started = time.perf_counter()
+        self._send_pending()
+        self._observe_write(started)
 
-        request_parser = RequestParser(raw_request_head)
-        request = request_parser.parse()
-        logger.info(f"Received request: {request.method.value} {request.uri}")
+    def _flush_completed(self) -> None:
+        """
+            Sends the responses already produced for earlier pipelined
+            requests before the connection is dropped after an error.
+        """
+        try:
+            self._flush()
+        except OSError as e:
+            logger.debug("Could not flush queued responses to %s: %s", self.client_address, e)
 
-        content_length = request.headers.get("Content-Length")
-        if  content_length is not None:
-            data_size = int(content_length)
-            unread_data_size = data_size - len(body_so_far)
+    def _send_pending(self) -> None:
+        """
+            Sends the queued buffers.
+        """
+        self._flushed(self._send_buffers(self._take_pending()))
 
-            body = body_so_far
-            if unread_data_size > 0:
-                data = self.connection_socket.recv(unread_data_size)
-                body += data
+    def _send_buffers(self, buffers: list[Buffer]) -> int:
+        """
+            Writes a list of buffers with scatter-gather sendmsg calls,
+            resuming after partial writes, and returns the bytes sent.
+        """
+        self._set_timeout(self.config.write_timeout)
+        views = [memoryview(buffer).cast("B") for buffer in buffers if buffer]
+        total = 0
+        index = 0
+        if not hasattr(self.connection_socket, "sendmsg"):
+            for view in views:
+                self.connection_socket.sendall(view)
+                total += len(view)
+            index = len(views)
 
-            request = replace(request, body=body)
+        while index < len(views):
+            sent = self.connection_socket.sendmsg(views[index:index + MAX_IOVECS])
+            total += sent
+            while sent:
+                size = len(views[index])
+                if sent < size:
+                    views[index] = views[index][sent:]
+                    break
+                sent -= size
+                index += 1
 
-        logger.debug(f"Request body received: {request.body.decode('utf-8', 'ignore') or 'No body'}")
-        return request
+        self._sent(total)
+        return total
 
-    def _write(self, response: CoraxResponse) -> None:
+    def _reject(self, status: HttpStatus) -> None:
         """
-            Serializes and sends a CoraxResponse to the client.
+            Answers with an error status right before the connection closes.
         """
-        serializer = ResponseSerializer(response)
-        raw_response = serializer.serialize()
-        self.connection_socket.sendall(raw_response)
-        logger.info(f"Response sent: {response.status.code} {response.status.phrase}")
+        try:
+            self._write(self._rejection(status))
+            self._flush()
+        except OSError as e:
+            logger.warning("Could not send %d to %s: %s", status.code, self.client_address, e)
 
-    def _close(self) -> None:
+    def close(self) -> None:
         """
             Closes the client connection.
         """
         try:
             self.connection_socket.close()
         except OSError as e:
-            logger.warning(f"Ignoring error while closing socket for {self.client_address}: {e}")
+            logger.warning("Ignoring error while closing socket for %s: %s", self.client_address, e)
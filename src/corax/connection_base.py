@@ -0,0 +1,297 @@
+import time
+import logging
+
+from corax.access_log import AccessLog
+from corax.config.server import ServerConfig
+from corax.errors.request import RequestTimeout
+from corax.handler.admin import AdminHandler
+from corax.hooks import ConnectionHooks
+from corax.http.enums import HttpMethod, HttpStatus, ParseStatus
+from corax.http.keepalive import (
+    closes_connection,
+    set_connection_headers,
+    wants_keep_alive,
+)
+from corax.http.parser import RequestParser
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse, error_response
+from corax.http.serializer import Buffer, ResponseSerializer
+from corax.metrics import ServerMetrics
+
+logger = logging.getLogger(__name__)
+
+class BaseConnectionHandler:
+    """
+        The part of a client connection that does not depend on how bytes
+        are moved: the parser and the queued responses, the keep-alive and
+        timeout decisions, and the metrics, hooks and access log records.
+
+        ConnectionHandler and AsyncConnectionHandler build on it over a
+        blocking socket and an asyncio stream, they implement reading,
+        sending and sendfile, and the request loop calling them.
+    """
+    def __init__(
+        self,
+        client_address: tuple[str, int, str, str],
+        config: ServerConfig | None = None,
+        metrics: ServerMetrics | None = None,
+        admin: AdminHandler | None = None,
+        hooks: ConnectionHooks | None = None,
+        access_log: AccessLog | None = None
+    ) -> None:
+        """
+            Initializes the state of a connection with a client.
+
+            Timings are recorded into `metrics` and lifecycle events are
+            reported to `hooks` when given, requests for the `admin` paths
+            are answered by it instead of the handler. Every request is
+            entered into `access_log` when one is given.
+        """
+        self.client_address: tuple[str, int, str, str] = client_address
+        self.config: ServerConfig = ServerConfig() if config is None else config
+        self.requests_served: int = 0
+        self.parser: RequestParser = RequestParser(
+            max_header_size=self.config.max_header_size,
+            max_header_count=self.config.max_header_count,
+            max_body_size=self.config.max_body_size,
+            body_spool_threshold=self.config.body_spool_threshold
+        )
+        self.pending: list[Buffer] = []
+        self.metrics: ServerMetrics | None = metrics
+        self.admin: AdminHandler | None = admin
+        self.hooks: ConnectionHooks | None = hooks
+        self.access_log: AccessLog | None = access_log
+        # Whether handling a request has anything to record or route.
+        self.instrumented: bool = not (
+            metrics is None and hooks is None and admin is None and access_log is None
+        )
+        self.unflushed_responses: list[tuple[CoraxRequest, CoraxResponse]] = []
+        self.unflushed_time: float = 0.0
+        self.head_deadline: float = 0.0
+
+    def _opened(self) -> None:
+        """
+            Records a connection about to be served.
+        """
+        if self.metrics is not None:
+            self.metrics.connections.inc()
+            self.metrics.active_connections.inc()
+        if self.hooks is not None:
+            self.hooks.on_accepted(self.client_address, time.monotonic())
+
+    def _closed(self) -> None:
+        """
+            Records a connection that was closed.
+        """
+        if self.metrics is not None:
+            self.metrics.active_connections.dec()
+        if self.hooks is not None:
+            self.hooks.on_closed(self.client_address, time.monotonic())
+        logger.debug("Connection with the client closed successfully")
+
+    def _take_request(self, status: ParseStatus, started: float | None, parse_time: float) -> CoraxRequest:
+        """
+            Takes the request the parser completed, raising its error if it
+            failed, and records the time spent reading and parsing it.
+        """
+        if self.metrics is not None and started is not None:
+            read_time = time.perf_counter() - started - parse_time
+            self.metrics.phase_duration.observe(read_time, ("read",))
+            self.metrics.phase_duration.observe(parse_time, ("parse",))
+
+        if status is ParseStatus.ERROR and self.parser.error is not None:
+            raise self.parser.error
+
+        request = self.parser.pop_request()
+        self.requests_served += 1
+        self.head_deadline = 0.0
+        if self.hooks is not None:
+            self.hooks.on_head_parsed(request, self.parser.head_parsed_at)
+        logger.info("Received request: %s %s", request.method.value, request.uri)
+        logger.debug("Request body received: %d bytes", len(request.body))
+        return request
+
+    def _read_timeout(self) -> float:
+        """
+            Returns how long the next read may wait: the idle or keep-alive
+            timeout between requests, what is left of the header timeout
+            while a head comes in, and the body timeout while a body does.
+        """
+        config = self.config
+        if self.parser.idle:
+            return config.keep_alive_timeout if self.requests_served else config.idle_timeout
+        if self.parser.reading_body:
+            return config.body_timeout
+
+        now = time.monotonic()
+        if not self.head_deadline:
+            self.head_deadline = now + config.header_timeout
+        remaining = self.head_deadline - now
+        if remaining <= 0:
+            raise RequestTimeout()
+        return remaining
+
+    def _read_timed_out(self) -> None:
+        """
+            Handles a read that timed out: an idle connection is closed
+            without a word, a request that stalled part way raises
+            RequestTimeout.
+        """
+        if not self.parser.idle:
+            raise RequestTimeout()
+        logger.debug("Idle timeout reached for %s", self.client_address)
+
+    def _received(self, size: int) -> None:
+        """
+            Records the bytes of a read.
+        """
+        if self.metrics is not None:
+            self.metrics.bytes_received.inc(size)
+
+    def _is_admin_request(self, request: CoraxRequest) -> bool:
+        """
+            Tells whether a request is for one of the admin paths.
+        """
+        return self.admin is not None and request.uri.partition("?")[0] in self.admin.paths
+
+    def _handler_started(self, request: CoraxRequest) -> float:
+        """
+            Reports a request handed to a handler, returns when it was.
+        """
+        if self.hooks is not None:
+            self.hooks.on_handler_start(request, time.monotonic())
+        return time.perf_counter()
+
+    def _handler_finished(self, request: CoraxRequest, response: CoraxResponse, started: float) -> None:
+        """
+            Records the response of a handler started at `started`.
+        """
+        if self.hooks is not None:
+            self.hooks.on_handler_end(request, response, time.monotonic())
+        if self.metrics is not None:
+            self.metrics.phase_duration.observe(time.perf_counter() - started, ("handle",))
+            self.metrics.requests.inc(labels=(request.method.value, str(response.status.code)))
+        if self.access_log is not None:
+            self.access_log.record(self.client_address, request, response, time.perf_counter() - started)
+
+    def _serializer(self, request: CoraxRequest, response: CoraxResponse) -> tuple[ResponseSerializer, bool]:
+        """
+            Frames a response and sets its connection headers, returns its
+            serializer and whether the connection stays open after it.
+        """
+        serializer = ResponseSerializer(
+            response,
+            head_only=request.method is HttpMethod.HEAD
+        )
+        keep_alive = (
+            self._keep_alive(request, response)
+            and not serializer.delimited_by_close
+        )
+        set_connection_headers(
+            response,
+            keep_alive,
+            self.config.keep_alive_timeout,
+            self.config.max_keep_alive_requests - self.requests_served
+        )
+        return serializer, keep_alive
+
+    def _keep_alive(self, request: CoraxRequest, response: CoraxResponse) -> bool:
+        """
+            Decides whether the connection stays open after this response.
+        """
+        return (
+            self.config.keep_alive
+            and self.requests_served < self.config.max_keep_alive_requests
+            and wants_keep_alive(request)
+            and not closes_connection(response)
+        )
+
+    def _queue(self, serializer: ResponseSerializer) -> None:
+        """
+            Queues a response with a complete body, to be sent with the
+            next flush.
+        """
+        started = time.perf_counter()
+        self.pending.extend(serializer.serialize_buffers())
+        # The body of a HEAD response is not sent, release it now.
+        serializer.close()
+        self.unflushed_time += time.perf_counter() - started
+        response = serializer.response
+        logger.info("Response queued: %d %s", response.status.code, response.status.phrase)
+
+    def _streamed(self, serializer: ResponseSerializer, started: float) -> None:
+        """
+            Records a streaming response whose sending began at `started`.
+        """
+        self._observe_write(started)
+        response = serializer.response
+        logger.info("Response streamed: %d %s", response.status.code, response.status.phrase)
+
+    def _written(self, request: CoraxRequest, response: CoraxResponse, serializer: ResponseSerializer) -> None:
+        """
+            Keeps a written response to report to the hooks once it is
+            flushed, which streaming ones already are.
+        """
+        if self.hooks is not None:
+            self.unflushed_responses.append((request, response))
+            if serializer.is_streaming:
+                self._notify_flushed()
+
+    def _take_pending(self) -> list[Buffer]:
+        """
+            Hands out the queued buffers for sending.
+        """
+        buffers = self.pending
+        self.pending = []
+        return buffers
+
+    def _flushed(self, sent: int) -> None:
+        """
+            Records the queued buffers as sent.
+        """
+        logger.debug("Flushed %d bytes to %s", sent, self.client_address)
+        if self.hooks is not None:
+            self._notify_flushed()
+
+    def _notify_flushed(self) -> None:
+        """
+            Reports the responses handed to the socket so far to the hooks.
+        """
+        hooks = self.hooks
+        if hooks is None:
+            return
+
+        timestamp = time.monotonic()
+        for request, response in self.unflushed_responses:
+            hooks.on_response_flushed(request, response, timestamp)
+        self.unflushed_responses.clear()
+
+    def _sent(self, size: int) -> None:
+        """
+            Records the bytes of a write.
+        """
+        if self.metrics is not None:
+            self.metrics.bytes_sent.inc(size)
+
+    def _observe_write(self, started: float) -> None:
+        """
+            Records the time spent writing since `started`, plus the time
+            spent serializing the responses queued in the meantime.
+        """
+        if self.metrics is not None:
+            write_time = self.unflushed_time + time.perf_counter() - started
+            self.metrics.phase_duration.observe(write_time, ("write",))
+        self.unflushed_time = 0.0
+
+    def _rejection(self, status: HttpStatus) -> ResponseSerializer:
+        """
+            Builds and records the error response sent right before the
+            connection closes on an invalid request.
+        """
+        if self.metrics is not None:
+            self.metrics.requests.inc(labels=("UNKNOWN", str(status.code)))
+
+        response = error_response(status)
+        if self.access_log is not None:
+            self.access_log.record(self.client_address, None, response, 0.0)
+        return ResponseSerializer(response)
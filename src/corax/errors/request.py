@@ -1,5 +1,41 @@
+from corax.http.enums import HttpStatus
+
 class InvalidRequest(Exception):
+    status: HttpStatus = HttpStatus.BAD_REQUEST
+
     def __init__(self, message: str | None = None) -> None:
         if message is None:
             message = "Request has an invalid format, either first line or the headers weren't provided!"
         super().__init__(message)
+
+class RequestHeaderTooLarge(InvalidRequest):
+    status: HttpStatus = HttpStatus.REQUEST_HEADER_FIELDS_TOO_LARGE
+
+    def __init__(self, message: str | None = None) -> None:
+        if message is None:
+            message = "Request head exceeds the allowed size or number of header fields!"
+        super().__init__(message)
+
+class PayloadTooLarge(InvalidRequest):
+    status: HttpStatus = HttpStatus.PAYLOAD_TOO_LARGE
+
+    def __init__(self, message: str | None = None) -> None:
+        if message is None:
+            message = "Request body exceeds the allowed size!"
+        super().__init__(message)
+
+class UnsupportedTransferCoding(InvalidRequest):
+    status: HttpStatus = HttpStatus.NOT_IMPLEMENTED
+
+    def __init__(self, message: str | None = None) -> None:
+        if message is None:
+            message = "Request body uses a transfer coding the server does not support!"
+        super().__init__(message)
+
+class RequestTimeout(InvalidRequest):
+    status: HttpStatus = HttpStatus.REQUEST_TIMEOUT
+
+    def __init__(self, message: str | None = None) -> None:
+        if message is None:
+            message = "Request was not received within the allowed time!"
+        super().__init__(message)
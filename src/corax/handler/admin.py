@@ -0,0 +1,94 @@
+from urllib.parse import parse_qs, urlsplit
+
+from corax.handler.base import BaseHandler
+from corax.http.enums import HttpMethod, HttpStatus
+from corax.http.headers import Headers
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse, error_response
+from corax.metrics import ServerMetrics
+from corax.profiler import SamplingProfiler
+
+class AdminHandler(BaseHandler):
+    """
+        Serves the admin endpoints of a server: the metrics in the
+        Prometheus text format, and a trigger for the sampling profiler.
+
+        The connection handlers route requests for `paths` here instead of
+        to the application handler, on the admin side port every request
+        comes here.
+    """
+    def __init__(
+        self,
+        metrics: ServerMetrics | None = None,
+        profiler: SamplingProfiler | None = None,
+        metrics_path: str = "/metrics",
+        profile_path: str = "",
+        profile_duration: float = 30.0
+    ) -> None:
+        """
+            Initializes the endpoints of the given metrics and profiler.
+        """
+        self.metrics: ServerMetrics | None = metrics
+        self.profiler: SamplingProfiler | None = profiler
+        self.metrics_path: str = metrics_path
+        self.profile_path: str = profile_path
+        self.profile_duration: float = profile_duration
+
+        paths = set()
+        if metrics is not None:
+            paths.add(metrics_path)
+        if profiler is not None and profile_path:
+            paths.add(profile_path)
+        self.paths: frozenset[str] = frozenset(paths)
+
+    def handle(self, request: CoraxRequest) -> CoraxResponse:
+        """
+            Dispatches a request to the endpoint of its path.
+        """
+        uri = urlsplit(request.uri)
+        if uri.path not in self.paths:
+            return error_response(HttpStatus.NOT_FOUND, request.http_version)
+
+        if self.metrics is not None and uri.path == self.metrics_path:
+            if request.method not in (HttpMethod.GET, HttpMethod.HEAD):
+                return error_response(HttpStatus.METHOD_NOT_ALLOWED, request.http_version)
+            return self.metrics.response(request.http_version)
+
+        if self.profiler is None:
+            return error_response(HttpStatus.NOT_FOUND, request.http_version)
+        if request.method is not HttpMethod.POST:
+            return error_response(HttpStatus.METHOD_NOT_ALLOWED, request.http_version)
+        return self._start_profiler(request, self.profiler, uri.query)
+
+    def _start_profiler(
+        self,
+        request: CoraxRequest,
+        profiler: SamplingProfiler,
+        query: str
+    ) -> CoraxResponse:
+        """
+            Starts a profiling run, `?seconds=` overrides its duration.
+        """
+        duration = self.profile_duration
+        try:
+            duration = float(parse_qs(query).get("seconds", [duration])[0])
+        except ValueError:
+            return error_response(HttpStatus.BAD_REQUEST, request.http_version)
+        if not 0 < duration <= 3600:
+            return error_response(HttpStatus.BAD_REQUEST, request.http_version)
+
+        output_path = profiler.start(duration)
+        if output_path is None:
+            return error_response(HttpStatus.CONFLICT, request.http_version)
+
+        body = f"Profiling for {duration:g} seconds into {output_path}\n".encode("utf-8")
+        headers = Headers()
+        headers["Content-Type"] = "text/plain; charset=utf-8"
+        headers["Content-Length"] = str(len(body))
+
+        return CoraxResponse(
+            request.http_version,
+            HttpStatus.ACCEPTED,
+            headers,
+            body
+        )
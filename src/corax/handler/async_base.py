@@ -0,0 +1,42 @@
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+
+from corax.handler.base import BaseHandler
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse
+
+
+class AsyncBaseHandler(ABC):
+    """
+        Defines the interface for request handlers running on an event loop.
+
+        This is the asyncio counterpart of BaseHandler, `handle` must not
+        block the loop.
+    """
+    @abstractmethod
+    async def handle(self, request: CoraxRequest) -> CoraxResponse:
+        """
+            Processes an incoming request and returns a response.
+        """
+        pass
+
+
+class SyncHandlerAdapter(AsyncBaseHandler):
+    """
+        Runs a blocking BaseHandler in an executor so it can be awaited.
+    """
+    def __init__(self, handler: BaseHandler, executor: Executor | None = None) -> None:
+        """
+            Wraps a synchronous handler, the loop's default executor is used
+            when none is given.
+        """
+        self.handler: BaseHandler = handler
+        self.executor: Executor | None = executor
+
+    async def handle(self, request: CoraxRequest) -> CoraxResponse:
+        """
+            Delegates the request to the wrapped handler on a worker thread.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.handler.handle, request)
@@ -0,0 +1,232 @@
+import time
+import threading
+from dataclasses import dataclass, field
+
+from corax.cache import CacheStats, LRUCache
+from corax.handler.base import BaseHandler
+from corax.http.cache_control import max_age, parse_cache_control
+from corax.http.conditional import NOT_MODIFIED_HEADERS, is_not_modified, parse_http_date
+from corax.http.enums import HttpMethod, HttpStatus
+from corax.http.headers import Headers
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse
+
+# Statuses cacheable without explicit freshness information (RFC 9110, 15.1).
+CACHEABLE_STATUSES = frozenset({200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501})
+
+# Response directives that keep a response out of a shared cache.
+UNCACHEABLE_DIRECTIVES = ("no-store", "no-cache", "private")
+
+# Bytes counted for an entry on top of its body and headers.
+ENTRY_OVERHEAD = 256
+
+# (method, URI) and the values of the request headers named by Vary.
+CacheKey = tuple[HttpMethod, str, tuple[str | None, ...]]
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    """
+        A stored response along with its key, the header names it varies
+        on, when it was stored and until when it may be served on the
+        monotonic clock, and its validators: the ETag and the Last-Modified
+        time as a timestamp.
+    """
+    response: CoraxResponse
+    key: CacheKey
+    vary: tuple[str, ...]
+    stored_at: float
+    expires_at: float
+    etag: str | None
+    modified_at: float | None
+
+@dataclass(slots=True)
+class Flight:
+    """
+        A call of the inner handler that concurrent requests for the same
+        key wait on instead of making their own.
+    """
+    done: threading.Event = field(default_factory=threading.Event)
+    entry: CachedResponse | None = None
+
+class CachingHandler(BaseHandler):
+    """
+        Caches the complete responses of an inner handler in memory.
+
+        Responses to GET and HEAD requests are stored when their status is
+        cacheable, their body is bytes and neither Cache-Control nor
+        Set-Cookie forbids it. They live for `s-maxage` or `max-age` seconds
+        when given, `default_ttl` otherwise. The key is the method, the URI
+        and the values of the request headers the response names in Vary.
+        Entries share an LRU byte budget of `max_bytes`.
+
+        Concurrent misses for a key are coalesced: one request runs the
+        inner handler while the others wait and reuse its response, if it
+        turned out cacheable. Every request gets its own copy of the
+        headers, the connection handlers modify them.
+
+        Conditional requests are answered from the cache too: a stored
+        response whose ETag or Last-Modified validators match the request
+        is served as a 304 carrying them. Range requests are left to the
+        inner handler, like requests with an Authorization header or asking
+        for `no-cache` or `no-store`, and are not answered from the cache.
+    """
+    def __init__(
+        self,
+        handler: BaseHandler,
+        max_bytes: int = 16777216,
+        default_ttl: float = 1.0,
+        max_entry_size: int = 1048576
+    ) -> None:
+        """
+            Wraps `handler`, keeping at most `max_bytes` bytes of responses
+            of at most `max_entry_size` bytes each.
+        """
+        self.handler: BaseHandler = handler
+        self.default_ttl: float = default_ttl
+        self.max_entry_size: int = max_entry_size
+        self.responses: LRUCache[CacheKey, CachedResponse] = LRUCache(max_bytes)
+        self.vary: LRUCache[tuple[HttpMethod, str], tuple[str, ...]] = LRUCache(max(max_bytes // 64, 65536))
+        self.flights: dict[CacheKey, Flight] = {}
+        self.lock: threading.Lock = threading.Lock()
+
+    def handle(self, request: CoraxRequest) -> CoraxResponse:
+        """
+            Answers from the cache when a fresh response is stored, runs
+            the inner handler once per key otherwise.
+        """
+        if request.method not in (HttpMethod.GET, HttpMethod.HEAD):
+            return self.handler.handle(request)
+        if "Authorization" in request.headers or "Range" in request.headers:
+            return self.handler.handle(request)
+
+        request_directives = parse_cache_control(request.headers.get("Cache-Control") or "")
+        if "no-store" in request_directives:
+            return self.handler.handle(request)
+
+        vary_names = self.vary.get((request.method, request.uri)) or ()
+        key = self._key(request, vary_names)
+        if "no-cache" not in request_directives:
+            entry = self.responses.get(key, self._is_fresh)
+            if entry is not None:
+                return self._serve(request, entry)
+
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self.flights[key] = Flight()
+
+        if not leader:
+            flight.done.wait()
+            entry = flight.entry
+            if entry is None:
+                return self.handler.handle(request)
+            # The leader's response only fits if it varies the same way,
+            # otherwise the request is keyed again with the Vary names now known.
+            if self._key(request, entry.vary) == entry.key:
+                return self._serve(request, entry)
+            return self.handle(request)
+
+        try:
+            response = self.handler.handle(request)
+            flight.entry = entry = self._store(request, response)
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+
+        return response if entry is None else self._serve(request, entry)
+
+    def stats(self) -> CacheStats:
+        """
+            Returns the counters of the response cache.
+        """
+        return self.responses.stats()
+
+    def _store(self, request: CoraxRequest, response: CoraxResponse) -> CachedResponse | None:
+        """
+            Stores a copy of a response if it may be cached and returns the
+            entry, or None when it was not stored.
+        """
+        if response.status.code not in CACHEABLE_STATUSES or not isinstance(response.body, bytes):
+            return None
+        if "Set-Cookie" in response.headers:
+            return None
+
+        directives = parse_cache_control(response.headers.get("Cache-Control") or "")
+        if any(directive in directives for directive in UNCACHEABLE_DIRECTIVES):
+            return None
+        ttl = max_age(directives)
+        if ttl is None:
+            ttl = self.default_ttl
+        if ttl <= 0:
+            return None
+
+        vary_names = tuple(
+            name.strip()
+            for value in response.headers.get_all("Vary")
+            for name in value.split(",")
+            if name.strip()
+        )
+        if "*" in vary_names:
+            return None
+
+        headers = response.headers.copy()
+        size = ENTRY_OVERHEAD + len(response.body) + sum(
+            len(name) + len(value)
+            for name in headers
+            for value in headers.get_all(name)
+        )
+        if size > self.max_entry_size:
+            return None
+
+        last_modified = headers.get("Last-Modified")
+        now = time.monotonic()
+        entry = CachedResponse(
+            CoraxResponse(response.http_version, response.status, headers, response.body),
+            self._key(request, vary_names),
+            vary_names,
+            now,
+            now + ttl,
+            headers.get("ETag"),
+            None if last_modified is None else parse_http_date(last_modified)
+        )
+        self.vary.put((request.method, request.uri), vary_names, ENTRY_OVERHEAD + len(request.uri))
+        self.responses.put(entry.key, entry, size)
+        return entry
+
+    def _serve(self, request: CoraxRequest, entry: CachedResponse) -> CoraxResponse:
+        """
+            Builds the response for a request from a stored entry, with its
+            own headers and an Age header, or a 304 when the conditional
+            headers of the request match the validators of the entry.
+        """
+        cached = entry.response
+        age = str(int(time.monotonic() - entry.stored_at))
+        if cached.status is HttpStatus.OK and is_not_modified(request, entry.etag, entry.modified_at):
+            headers = Headers()
+            for name in NOT_MODIFIED_HEADERS:
+                for value in cached.headers.get_all(name):
+                    headers.add(name, value)
+            headers["Age"] = age
+            return CoraxResponse(request.http_version, HttpStatus.NOT_MODIFIED, headers, b"")
+
+        headers = cached.headers.copy()
+        headers["Age"] = age
+        return CoraxResponse(request.http_version, cached.status, headers, cached.body)
+
+    def _key(self, request: CoraxRequest, vary_names: tuple[str, ...]) -> CacheKey:
+        """
+            Builds the cache key of a request for the given Vary names.
+        """
+        return (
+            request.method,
+            request.uri,
+            tuple(request.headers.get(name) for name in vary_names)
+        )
+
+    def _is_fresh(self, entry: CachedResponse) -> bool:
+        """
+            Tells whether a stored entry may still be served.
+        """
+        return time.monotonic() < entry.expires_at
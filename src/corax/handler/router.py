@@ -0,0 +1,206 @@
+from dataclasses import replace
+from typing import Iterable
+from urllib.parse import unquote
+
+from corax.handler.base import BaseHandler
+from corax.http.enums import HttpMethod, HttpStatus
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse, error_response
+
+class RouteNode:
+    """
+        A node of the routing tree, standing for one path segment.
+
+        Static segments are looked up in a dict, so the cost of a step does
+        not depend on how many routes share the node. A node has at most
+        one parameter child, matching any single segment.
+    """
+    __slots__ = ("children", "param_name", "param_child", "handlers", "mount")
+
+    def __init__(self) -> None:
+        """
+            Initializes a node with no route.
+        """
+        self.children: dict[str, RouteNode] = {}
+        self.param_name: str = ""
+        self.param_child: RouteNode | None = None
+        self.handlers: dict[HttpMethod, BaseHandler] = {}
+        self.mount: BaseHandler | None = None
+
+class Router(BaseHandler):
+    """
+        Dispatches requests to handlers by method and path.
+
+        Routes are compiled into a radix tree whose edges are path
+        segments, a lookup walks one node per segment of the requested
+        path however many routes are registered. Segments written as
+        `{name}` match any single segment and are handed to the handler in
+        `request.params`, static segments take precedence over them as
+        long as they have a route for the requested method.
+
+        A handler mounted on a prefix receives every request below it that
+        no route matches, with the prefix removed from the URI, e.g. a
+        StaticHandler mounted on `/static`.
+
+        HEAD requests fall back to the GET handler. A path with routes for
+        other methods only is answered with 405 and an `Allow` header
+        listing the methods of every route matching the path, it is not
+        passed on to a mount.
+    """
+    def __init__(self, not_found: BaseHandler | None = None) -> None:
+        """
+            Initializes an empty router, requests matching nothing go to
+            `not_found` when given or get a plain 404.
+        """
+        self.root: RouteNode = RouteNode()
+        self.not_found: BaseHandler | None = not_found
+
+    def add(
+        self,
+        path: str,
+        handler: BaseHandler,
+        methods: Iterable[HttpMethod] = (HttpMethod.GET,)
+    ) -> None:
+        """
+            Routes requests for `path` with one of `methods` to `handler`.
+        """
+        node = self._insert(path)
+        for method in methods:
+            if method in node.handlers:
+                raise ValueError(f"A {method.value} route for {path} already exists.")
+            node.handlers[method] = handler
+
+    def mount(self, prefix: str, handler: BaseHandler) -> None:
+        """
+            Hands every request below `prefix` that no route matches to
+            `handler`, with the prefix removed from its URI. Mounting on
+            "/" catches every unmatched request.
+        """
+        if "{" in prefix:
+            raise ValueError(f"Mount prefixes can't have parameters, got {prefix!r}.")
+
+        path = prefix.rstrip("/")
+        node = self._insert(path) if path else self.root
+        if node.mount is not None:
+            raise ValueError(f"A handler is already mounted on {prefix}.")
+        node.mount = handler
+
+    def handle(self, request: CoraxRequest) -> CoraxResponse:
+        """
+            Dispatches a request to the handler of the best matching route.
+        """
+        path, separator, query = request.uri.partition("?")
+        segments = path.split("/")
+        if segments[0] or len(segments) < 2:
+            return self._not_found(request)
+
+        params: dict[str, str] = {}
+        mounts: list[tuple[int, BaseHandler]] = []
+        allowed: set[HttpMethod] = set()
+        handler = self._match(self.root, segments, 1, request.method, params, mounts, allowed)
+
+        if handler is not None:
+            return handler.handle(replace(request, params=params) if params else request)
+
+        if allowed:
+            response = error_response(
+                HttpStatus.METHOD_NOT_ALLOWED,
+                request.http_version,
+                close=False
+            )
+            response.headers["Allow"] = self._allow(allowed)
+            return response
+
+        if mounts:
+            depth, handler = max(mounts, key=lambda mount: mount[0])
+            rest = "/" + "/".join(segments[depth:])
+            return handler.handle(replace(request, uri=rest + separator + query))
+
+        return self._not_found(request)
+
+    def _match(
+        self,
+        node: RouteNode,
+        segments: list[str],
+        index: int,
+        method: HttpMethod,
+        params: dict[str, str],
+        mounts: list[tuple[int, BaseHandler]],
+        allowed: set[HttpMethod]
+    ) -> BaseHandler | None:
+        """
+            Finds the handler of a route for the segments from `index` on
+            and `method`, filling in the parameters on the way.
+
+            Mounts passed on the way are collected with the depth they
+            cover, and the methods of routes matching the path but not the
+            method in `allowed`. A static child that leads to no handler is
+            backtracked from so the parameter child is tried as well.
+        """
+        if node.mount is not None:
+            mounts.append((index, node.mount))
+        if index == len(segments):
+            handlers = node.handlers
+            handler = handlers.get(method)
+            if handler is None and method is HttpMethod.HEAD:
+                handler = handlers.get(HttpMethod.GET)
+            if handler is None:
+                allowed.update(handlers)
+            return handler
+
+        segment = segments[index]
+        child = node.children.get(segment)
+        if child is not None:
+            found = self._match(child, segments, index + 1, method, params, mounts, allowed)
+            if found is not None:
+                return found
+
+        param_child = node.param_child
+        if param_child is not None and segment:
+            found = self._match(param_child, segments, index + 1, method, params, mounts, allowed)
+            if found is not None:
+                params[node.param_name] = unquote(segment)
+                return found
+        return None
+
+    def _insert(self, path: str) -> RouteNode:
+        """
+            Returns the node of a route path, creating the missing ones.
+        """
+        if not path.startswith("/"):
+            raise ValueError(f"Route paths must start with '/', got {path!r}.")
+
+        node = self.root
+        for segment in path.split("/")[1:]:
+            if segment.startswith("{") and segment.endswith("}"):
+                name = segment[1:-1]
+                if not name.isidentifier():
+                    raise ValueError(f"Invalid parameter name {name!r} in {path}.")
+                if node.param_child is None:
+                    node.param_child = RouteNode()
+                    node.param_name = name
+                elif node.param_name != name:
+                    raise ValueError(
+                        f"Parameter {{{name}}} in {path} conflicts with {{{node.param_name}}}."
+                    )
+                node = node.param_child
+            else:
+                node = node.children.setdefault(segment, RouteNode())
+        return node
+
+    def _allow(self, methods: set[HttpMethod]) -> str:
+        """
+            Builds the `Allow` header value of a set of routed methods, HEAD
+            is implied by GET.
+        """
+        if HttpMethod.GET in methods:
+            methods = methods | {HttpMethod.HEAD}
+        return ", ".join(method.value for method in HttpMethod if method in methods)
+
+    def _not_found(self, request: CoraxRequest) -> CoraxResponse:
+        """
+            Answers a request no route matches.
+        """
+        if self.not_found is not None:
+            return self.not_found.handle(request)
+        return error_response(HttpStatus.NOT_FOUND, request.http_version, close=False)
@@ -1,45 +1,298 @@
+import os
+import re
+import time
+import secrets
+from dataclasses import dataclass
+from fnmatch import translate
 from pathlib import Path
+from stat import S_ISREG
 
+from corax.cache import LRUCache
 from corax.handler.base import BaseHandler
-from corax.http.enums import HttpStatus
+from corax.handler.static_index import FileEntry, StaticIndex
+from corax.http.body import FileBody
+from corax.http.conditional import is_not_modified
+from corax.http.encoding import (
+    COMPRESSORS,
+    PRECOMPRESSED_SUFFIXES,
+    is_compressible,
+    negotiate_encoding,
+)
+from corax.http.enums import HttpMethod, HttpStatus
 from corax.http.headers import Headers
+from corax.http.ranges import (
+    ByteRange,
+    MultipartRanges,
+    content_range,
+    parse_range_header,
+)
 from corax.http.request import CoraxRequest
 from corax.http.response import CoraxResponse
 
+# Budget in bytes of the URI to file entry map kept next to the content
+# cache, and the bytes counted for an entry on top of its URI.
+ENTRY_CACHE_SIZE = 1048576
+ENTRY_OVERHEAD = 512
+
+# Seconds a precompressed sibling found missing is not looked for again,
+# when there is no index.
+MISSING_SIBLING_TTL = 5.0
+
+@dataclass(frozen=True, slots=True)
+class CachedFile:
+    """
+        The contents of a static file together with the metadata used to
+        detect that the file changed on disk.
+    """
+    content: bytes
+    size: int
+    mtime_ns: int
+
 class StaticHandler(BaseHandler):
     """
         A request handler that serves static files from a root directory.
+
+        Small files can be kept in an in-memory LRU cache bounded by
+        `cache_size` bytes, entries are dropped as soon as the size or the
+        modification time of the file changes. The cache also remembers
+        which file a URI resolved to, so a hit costs a single stat() call.
+
+        With `use_index` the root directory is indexed at startup and
+        URIs are resolved with a dict lookup instead of filesystem calls,
+        the index is rescanned every `index_refresh_interval` seconds.
+
+        Every file is served with ETag and Last-Modified validators, and
+        GET/HEAD requests whose If-None-Match or If-Modified-Since match
+        are answered with 304 Not Modified. `cache_control` is a list of
+        (URI glob pattern, Cache-Control value) pairs, the first pattern
+        matching the URI sets the header.
+
+        Range requests get 206 Partial Content, a single range is sent with
+        sendfile from its offset and several ranges as multipart/byteranges
+        read through a memory map. If-Range is honored.
+
+        With `compression` the response encoding is negotiated from
+        Accept-Encoding. A precompressed sibling (`app.js.gz`, `.br`,
+        `.zst`) at least as recent as the file is preferred, otherwise
+        compressible types are compressed on the fly and the result is
+        kept in an LRU cache of `compression_cache_size` bytes keyed by
+        the file identity. Without the index, siblings found missing are
+        not looked for again for MISSING_SIBLING_TTL seconds.
     """
-    def __init__(self, base_folder: str | Path) -> None:
+    def __init__(
+        self,
+        base_folder: str | Path,
+        cache_size: int = 0,
+        cache_max_file_size: int = 65536,
+        use_index: bool = False,
+        index_refresh_interval: float = 5.0,
+        cache_control: list[tuple[str, str]] | None = None,
+        compression: bool = False,
+        compression_cache_size: int = 16777216,
+        compression_min_size: int = 256,
+        compression_max_size: int = 4194304
+    ) -> None:
         """
-            Initializes the handler with a specific root directory.
+            Initializes the handler with a specific root directory, a cache
+            size of 0 disables the content cache.
         """
         self.base_folder: Path = Path(base_folder).resolve()
+        self.cache_max_file_size: int = cache_max_file_size
+        self.cache: LRUCache[Path, CachedFile] | None = None
+        self.entries: LRUCache[str, FileEntry] | None = None
+        self.index: StaticIndex | None = None
+        self.cache_control: list[tuple[re.Pattern[str], str]] = [
+            (re.compile(translate(pattern)), value)
+            for pattern, value in cache_control or []
+        ]
+
+        self.compression: bool = compression
+        self.compression_min_size: int = compression_min_size
+        self.compression_max_size: int = compression_max_size
+        self.compressed_cache: LRUCache[tuple[Path, int, int, str], bytes] = LRUCache(
+            compression_cache_size
+        )
+        self.missing_siblings: LRUCache[Path, float] = LRUCache(ENTRY_CACHE_SIZE)
+
+        if cache_size > 0:
+            self.cache = LRUCache(cache_size)
+            self.entries = LRUCache(ENTRY_CACHE_SIZE)
 
         if not self.base_folder.exists():
             self.base_folder.mkdir()
         elif not self.base_folder.is_dir():
             raise FileNotFoundError(f"Root directory '{self.base_folder}' is not a directory.")
 
+        if use_index:
+            self.index = StaticIndex(self.base_folder, index_refresh_interval)
+
     def handle(self, request: CoraxRequest) -> CoraxResponse:
         """
             Handles a request by attempting to find and serve a static file.
         """
         uri = request.uri
         http_version = request.http_version
-        file_path = self._get_safe_path(uri)
+        file_entry = self._find_file(uri)
 
-        if file_path is None:
+        if file_entry is None:
             return self._not_found(http_version)
 
-        return self._serve_file(file_path, http_version)
+        encoding = self._negotiate_encoding(request, file_entry)
+        etag = file_entry.etag
+        if encoding is not None:
+            etag = f'{etag[:-1]}-{encoding[0]}"'
+
+        headers = self._validator_headers(uri, file_entry, etag)
+        if encoding is not None or (self.compression and is_compressible(file_entry.content_type)):
+            headers["Vary"] = "Accept-Encoding"
 
-    def _serve_file(self, file_path: Path, http_version: str) -> CoraxResponse:
+        if is_not_modified(request, etag, file_entry.mtime_ns // 1_000_000_000):
+            return CoraxResponse(
+                http_version,
+                HttpStatus.NOT_MODIFIED,
+                headers,
+                b""
+            )
+
+        try:
+            if encoding is not None:
+                return self._serve_encoded(file_entry, encoding, http_version, headers)
+            return self._serve_file(request, file_entry, headers)
+        except FileNotFoundError:
+            return self._not_found(http_version)
+
+    def _find_file(self, uri: str) -> FileEntry | None:
         """
-            Creates a 200 OK response with the contents of a given file.
+            Maps a request URI to the file it serves, through the index when
+            there is one.
         """
-        body = file_path.read_bytes()
-        headers = Headers()
+        if self.index is not None:
+            return self.index.lookup(uri)
+
+        entries = self.entries
+        if entries is not None:
+            cached = entries.get(uri)
+            if cached is not None:
+                file_entry = self._revalidate(cached)
+                if file_entry is None:
+                    entries.pop(uri)
+                else:
+                    if file_entry is not cached:
+                        entries.put(uri, file_entry, ENTRY_OVERHEAD + len(uri))
+                    return file_entry
+
+        file_path = self._get_safe_path(uri)
+        if file_path is None:
+            return None
+
+        file_entry = FileEntry.from_stat(file_path, file_path.stat())
+        if entries is not None:
+            entries.put(uri, file_entry, ENTRY_OVERHEAD + len(uri))
+        return file_entry
+
+    def _revalidate(self, file_entry: FileEntry) -> FileEntry | None:
+        """
+            Checks a remembered entry against its file with one stat() call,
+            returns it as is when the file did not change, a fresh entry
+            when it did and None when it is gone.
+
+            The path was validated when the entry was made: it is resolved,
+            so later changes to the links leading to it can't move it out
+            of the base folder.
+        """
+        try:
+            stat = os.stat(file_entry.path)
+        except OSError:
+            return None
+
+        if not S_ISREG(stat.st_mode):
+            return None
+        if stat.st_size == file_entry.size and stat.st_mtime_ns == file_entry.mtime_ns:
+            return file_entry
+        return FileEntry.from_stat(file_entry.path, stat)
+
+    def _negotiate_encoding(
+        self,
+        request: CoraxRequest,
+        file_entry: FileEntry
+    ) -> tuple[str, FileEntry | None] | None:
+        """
+            Picks the content-coding of the response and the precompressed
+            sibling to serve, None as sibling meaning compress on the fly.
+
+            Returns None for the identity encoding, which is always used
+            for range requests.
+        """
+        if not self.compression or "Range" in request.headers:
+            return None
+
+        accept_encoding = request.headers.get("Accept-Encoding")
+        if not accept_encoding:
+            return None
+
+        siblings: dict[str, FileEntry | None] = {}
+        for encoding, suffix in PRECOMPRESSED_SUFFIXES.items():
+            sibling = self._find_sibling(file_entry.path.with_name(file_entry.path.name + suffix))
+            if sibling is not None and sibling.mtime_ns >= file_entry.mtime_ns:
+                siblings[encoding] = sibling
+
+        if (
+            is_compressible(file_entry.content_type)
+            and self.compression_min_size <= file_entry.size <= self.compression_max_size
+        ):
+            for encoding in COMPRESSORS:
+                siblings.setdefault(encoding, None)
+
+        chosen = negotiate_encoding(accept_encoding, list(siblings))
+        if chosen is None:
+            return None
+        return chosen, siblings[chosen]
+
+    def _find_sibling(self, path: Path) -> FileEntry | None:
+        """
+            Returns the entry of a file next to a served one, if it exists
+            and stays within the base folder.
+        """
+        if self.index is not None:
+            return self.index.lookup_path(path)
+
+        now = time.monotonic()
+        if self.missing_siblings.get(path, lambda expires_at: now < expires_at) is not None:
+            return None
+
+        try:
+            stat = path.stat()
+        except OSError:
+            stat = None
+
+        if stat is None or not S_ISREG(stat.st_mode) or not self._validate_path(path.resolve()):
+            self.missing_siblings.put(path, now + MISSING_SIBLING_TTL, ENTRY_OVERHEAD + len(str(path)))
+            return None
+        return FileEntry.from_stat(path, stat)
+
+    def _serve_encoded(
+        self,
+        file_entry: FileEntry,
+        encoding: tuple[str, FileEntry | None],
+        http_version: str,
+        headers: Headers
+    ) -> CoraxResponse:
+        """
+            Creates a 200 OK response with a compressed representation of a
+            file, read from its precompressed sibling or compressed on the fly.
+        """
+        coding, sibling = encoding
+        headers["Content-Type"] = file_entry.content_type
+        headers["Content-Encoding"] = coding
+
+        body: bytes | FileBody | None = None
+        if sibling is None:
+            body = self._compress(file_entry, coding)
+        else:
+            body = self._read_cached(sibling)
+            if body is None:
+                body = FileBody(sibling.path.open("rb"))
+
         headers["Content-Length"] = str(len(body))
 
         return CoraxResponse(
@@ -49,6 +302,183 @@ class StaticHandler(BaseHandler):
             body
         )
 
+    def _compress(self, file_entry: FileEntry, coding: str) -> bytes:
+        """
+            Returns the compressed contents of a file from the compressed
+            variant cache, compressing it on a miss.
+        """
+        key = (file_entry.path, file_entry.size, file_entry.mtime_ns, coding)
+        compressed = self.compressed_cache.get(key)
+        if compressed is not None:
+            return compressed
+
+        content = self._read_cached(file_entry)
+        if content is None:
+            content = file_entry.path.read_bytes()
+
+        compressed = COMPRESSORS[coding](content)
+        self.compressed_cache.put(key, compressed, len(compressed))
+        return compressed
+
+    def _validator_headers(self, uri: str, file_entry: FileEntry, etag: str) -> Headers:
+        """
+            Builds the caching headers shared by 200 and 304 responses.
+        """
+        headers = Headers()
+        headers["ETag"] = etag
+        headers["Last-Modified"] = file_entry.last_modified
+
+        for pattern, value in self.cache_control:
+            if pattern.match(uri):
+                headers["Cache-Control"] = value
+                break
+
+        return headers
+
+    def _serve_file(
+        self,
+        request: CoraxRequest,
+        file_entry: FileEntry,
+        headers: Headers
+    ) -> CoraxResponse:
+        """
+            Creates a 200 OK response with the contents of a given file, or
+            a 206/416 one when byte ranges were requested.
+
+            Cached files are answered from memory, other files are not read
+            here: the connection sends them with sendfile straight from the
+            page cache, ranges included.
+        """
+        http_version = request.http_version
+        headers["Accept-Ranges"] = "bytes"
+        headers["Content-Type"] = file_entry.content_type
+
+        ranges = self._requested_ranges(request, file_entry)
+        if ranges == []:
+            return self._range_not_satisfiable(file_entry, http_version, headers)
+
+        body: bytes | FileBody | None = None
+        if self.cache is not None:
+            body = self._read_cached(file_entry)
+        if body is None:
+            body = FileBody(file_entry.path.open("rb"))
+
+        status = HttpStatus.OK
+        response_body: bytes | FileBody | MultipartRanges = body
+        if ranges:
+            status = HttpStatus.PARTIAL_CONTENT
+            response_body = self._slice(body, ranges, file_entry, headers)
+
+        headers["Content-Length"] = str(len(response_body))
+
+        return CoraxResponse(
+            http_version,
+            status,
+            headers,
+            response_body
+        )
+
+    def _requested_ranges(
+        self,
+        request: CoraxRequest,
+        file_entry: FileEntry
+    ) -> list[ByteRange] | None:
+        """
+            Returns the byte ranges to serve, None for the full file.
+
+            The Range header is only honored on GET, and only if an If-Range
+            validator, when present, still matches the file.
+        """
+        range_header = request.headers.get("Range")
+        if range_header is None or request.method is not HttpMethod.GET:
+            return None
+
+        if_range = request.headers.get("If-Range")
+        if if_range is not None:
+            if_range = if_range.strip()
+            if if_range.startswith(("\"", "W/")):
+                if if_range != file_entry.etag:
+                    return None
+            elif if_range != file_entry.last_modified:
+                return None
+
+        return parse_range_header(range_header, file_entry.size)
+
+    def _slice(
+        self,
+        body: bytes | FileBody,
+        ranges: list[ByteRange],
+        file_entry: FileEntry,
+        headers: Headers
+    ) -> bytes | FileBody | MultipartRanges:
+        """
+            Narrows a full body down to the requested ranges.
+        """
+        if len(ranges) > 1:
+            multipart = MultipartRanges(
+                body,
+                ranges,
+                file_entry.size,
+                file_entry.content_type,
+                secrets.token_hex(16)
+            )
+            headers["Content-Type"] = multipart.content_type
+            return multipart
+
+        first, last = ranges[0]
+        headers["Content-Range"] = content_range(ranges[0], file_entry.size)
+        if isinstance(body, FileBody):
+            return FileBody(body.file, first, last - first + 1)
+        return body[first:last + 1]
+
+    def _range_not_satisfiable(
+        self,
+        file_entry: FileEntry,
+        http_version: str,
+        headers: Headers
+    ) -> CoraxResponse:
+        """
+            Creates a 416 response for ranges that all fall outside the file.
+        """
+        headers["Content-Range"] = f"bytes */{file_entry.size}"
+        headers["Content-Length"] = "0"
+        del headers["Content-Type"]
+
+        return CoraxResponse(
+            http_version,
+            HttpStatus.RANGE_NOT_SATISFIABLE,
+            headers,
+            b""
+        )
+
+    def _read_cached(self, file_entry: FileEntry) -> bytes | None:
+        """
+            Returns the contents of a small file from the cache, loading it
+            on a miss. Returns None for files too large to be cached.
+        """
+        if self.cache is None or file_entry.size > self.cache_max_file_size:
+            return None
+
+        file_path = file_entry.path
+        cached = self.cache.get(
+            file_path,
+            lambda cached: cached.size == file_entry.size and cached.mtime_ns == file_entry.mtime_ns
+        )
+        if cached is not None:
+            return cached.content
+
+        with file_path.open("rb") as file:
+            stat = os.fstat(file.fileno())
+            content = file.read()
+
+        if len(content) == stat.st_size:
+            self.cache.put(
+                file_path,
+                CachedFile(content, stat.st_size, stat.st_mtime_ns),
+                len(content)
+            )
+        return content
+
     def _not_found(self, http_version: str) -> CoraxResponse:
         """
             Creates a standard 404 Not Found response.
@@ -94,9 +524,7 @@ class StaticHandler(BaseHandler):
         """
             Validates that a path is a file and is safely within the base folder.
         """
-        base = self.base_folder.resolve()
-
         try:
-            return path.is_relative_to(base) and path.exists() and path.is_file()
+            return path.is_relative_to(self.base_folder) and path.is_file()
         except ValueError:
             return False
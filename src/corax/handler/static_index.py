@@ -0,0 +1,202 @@
+import os
+import logging
+import mimetypes
+import posixpath
+import threading
+from dataclasses import dataclass
+from email.utils import formatdate
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Media types of files whose name carries a compression suffix, e.g.
+# `backup.tar.gz`. They are served as they are stored, without a
+# Content-Encoding, so the type must be the one of the compressed file.
+ENCODED_TYPES = {
+    "gzip": "application/gzip",
+    "bzip2": "application/x-bzip2",
+    "xz": "application/x-xz",
+}
+
+@dataclass(frozen=True, slots=True)
+class FileEntry:
+    """
+        A validated static file together with its metadata.
+
+        The ETag and Last-Modified validators are derived from the size and
+        modification time once, when the entry is created, and so is the
+        media type guessed from the file name.
+    """
+    path: Path
+    size: int
+    mtime_ns: int
+    etag: str
+    last_modified: str
+    content_type: str
+
+    @classmethod
+    def from_stat(cls, path: Path, stat: os.stat_result) -> "FileEntry":
+        """
+            Creates an entry from the result of a stat call on the file.
+        """
+        return cls(
+            path,
+            stat.st_size,
+            stat.st_mtime_ns,
+            f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"',
+            formatdate(stat.st_mtime, usegmt=True),
+            guess_content_type(path.name)
+        )
+
+def guess_content_type(name: str) -> str:
+    """
+        Guesses the media type of a file from its name.
+    """
+    content_type, encoding = mimetypes.guess_type(name)
+    if encoding is not None:
+        return ENCODED_TYPES.get(encoding, "application/octet-stream")
+    return content_type or "application/octet-stream"
+
+class StaticIndex:
+    """
+        A precomputed map from normalized URIs to the files they serve.
+
+        The base folder is walked once at startup, every file that resolves
+        inside it gets an entry, directories holding an `index.html` are
+        mapped to it. Serving a request then costs a single dict lookup,
+        URIs that are not in the map are simply not found, so path
+        traversal can't reach outside the base folder.
+
+        The index is kept up to date by a background thread rescanning the
+        folder periodically, entries of unchanged files are carried over.
+    """
+    def __init__(self, base_folder: Path, refresh_interval: float = 5.0) -> None:
+        """
+            Builds the index of a resolved base folder, a refresh interval
+            of 0 disables the rescans.
+        """
+        self.base_folder: Path = base_folder
+        self.refresh_interval: float = refresh_interval
+        self.entries: dict[str, FileEntry] = {}
+        self.paths: dict[Path, FileEntry] = {}
+        self.refresher_pid: int | None = None
+        self.refresher_lock: threading.Lock = threading.Lock()
+        self.stopped: threading.Event = threading.Event()
+
+        self.refresh()
+
+    def lookup(self, uri: str) -> FileEntry | None:
+        """
+            Returns the file entry a request URI maps to.
+        """
+        if self.refresh_interval > 0 and self.refresher_pid != os.getpid():
+            self._start_refresher()
+
+        entry = self.entries.get(uri)
+        if entry is None and uri.startswith("/"):
+            entry = self.entries.get(posixpath.normpath("/" + uri.lstrip("/")))
+        return entry
+
+    def lookup_path(self, path: Path) -> FileEntry | None:
+        """
+            Returns the entry of an indexed file from its path.
+        """
+        return self.paths.get(path)
+
+    def refresh(self) -> None:
+        """
+            Rescans the base folder and swaps in the new maps at once.
+        """
+        previous = self.entries
+        entries: dict[str, FileEntry] = {}
+        self._scan(self.base_folder, "/", entries, previous, set())
+        self.paths = {entry.path: entry for entry in entries.values()}
+        self.entries = entries
+
+    def stop(self) -> None:
+        """
+            Stops the background rescans.
+        """
+        self.stopped.set()
+
+    def _scan(
+        self,
+        folder: Path,
+        prefix: str,
+        entries: dict[str, FileEntry],
+        previous: dict[str, FileEntry],
+        visited: set[Path]
+    ) -> None:
+        """
+            Adds the files below a folder to the map, keyed by their URI
+            path relative to the base folder.
+        """
+        real_folder = folder.resolve()
+        if real_folder in visited:
+            return
+        visited.add(real_folder)
+
+        try:
+            dir_entries = list(os.scandir(folder))
+        except OSError as e:
+            logger.warning("Could not scan static folder %s: %s", folder, e)
+            return
+
+        for dir_entry in dir_entries:
+            key = prefix + dir_entry.name
+            path = Path(dir_entry.path)
+
+            try:
+                if dir_entry.is_symlink():
+                    path = path.resolve()
+                    if not path.is_relative_to(self.base_folder):
+                        continue
+
+                if dir_entry.is_dir():
+                    self._scan(path, key + "/", entries, previous, visited)
+                    continue
+
+                if not dir_entry.is_file():
+                    continue
+
+                stat = dir_entry.stat()
+            except OSError:
+                continue
+
+            entry = previous.get(key)
+            if entry is None or entry.size != stat.st_size or entry.mtime_ns != stat.st_mtime_ns:
+                entry = FileEntry.from_stat(path, stat)
+            entries[key] = entry
+
+        index_entry = entries.get(prefix + "index.html")
+        if index_entry is not None:
+            entries[prefix] = index_entry
+            if prefix != "/":
+                entries[prefix.removesuffix("/")] = index_entry
+
+    def _start_refresher(self) -> None:
+        """
+            Starts the rescanning thread in the current process, threads
+            don't survive a fork so each worker process starts its own.
+        """
+        with self.refresher_lock:
+            if self.refresher_pid == os.getpid():
+                return
+
+            self.refresher_pid = os.getpid()
+            thread = threading.Thread(
+                target=self._refresh_periodically,
+                name="corax-static-index",
+                daemon=True
+            )
+            thread.start()
+
+    def _refresh_periodically(self) -> None:
+        """
+            Rescans the base folder until the index is stopped.
+        """
+        while not self.stopped.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error("Could not refresh the static index: %s", e)
@@ -0,0 +1,45 @@
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse
+
+class ConnectionHooks:
+    """
+        Callbacks around the lifecycle of a connection and its requests,
+        meant for attaching tracing.
+
+        Every callback is given a `time.monotonic()` timestamp taken when
+        the event happened, the methods do nothing by default so subclasses
+        only override the events they trace. Callbacks run on the thread or
+        the event loop serving the connection and must be fast and must not
+        raise, their exceptions abort the connection.
+    """
+    def on_accepted(self, client_address: tuple, timestamp: float) -> None:
+        """
+            Called once a connection starts being served.
+        """
+
+    def on_head_parsed(self, request: CoraxRequest, timestamp: float) -> None:
+        """
+            Called once a request is complete, `timestamp` is the moment its
+            head was parsed, before the body arrived.
+        """
+
+    def on_handler_start(self, request: CoraxRequest, timestamp: float) -> None:
+        """
+            Called right before the handler runs.
+        """
+
+    def on_handler_end(self, request: CoraxRequest, response: CoraxResponse, timestamp: float) -> None:
+        """
+            Called right after the handler returned its response.
+        """
+
+    def on_response_flushed(self, request: CoraxRequest, response: CoraxResponse, timestamp: float) -> None:
+        """
+            Called once the response was fully handed to the socket, responses
+            sent together in one write share their timestamp.
+        """
+
+    def on_closed(self, client_address: tuple, timestamp: float) -> None:
+        """
+            Called once the connection is closed.
+        """
@@ -0,0 +1,144 @@
+import os
+import tempfile
+from collections.abc import Iterator
+from typing import BinaryIO
+
+class RequestBody:
+    """
+        A readable, file-like view over the body of a request.
+
+        The body is spooled in memory until it grows past a threshold, then
+        it is moved to an anonymous temporary file, so large uploads never
+        take memory proportional to their size.
+    """
+    CHUNK_SIZE: int = 65536
+
+    def __init__(self, spool_threshold: int = 1048576) -> None:
+        """
+            Initializes an empty body that rolls over to disk past the
+            given number of bytes, its file is created by the first write.
+        """
+        self.spool_threshold: int = spool_threshold
+        self.file: tempfile.SpooledTemporaryFile[bytes] | None = None
+        self.size: int = 0
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "RequestBody":
+        """
+            Creates a complete body holding the given bytes.
+        """
+        body = cls(spool_threshold=max(len(data), 1))
+        body.write(data)
+        body.finish()
+        return body
+
+    @property
+    def on_disk(self) -> bool:
+        """
+            Tells whether the body was spilled to a temporary file.
+        """
+        # SpooledTemporaryFile rolls over once a write leaves it past its
+        # max_size, 0 meaning never, and the body is only ever appended to.
+        return 0 < self.spool_threshold < self.size
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        """
+            Appends received bytes, used while the request is being parsed.
+        """
+        if self.file is None:
+            self.file = tempfile.SpooledTemporaryFile(max_size=self.spool_threshold)
+        self.size += self.file.write(data)
+
+    def finish(self) -> None:
+        """
+            Marks the body as complete and rewinds it for reading.
+        """
+        if self.file is not None:
+            self.file.seek(0)
+
+    def read(self, size: int = -1) -> bytes:
+        """
+            Reads up to `size` bytes, or everything left when negative.
+        """
+        if self.file is None:
+            return b""
+        return self.file.read(size)
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        """
+            Reads bytes into a preallocated, writable buffer.
+        """
+        if self.file is None:
+            return 0
+        return self.file.readinto(buffer)
+
+    def __iter__(self) -> Iterator[bytes]:
+        """
+            Iterates over the remaining body in fixed-size chunks.
+        """
+        while chunk := self.read(self.CHUNK_SIZE):
+            yield chunk
+
+    def __len__(self) -> int:
+        """
+            Returns the total size of the body in bytes.
+        """
+        return self.size
+
+    def close(self) -> None:
+        """
+            Releases the memory or the temporary file backing the body.
+        """
+        if self.file is not None:
+            self.file.close()
+
+# Shared by every request without a body, nothing is ever written to it.
+EMPTY_BODY = RequestBody()
+
+class FileBody:
+    """
+        A region of an open file used as a response body.
+
+        The connection layer hands it to sendfile so the bytes go from the
+        page cache to the socket without being copied through user space.
+        Iterating over it reads the region in chunks, which is the path
+        taken wherever sendfile can't be used.
+    """
+    CHUNK_SIZE: int = 65536
+
+    def __init__(self, file: BinaryIO, offset: int = 0, length: int | None = None) -> None:
+        """
+            Wraps an open binary file, by default the region runs from the
+            offset to the end of the file.
+        """
+        if length is None:
+            length = os.fstat(file.fileno()).st_size - offset
+
+        self.file: BinaryIO = file
+        self.offset: int = offset
+        self.length: int = length
+
+    def __iter__(self) -> Iterator[bytes]:
+        """
+            Reads the region in fixed-size chunks.
+        """
+        self.file.seek(self.offset)
+        remaining = self.length
+        while remaining > 0:
+            chunk = self.file.read(min(self.CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+    def __len__(self) -> int:
+        """
+            Returns the size of the region in bytes.
+        """
+        return self.length
+
+    def close(self) -> None:
+        """
+            Closes the underlying file.
+        """
+        self.file.close()
@@ -0,0 +1,34 @@
+from functools import lru_cache
+from typing import Mapping
+
+@lru_cache(maxsize=256)
+def parse_cache_control(header_value: str) -> Mapping[str, str | None]:
+    """
+        Parses a Cache-Control header into a map of lowercase directive to
+        its value, None for directives without one.
+
+        Handlers send a handful of distinct values, so the result is cached.
+    """
+    directives: dict[str, str | None] = {}
+    for item in header_value.split(","):
+        name, separator, value = item.partition("=")
+        name = name.strip().lower()
+        if name:
+            directives[name] = value.strip().strip('"') if separator else None
+    return directives
+
+def max_age(directives: Mapping[str, str | None], shared: bool = True) -> float | None:
+    """
+        Returns the lifetime in seconds the directives give a response,
+        s-maxage first for a shared cache, or None when they give none.
+    """
+    names = ("s-maxage", "max-age") if shared else ("max-age",)
+    for name in names:
+        value = directives.get(name)
+        if value is None:
+            continue
+        try:
+            return max(float(int(value)), 0.0)
+        except ValueError:
+            return 0.0
+    return None
@@ -0,0 +1,52 @@
+from email.utils import parsedate_to_datetime
+
+from corax.http.enums import HttpMethod
+from corax.http.request import CoraxRequest
+
+# Headers a 304 response repeats from the response it stands for
+# (RFC 9110, 15.4.5).
+NOT_MODIFIED_HEADERS = ("Cache-Control", "Content-Location", "Date", "ETag", "Expires", "Last-Modified", "Vary")
+
+def etag_matches(header_value: str, etag: str) -> bool:
+    """
+        Tells whether an If-None-Match style list of entity-tags matches
+        an ETag, using the weak comparison.
+    """
+    if header_value.strip() == "*":
+        return True
+
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in header_value.split(",")
+    )
+
+def parse_http_date(header_value: str) -> float | None:
+    """
+        Parses an HTTP date into a POSIX timestamp, None when it is invalid.
+    """
+    try:
+        return parsedate_to_datetime(header_value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+def is_not_modified(request: CoraxRequest, etag: str | None, modified_at: float | None) -> bool:
+    """
+        Evaluates the conditional headers of a GET or HEAD request against
+        the validators of a response, its ETag and its modification time
+        in whole seconds. If-None-Match takes precedence over
+        If-Modified-Since.
+    """
+    if request.method not in (HttpMethod.GET, HttpMethod.HEAD):
+        return False
+
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        return etag is not None and etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since is None or modified_at is None:
+        return False
+
+    since = parse_http_date(if_modified_since)
+    return since is not None and modified_at <= since
@@ -0,0 +1,96 @@
+import gzip
+import zlib
+import importlib
+from functools import lru_cache
+from typing import Callable, Mapping, Sequence
+
+Compressor = Callable[[bytes], bytes]
+
+# Codecs the server can apply on the fly, in order of preference.
+COMPRESSORS: dict[str, Compressor] = {
+    "gzip": lambda data: gzip.compress(data, compresslevel=6, mtime=0),
+    "deflate": lambda data: zlib.compress(data, 6),
+}
+
+try:
+    # Standard library from Python 3.14 on, imported by name so type
+    # checkers on older versions don't look for it.
+    zstd = importlib.import_module("compression.zstd")
+
+    COMPRESSORS = {"zstd": zstd.compress, **COMPRESSORS}
+except ImportError:
+    pass
+
+# File suffixes of precompressed siblings, in order of preference. Brotli
+# can't be produced with the standard library but can be served as is.
+PRECOMPRESSED_SUFFIXES: dict[str, str] = {
+    "br": ".br",
+    "zstd": ".zst",
+    "gzip": ".gz",
+}
+
+COMPRESSIBLE_TYPES = frozenset({
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/wasm",
+    "application/xml",
+    "image/svg+xml",
+})
+
+def is_compressible(content_type: str) -> bool:
+    """
+        Tells whether a media type is worth compressing.
+    """
+    media_type = content_type.partition(";")[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+@lru_cache(maxsize=256)
+def parse_accept_encoding(header_value: str) -> Mapping[str, float]:
+    """
+        Parses an Accept-Encoding header into a map of coding to q-value.
+
+        Clients send a handful of distinct values, so the result is cached.
+    """
+    preferences: dict[str, float] = {}
+    for item in header_value.split(","):
+        coding, _, parameters = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+
+        quality = 1.0
+        name, _, value = parameters.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        preferences[coding] = quality
+
+    return preferences
+
+def negotiate_encoding(header_value: str | None, available: Sequence[str]) -> str | None:
+    """
+        Picks the content-coding to use among the available ones, or None
+        for the identity encoding.
+
+        The client's q-values decide, ties go to the first available coding.
+    """
+    if not header_value or not available:
+        return None
+
+    preferences = parse_accept_encoding(header_value)
+    wildcard = preferences.get("*", 0.0)
+
+    best_coding, best_quality = None, 0.0
+    for coding in available:
+        quality = preferences.get(coding, wildcard)
+        if quality > best_quality:
+            best_coding, best_quality = coding, quality
+
+    return best_coding
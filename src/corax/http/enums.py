@@ -26,6 +26,14 @@ class HttpMethod(str, Enum):
         except KeyError:
             raise ValueError(f"'{method}' is not a valid HttpMethod.")
 
+class ParseStatus(Enum):
+    """
+        The outcome of feeding bytes to an incremental RequestParser.
+    """
+    NEED_MORE = "need_more"
+    READY = "ready"
+    ERROR = "error"
+
 class HttpStatus(Enum):
     # 1xx: Informational
     CONTINUE = (100, "Continue")
@@ -1,57 +1,111 @@
 from collections.abc import MutableMapping
-from typing import Iterator
+from typing import Iterator, TypeVar, overload
 
-class Headers(MutableMapping):
+# Offsets of one field in a raw header block: line start, colon, line end.
+FieldOffsets = tuple[int, int, int]
+
+T = TypeVar("T")
+
+class Headers(MutableMapping[str, str]):
     """
         A case-insensitive, multi-valued dictionary for HTTP headers.
 
         This class behaves like a standard dictionary but correctly handles
         the specific rules of HTTP headers, such as allowing multiple values
-        for the same key (e.g., 'Set-Cookie').
+        for the same key (e.g., 'Set-Cookie'). Names keep the casing they
+        were first given with, which is the one used on output.
+
+        Headers created by the parser with `from_raw` keep the raw header
+        block and the offsets of its fields, a field is only decoded when
+        it is looked up. The first lookup indexes the fields by lowercased
+        name, so later ones are a dictionary hit. The block is decoded as a
+        whole the first time the headers are modified or iterated.
     """
     def __init__(self) -> None:
         """
             Initializes a new, empty Headers object.
         """
         self.map: dict[str, list[str]] = {}
+        self.names: dict[str, str] = {}
+        self.raw: bytes = b""
+        self.offsets: list[FieldOffsets] = []
+        self.index: dict[bytes, list[FieldOffsets]] | None = None
+
+    @classmethod
+    def from_raw(cls, raw: bytes, offsets: list[FieldOffsets]) -> "Headers":
+        """
+            Creates headers backed by a raw header block and the offsets of
+            its fields, as found by the parser.
+        """
+        headers = cls()
+        headers.raw = raw
+        headers.offsets = offsets
+        return headers
 
     def __getitem__(self, key: str) -> str:
         """
             Gets the first value for a given header key, case-insensitively.
         """
-        key = key.lower()
-        if key in self:
-            return self.map[key][0]
-        else:
+        values = self.get_all(key)
+        if not values:
             raise KeyError(f"Header '{key}' not found.")
+        return values[0]
+
+    @overload
+    def get(self, key: str) -> str | None: ...
+
+    @overload
+    def get(self, key: str, default: str) -> str: ...
+
+    @overload
+    def get(self, key: str, default: T) -> str | T: ...
+
+    def get(self, key: str, default: object = None) -> object:
+        """
+            Gets the first value for a given header key, or a default.
+        """
+        values = self.get_all(key)
+        return values[0] if values else default
 
     def get_all(self, key: str) -> list[str]:
         """
             Gets all values for a given header key as a list.
         """
-        return self.map.get(key.lower(), [])
+        if self.offsets:
+            return self._find_raw(key)
+        return list(self.map.get(key.lower(), []))
 
     def __setitem__(self, key: str, value: str) -> None:
         """
             Sets a header, replacing any existing values for that key.
         """
-        self.map[key.lower()] = [value]
+        self._materialize()
+        lowered_key = key.lower()
+        self.map[lowered_key] = [value]
+        self.names[lowered_key] = key
 
     def add(self, key: str, value: str) -> None:
         """
             Adds a value to a header, preserving any existing values.
         """
-        key = key.lower()
-        if key in self:
-            self.map[key].append(value)
+        self._materialize()
+        lowered_key = key.lower()
+        if lowered_key in self.map:
+            self.map[lowered_key].append(value)
         else:
-            self.map[key] = [value]
+            self.map[lowered_key] = [value]
+            self.names[lowered_key] = key
 
     def __delitem__(self, key: str) -> None:
         """
             Deletes a header and all of its associated values.
         """
-        del self.map[key.lower()]
+        self._materialize()
+        lowered_key = key.lower()
+        if lowered_key not in self.map:
+            raise KeyError(f"Header '{key}' not found.")
+        del self.map[lowered_key]
+        del self.names[lowered_key]
 
     def __contains__(self, key: object) -> bool:
         """
@@ -59,22 +113,94 @@ class Headers(MutableMapping):
         """
         if not isinstance(key, str):
             return False
-        return str(key).lower() in self.map
+        if self.offsets:
+            return bool(self._find_raw_offsets(key))
+        return key.lower() in self.map
 
     def __len__(self) -> int:
         """
             Returns the number of unique headers.
         """
+        self._materialize()
         return len(self.map)
 
-    def __iter__(self) -> Iterator:
+    def __iter__(self) -> Iterator[str]:
         """
-            Iterates over the header keys.
+            Iterates over the header keys, in their original casing.
         """
-        return iter(self.map)
+        self._materialize()
+        return iter(list(self.names.values()))
+
+    def copy(self) -> "Headers":
+        """
+            Returns an independent copy, headers still backed by their raw
+            block stay undecoded.
+        """
+        headers = Headers()
+        headers.map = {key: list(values) for key, values in self.map.items()}
+        headers.names = dict(self.names)
+        headers.raw = self.raw
+        headers.offsets = list(self.offsets)
+        headers.index = self.index
+        return headers
 
     def get_headers(self) -> dict[str, list[str]]:
         """
             Returns a copy of the underlying headers dictionary.
         """
-        return dict(self.map)
+        self._materialize()
+        return {key: list(values) for key, values in self.map.items()}
+
+    def _find_raw(self, key: str) -> list[str]:
+        """
+            Decodes the values of a field straight from the raw block.
+        """
+        raw = self.raw
+        return [
+            raw[colon + 1:end].strip().decode("utf-8", "replace")
+            for _, colon, end in self._find_raw_offsets(key)
+        ]
+
+    def _find_raw_offsets(self, key: str) -> list[FieldOffsets]:
+        """
+            Returns the offsets of the raw fields named `key`, indexing the
+            raw block on the first lookup.
+        """
+        index = self.index
+        if index is None:
+            index = self.index = self._build_index()
+        return index.get(key.lower().encode("utf-8", "replace"), [])
+
+    def _build_index(self) -> dict[bytes, list[FieldOffsets]]:
+        """
+            Groups the offsets of the raw fields by lowercased name.
+        """
+        raw = self.raw
+        index: dict[bytes, list[FieldOffsets]] = {}
+        for field in self.offsets:
+            start, colon, _ = field
+            name = raw[start:colon].lower()
+            fields = index.get(name)
+            if fields is None:
+                index[name] = [field]
+            else:
+                fields.append(field)
+        return index
+
+    def _materialize(self) -> None:
+        """
+            Decodes every raw field into the dictionary, once.
+        """
+        if not self.offsets:
+            return
+
+        offsets = self.offsets
+        raw = self.raw
+        self.offsets = []
+        self.raw = b""
+        self.index = None
+
+        for start, colon, end in offsets:
+            key = raw[start:colon].decode("utf-8", "replace")
+            value = raw[colon + 1:end].strip().decode("utf-8", "replace")
+            self.add(key, value)
@@ -0,0 +1,50 @@
+import math
+
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse
+
+def _connection_tokens(value: str | None) -> set[str]:
+    """
+        Splits a Connection header value into lowercase tokens.
+    """
+    if value is None:
+        return set()
+    return {token.strip().lower() for token in value.split(",")}
+
+def wants_keep_alive(request: CoraxRequest) -> bool:
+    """
+        Tells whether the client asked to keep the connection open.
+
+        HTTP/1.1 connections are persistent unless the client sends
+        `Connection: close`, HTTP/1.0 ones only if it sends `keep-alive`.
+    """
+    tokens = _connection_tokens(request.headers.get("Connection"))
+    if "close" in tokens:
+        return False
+    if request.http_version == "1.0":
+        return "keep-alive" in tokens
+    return True
+
+def closes_connection(response: CoraxResponse) -> bool:
+    """
+        Tells whether the handler asked to close the connection.
+    """
+    return "close" in _connection_tokens(response.headers.get("Connection"))
+
+def set_connection_headers(
+    response: CoraxResponse,
+    keep_alive: bool,
+    timeout: float,
+    remaining: int
+) -> None:
+    """
+        Sets the Connection and Keep-Alive headers matching the decision.
+    """
+    if not keep_alive:
+        response.headers["Connection"] = "close"
+        if "Keep-Alive" in response.headers:
+            del response.headers["Keep-Alive"]
+        return
+
+    response.headers["Connection"] = "keep-alive"
+    response.headers["Keep-Alive"] = f"timeout={math.ceil(timeout)}, max={remaining}"
@@ -1,25 +1,107 @@
-from corax.http.enums import HttpMethod
+import re
+import time
+from enum import Enum
+
+from corax.http.body import EMPTY_BODY, RequestBody
+from corax.http.enums import HttpMethod, ParseStatus
 from corax.http.request import CoraxRequest
-from corax.http.headers import Headers
-from corax.errors.request import InvalidRequest
+from corax.http.headers import FieldOffsets, Headers
+from corax.errors.request import (
+    InvalidRequest,
+    PayloadTooLarge,
+    RequestHeaderTooLarge,
+    UnsupportedTransferCoding,
+)
+
+SEPARATOR = b"\r\n\r\n"
+# Finds the end of a head in received bytes, regular expressions search
+# memoryviews without copying them.
+HEAD_END = re.compile(re.escape(SEPARATOR))
+# Longest chunk-size line, extensions included, accepted in a chunked body.
+MAX_CHUNK_LINE_SIZE = 4096
+# A chunk size is bare hex digits, int() alone would also take signs,
+# underscores, a 0x prefix and surrounding whitespace.
+CHUNK_SIZE = re.compile(rb"[0-9A-Fa-f]+")
+
+class ChunkState(Enum):
+    """
+        Where the parser stands inside a chunked request body.
+    """
+    SIZE = "size"
+    DATA = "data"
+    DATA_END = "data_end"
+    TRAILERS = "trailers"
 
 class RequestParser:
     """
-        Parses a raw byte-string into a structured CoraxRequest object.
+        Parses raw bytes into structured CoraxRequest objects.
 
         This class is responsible for interpreting the HTTP/1.1 protocol,
-        handling the request line, headers, and body.
+        handling the request line, headers, and body. It works as a
+        resumable state machine: bytes are fed as they arrive, the parser
+        picks up where it stopped and never scans the same byte twice while
+        looking for the end of the head. Bytes following a complete request
+        are kept for the next one, so pipelined requests come out in order.
+        Body bytes are moved into a RequestBody as they arrive instead of
+        piling up in the parser buffer, chunked bodies are decoded on the way.
+        A head that arrives whole while nothing is buffered is parsed from
+        the received bytes directly, only a split head is buffered.
     """
-    def __init__(self, raw_request: bytes):
+    def __init__(
+        self,
+        raw_request: bytes = b"",
+        max_header_size: int = 16384,
+        max_header_count: int = 100,
+        max_body_size: int = 10485760,
+        body_spool_threshold: int = 1048576
+    ):
         """
-            Initializes the parser with the raw request data.
+            Initializes the parser, optionally with a complete raw request
+            for one-shot parsing through `parse`.
         """
         self.raw_request: bytes = raw_request
+        self.max_header_size: int = max_header_size
+        self.max_header_count: int = max_header_count
+        self.max_body_size: int = max_body_size
+        self.body_spool_threshold: int = body_spool_threshold
         self.request: CoraxRequest | None = None
+        self.error: InvalidRequest | None = None
+
+        self.buffer: bytearray = bytearray()
+        self.scan_offset: int = 0
+        self.line_count: int = 0
+        self.head: tuple[HttpMethod, str, str, Headers] | None = None
+        self.body: RequestBody = EMPTY_BODY
+        self.body_remaining: int = 0
+        self.chunk_state: ChunkState | None = None
+        self.head_parsed_at: float = 0.0
+
+    @property
+    def buffered(self) -> int:
+        """
+            Number of bytes received but not yet turned into a request.
+        """
+        return len(self.buffer)
+
+    @property
+    def idle(self) -> bool:
+        """
+            Tells whether no byte of the next request was received yet.
+        """
+        return not self.buffer and self.head is None
+
+    @property
+    def reading_body(self) -> bool:
+        """
+            Tells whether the head of the current request is parsed and its
+            body is still being received.
+        """
+        return self.head is not None
 
     def parse(self) -> CoraxRequest:
         """
-            Executes the parsing process and returns an immutable CoraxRequest.
+            Executes the parsing process on the raw request given at
+            construction and returns an immutable CoraxRequest.
 
             This method caches its result. Subsequent calls will return the
             same request object without re-parsing.
@@ -27,47 +109,249 @@ class RequestParser:
         if self.request is not None:
             return self.request
 
+        status = self.feed(self.raw_request)
+        if status is ParseStatus.ERROR and self.error is not None:
+            raise self.error
+        request = self.request
+        if request is None:
+            raise InvalidRequest("Malformed request: The request is incomplete.")
+
+        return request
+
+    def feed(self, data: bytes | bytearray | memoryview = b"") -> ParseStatus:
+        """
+            Adds received bytes and advances the state machine.
+
+            Feeding no data only checks whether the buffered bytes already
+            hold a complete request. Once READY is reported the request
+            stays available until `pop_request` is called. The data is not
+            referenced after the call returns, so it can be a view of a
+            buffer that is reused for the next read.
+        """
+        if self.error is not None:
+            return ParseStatus.ERROR
+
         try:
-            raw_start_line, raw_headers, raw_body = self._split_request()
+            if data and not self.buffer:
+                if self.head is None and self.request is None:
+                    data = self._take_head_directly(data)
+                if self.body_remaining and self.chunk_state is None:
+                    data = self._write_body_directly(data)
+            if data:
+                self.buffer += data
+            if self.request is not None:
+                return ParseStatus.READY
+
+            return self._advance()
+        except InvalidRequest as e:
+            self.error = e
+            return ParseStatus.ERROR
+
+    def pop_request(self) -> CoraxRequest:
+        """
+            Hands out the parsed request and resets the parser for the next
+            one, keeping any bytes that follow it.
+        """
+        if self.request is None:
+            raise InvalidRequest("No complete request has been parsed yet.")
 
-            start_line = self._parse_start_line(raw_start_line)
-            headers = self._parse_headers(raw_headers)
-            body = self._parse_body(raw_body)
+        request = self.request
+        self.request = None
+        return request
 
-            if start_line is None or headers is None:
-                raise InvalidRequest()
+    def _advance(self) -> ParseStatus:
+        """
+            Moves through the head and body states as far as the buffer allows.
+        """
+        if self.head is None:
+            header_end_index = self.buffer.find(SEPARATOR, self.scan_offset)
+            if header_end_index == -1:
+                self._check_partial_head()
+                return ParseStatus.NEED_MORE
 
-            method, uri, http_version = start_line
-            body = b"" if body is None else body
+            head_size = header_end_index + len(SEPARATOR)
+            if head_size > self.max_header_size:
+                raise RequestHeaderTooLarge()
 
-            request = CoraxRequest(
-                method,
-                uri,
-                http_version,
-                headers,
-                body
-            )
-            self.request = request
+            with memoryview(self.buffer) as view:
+                raw_request_head = bytes(view[:header_end_index])
+            del self.buffer[:head_size]
+            self.scan_offset = 0
+            self.line_count = 0
+            self.head = self._start_request(raw_request_head)
 
-            return request
+        if self.chunk_state is not None:
+            if not self._advance_chunked():
+                return ParseStatus.NEED_MORE
+        else:
+            self._move_body_bytes()
+            if self.body_remaining:
+                return ParseStatus.NEED_MORE
 
-        except (ValueError, TypeError):
-            raise InvalidRequest("An unexpected error occurred during request parsing.")
+        body = self.body
+        body.finish()
+
+        method, uri, http_version, headers = self.head
+        self.head = None
+        self.body = EMPTY_BODY
+        self.request = CoraxRequest(
+            method,
+            uri,
+            http_version,
+            headers,
+            body
+        )
+
+        return ParseStatus.READY
+
+    def _take_head_directly(self, data: bytes | bytearray | memoryview) -> memoryview:
+        """
+            Parses a complete head straight from received bytes, copying it
+            once, and returns the bytes that follow it. Bytes without a
+            complete head are returned as they are, to be buffered.
+        """
+        view = memoryview(data)
+        match = HEAD_END.search(view, 0, self.max_header_size)
+        if match is None:
+            return view
+
+        self.head = self._start_request(bytes(view[:match.start()]))
+        return view[match.end():]
+
+    def _start_request(self, raw_request_head: bytes) -> tuple[HttpMethod, str, str, Headers]:
+        """
+            Parses a complete head, prepares the body it announces and
+            returns the head.
+        """
+        head = self._parse_head(raw_request_head)
+        self.head_parsed_at = time.monotonic()
+        if self._is_chunked(head[3]):
+            self.chunk_state = ChunkState.SIZE
+            self.body = RequestBody(self.body_spool_threshold)
+        else:
+            self.body_remaining = self._parse_content_length(head[3])
+            if self.body_remaining:
+                self.body = RequestBody(self.body_spool_threshold)
+            else:
+                self.body = EMPTY_BODY
+        return head
+
+    def _write_body_directly(self, data: bytes | bytearray | memoryview) -> memoryview:
+        """
+            Writes the part of received bytes that belongs to the body
+            straight into it, skipping the parser buffer, and returns the
+            rest.
+        """
+        view = memoryview(data)
+        chunk_size = min(len(view), self.body_remaining)
+        self.body.write(view[:chunk_size])
+        self.body_remaining -= chunk_size
+        return view[chunk_size:]
+
+    def _move_body_bytes(self) -> None:
+        """
+            Moves buffered bytes that belong to the body into it.
+        """
+        if not self.body_remaining or not self.buffer:
+            return
+
+        chunk_size = min(len(self.buffer), self.body_remaining)
+        with memoryview(self.buffer) as view:
+            self.body.write(view[:chunk_size])
+        del self.buffer[:chunk_size]
+        self.body_remaining -= chunk_size
+
+    def _advance_chunked(self) -> bool:
+        """
+            Decodes as much of a chunked body as the buffer holds, returns
+            True once the last chunk and the trailers are consumed.
+        """
+        while True:
+            if self.chunk_state is ChunkState.SIZE:
+                line = self._take_line()
+                if line is None:
+                    return False
+
+                raw_size, separator, _ = line.partition(b";")
+                if separator:
+                    # Whitespace is only allowed before the extensions.
+                    raw_size = raw_size.rstrip(b" \t")
+                if CHUNK_SIZE.fullmatch(raw_size) is None:
+                    raise InvalidRequest("Malformed chunked body: Invalid chunk size.")
+                chunk_size = int(raw_size, 16)
+                if len(self.body) + chunk_size > self.max_body_size:
+                    raise PayloadTooLarge()
 
-    def _split_request(self) -> tuple[bytes, bytes, bytes]:
+                self.body_remaining = chunk_size
+                self.chunk_state = ChunkState.DATA if chunk_size else ChunkState.TRAILERS
+
+            elif self.chunk_state is ChunkState.DATA:
+                self._move_body_bytes()
+                if self.body_remaining:
+                    return False
+                self.chunk_state = ChunkState.DATA_END
+
+            elif self.chunk_state is ChunkState.DATA_END:
+                if len(self.buffer) < 2:
+                    return False
+                if self.buffer[:2] != b"\r\n":
+                    raise InvalidRequest("Malformed chunked body: Chunk data is not followed by CRLF.")
+                del self.buffer[:2]
+                self.chunk_state = ChunkState.SIZE
+
+            else:
+                line = self._take_line()
+                if line is None:
+                    return False
+                if not line:
+                    self.chunk_state = None
+                    return True
+
+    def _take_line(self) -> bytes | None:
+        """
+            Removes and returns the next CRLF-terminated line of a chunked
+            body, or None if it has not fully arrived.
         """
-            Splits the raw request into its three main components.
+        line_end_index = self.buffer.find(b"\r\n", 0, MAX_CHUNK_LINE_SIZE + 2)
+        if line_end_index == -1:
+            if len(self.buffer) > MAX_CHUNK_LINE_SIZE:
+                raise InvalidRequest("Malformed chunked body: Line too long.")
+            return None
+
+        with memoryview(self.buffer) as view:
+            line = bytes(view[:line_end_index])
+        del self.buffer[:line_end_index + 2]
+        return line
+
+    def _check_partial_head(self) -> None:
+        """
+            Enforces the head limits on the bytes scanned so far and
+            remembers where the next scan has to resume.
+        """
+        resume_offset = max(len(self.buffer) - len(SEPARATOR) + 1, 0)
+        self.line_count += self.buffer.count(b"\r\n", self.scan_offset, resume_offset)
+        self.scan_offset = resume_offset
+
+        if len(self.buffer) > self.max_header_size:
+            raise RequestHeaderTooLarge()
+        if self.line_count > self.max_header_count + 1:
+            raise RequestHeaderTooLarge()
+
+    def _parse_head(self, raw_request_head: bytes) -> tuple[HttpMethod, str, str, Headers]:
+        """
+            Parses a complete request head, without its trailing separator.
         """
         try:
-            request_head, raw_body = self.raw_request.split(b"\r\n\r\n", 1)
-            request_head_lines = request_head.split(b"\r\n")
+            start_line_end = raw_request_head.find(b"\r\n")
+            if start_line_end == -1:
+                start_line_end = len(raw_request_head)
 
-            raw_start_line = request_head_lines[0]
-            raw_headers = b"\r\n".join(request_head_lines[1:])
+            method, uri, http_version = self._parse_start_line(raw_request_head[:start_line_end])
+            headers = self._parse_headers(raw_request_head, start_line_end + 2)
 
-            return raw_start_line, raw_headers, raw_body
-        except ValueError:
-            raise InvalidRequest("Malformed request: The header-body separator (\\r\\n\\r\\n) was not found.")
+            return method, uri, http_version, headers
+        except (ValueError, TypeError):
+            raise InvalidRequest("An unexpected error occurred during request parsing.")
 
     def _parse_start_line(self, raw_start_line: bytes) -> tuple[HttpMethod, str, str]:
         """
@@ -86,26 +370,76 @@ class RequestParser:
             raise InvalidRequest("Malformed request line: 'HTTP/' prefix missing from version.")
 
 
-    def _parse_headers(self, raw_headers: bytes) -> Headers:
+    def _parse_headers(self, raw_request_head: bytes, start: int) -> Headers:
         """
-            Parses a block of header lines into a Headers object.
+            Locates the header lines of a request head, starting at an
+            offset, and wraps them in a lazily decoded Headers object.
+
+            Only the line boundaries and the colons are looked for here,
+            names and values are decoded when a handler reads them.
         """
-        try:
-            raw_header_lines = raw_headers.split(b"\r\n")
+        offsets: list[FieldOffsets] = []
+        head_size = len(raw_request_head)
+        while start < head_size:
+            end = raw_request_head.find(b"\r\n", start)
+            if end == -1:
+                end = head_size
 
-            headers = Headers()
-            for header_line in raw_header_lines:
-                if not header_line:
-                    continue
-                key, value = header_line.decode("utf-8").split(":", 1)
-                headers.add(key.strip(), value.strip())
+            if end > start:
+                if len(offsets) == self.max_header_count:
+                    raise RequestHeaderTooLarge()
 
-            return headers
-        except ValueError:
-            raise InvalidRequest("Malformed header line: A header is missing a ':' separator.")
+                colon = raw_request_head.find(b":", start, end)
+                if colon == -1:
+                    raise InvalidRequest("Malformed header line: A header is missing a ':' separator.")
+                if colon == start or raw_request_head[colon - 1] in b" \t" or raw_request_head[start] in b" \t":
+                    raise InvalidRequest("Malformed header line: Invalid whitespace around the field name.")
+                offsets.append((start, colon, end))
+
+            start = end + 2
+
+        return Headers.from_raw(raw_request_head, offsets)
 
-    def _parse_body(self, raw_body: bytes) -> bytes | None:
+    def _is_chunked(self, headers: Headers) -> bool:
         """
-            Processes the raw body of the request.
+            Tells whether the body uses chunked transfer-encoding.
+
+            Requests carrying both Transfer-Encoding and Content-Length are
+            rejected, they are a classic request smuggling vector. Every
+            Transfer-Encoding field counts, chunked must be the only coding.
+        """
+        fields = headers.get_all("Transfer-Encoding")
+        if not fields:
+            return False
+        transfer_encoding = ", ".join(fields)
+
+        if "Content-Length" in headers:
+            raise InvalidRequest("Malformed request: Both Transfer-Encoding and Content-Length are set.")
+
+        codings = [coding.strip().lower() for coding in transfer_encoding.split(",")]
+        if codings != ["chunked"]:
+            raise UnsupportedTransferCoding(f"Unsupported Transfer-Encoding: '{transfer_encoding}'.")
+        return True
+
+    def _parse_content_length(self, headers: Headers) -> int:
         """
-        return raw_body
+            Reads the size of the body announced by the request.
+
+            Every Content-Length field counts, repeated values must all be
+            the same (RFC 9112, 6.3) and made of ASCII digits only.
+        """
+        fields = headers.get_all("Content-Length")
+        if not fields:
+            return 0
+
+        values = {value.strip() for field in fields for value in field.split(",")}
+        if len(values) != 1:
+            raise InvalidRequest("Malformed Content-Length: Conflicting values.")
+        content_length = values.pop()
+        if not (content_length.isascii() and content_length.isdigit()):
+            raise InvalidRequest("Malformed Content-Length: Not an integer.")
+
+        body_size = int(content_length)
+        if body_size > self.max_body_size:
+            raise PayloadTooLarge()
+        return body_size
@@ -0,0 +1,146 @@
+import mmap
+from typing import Iterator
+
+from corax.http.body import FileBody
+
+# Requests asking for more ranges than this get the full representation.
+MAX_RANGES = 16
+
+ByteRange = tuple[int, int]
+
+def parse_range_header(header_value: str, size: int) -> list[ByteRange] | None:
+    """
+        Parses a `Range: bytes=...` header against a representation size.
+
+        Returns the satisfiable ranges as inclusive (first, last) offsets,
+        an empty list when none of them can be satisfied, or None when the
+        header is malformed, uses another unit or asks for too many ranges,
+        in which case it must be ignored.
+    """
+    unit, _, range_set = header_value.partition("=")
+    if unit.strip().lower() != "bytes" or not range_set.strip():
+        return None
+
+    specs = range_set.split(",")
+    if len(specs) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for spec in specs:
+        raw_first, separator, raw_last = spec.strip().partition("-")
+        if not separator:
+            return None
+        if raw_first and not _is_digits(raw_first):
+            return None
+        if raw_last and not _is_digits(raw_last):
+            return None
+
+        if not raw_first:
+            if not raw_last:
+                return None
+            suffix_length = int(raw_last)
+            if suffix_length == 0 or size == 0:
+                continue
+            ranges.append((max(size - suffix_length, 0), size - 1))
+            continue
+
+        first = int(raw_first)
+        last = int(raw_last) if raw_last else size - 1
+        if raw_last and last < first:
+            return None
+        if first >= size:
+            continue
+        ranges.append((first, min(last, size - 1)))
+
+    return ranges
+
+def _is_digits(value: str) -> bool:
+    """
+        Tells whether a value is made of ASCII digits only, str.isdigit
+        alone also takes digits that int() rejects, such as '²'.
+    """
+    return value.isascii() and value.isdigit()
+
+def content_range(byte_range: ByteRange, size: int) -> str:
+    """
+        Formats the Content-Range value of a satisfied range.
+    """
+    first, last = byte_range
+    return f"bytes {first}-{last}/{size}"
+
+class MultipartRanges:
+    """
+        A `multipart/byteranges` body serving several slices of a file.
+
+        Its length is known before anything is sent, and the slices are
+        read through a memory map of the file (or sliced from its cached
+        contents) one bounded chunk at a time, never as a whole.
+    """
+    CHUNK_SIZE: int = 65536
+
+    def __init__(
+        self,
+        source: bytes | FileBody,
+        ranges: list[ByteRange],
+        size: int,
+        content_type: str,
+        boundary: str
+    ) -> None:
+        """
+            Prepares the part headers of every range.
+        """
+        self.source: bytes | FileBody = source
+        self.ranges: list[ByteRange] = ranges
+        self.boundary: str = boundary
+        self.part_heads: list[bytes] = [
+            (
+                f"\r\n--{boundary}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Range: {content_range(byte_range, size)}\r\n\r\n"
+            ).encode("latin-1")
+            for byte_range in ranges
+        ]
+        self.closing: bytes = f"\r\n--{boundary}--\r\n".encode("latin-1")
+
+    @property
+    def content_type(self) -> str:
+        """
+            Returns the Content-Type header value of the whole body.
+        """
+        return f"multipart/byteranges; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        """
+            Returns the total size of the body in bytes.
+        """
+        parts_size = sum(last - first + 1 for first, last in self.ranges)
+        heads_size = sum(len(part_head) for part_head in self.part_heads)
+        return parts_size + heads_size + len(self.closing)
+
+    def __iter__(self) -> Iterator[bytes]:
+        """
+            Yields the part headers and the slices in order.
+        """
+        if isinstance(self.source, FileBody):
+            with mmap.mmap(self.source.file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield from self._iter_parts(mapped)
+        else:
+            yield from self._iter_parts(self.source)
+
+        yield self.closing
+
+    def close(self) -> None:
+        """
+            Closes the file the slices are read from.
+        """
+        if isinstance(self.source, FileBody):
+            self.source.close()
+
+    def _iter_parts(self, data: bytes | mmap.mmap) -> Iterator[bytes]:
+        """
+            Yields every part, slicing its range in bounded chunks.
+        """
+        for part_head, (first, last) in zip(self.part_heads, self.ranges):
+            yield part_head
+            for offset in range(first, last + 1, self.CHUNK_SIZE):
+                yield data[offset:min(offset + self.CHUNK_SIZE, last + 1)]
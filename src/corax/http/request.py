@@ -1,5 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+from corax.http.body import RequestBody
 from corax.http.enums import HttpMethod
 from corax.http.headers import Headers
 
@@ -9,10 +10,14 @@ class CoraxRequest:
         A data container for a parsed HTTP request.
 
         This object holds all the structured information from a raw
-        HTTP request, ready to be used by a request handler.
+        HTTP request, ready to be used by a request handler. The body is
+        a readable stream rather than bytes, it may live in a temporary
+        file when the request is large. `params` holds the path parameters
+        a router matched.
     """
     method: HttpMethod
     uri: str
     http_version: str
     headers: Headers
-    body: bytes
+    body: RequestBody
+    params: dict[str, str] = field(default_factory=dict)
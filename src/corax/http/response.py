@@ -1,18 +1,87 @@
 from dataclasses import dataclass
+from typing import Iterable, Protocol, runtime_checkable
 
+from corax.http.body import FileBody
 from corax.http.enums import HttpStatus
 from corax.http.headers import Headers
 
+@runtime_checkable
+class ReadableBody(Protocol):
+    """
+        A binary file-like response body, read in chunks.
+    """
+    def read(self, size: int = -1, /) -> bytes: ...
+
+@runtime_checkable
+class SeekableBody(ReadableBody, Protocol):
+    """
+        A file-like response body whose remaining size can be found.
+    """
+    def tell(self) -> int: ...
+
+    def seek(self, offset: int, whence: int = 0, /) -> int: ...
+
+    def seekable(self) -> bool: ...
+
+    def fileno(self) -> int: ...
+
+ResponseBody = bytes | FileBody | ReadableBody | Iterable[bytes]
+
 @dataclass(frozen=True, slots=True)
 class CoraxResponse:
     """
        A data container for a complete HTTP response.
 
        All fields are required to ensure that every response object is
-       fully and explicitly constructed.
+       fully and explicitly constructed. The body is either complete bytes
+       or a stream: a file region sent with sendfile, a binary file-like
+       object or an iterable of byte chunks, sent as it is produced.
     """
 
     http_version: str
     status: HttpStatus
     headers: Headers
-    body: bytes
+    body: ResponseBody
+
+def close_body(response: CoraxResponse) -> None:
+    """
+        Releases a streaming body, e.g. closes the file it reads from.
+        Complete bytes bodies are left alone.
+    """
+    body = response.body
+    if not isinstance(body, bytes):
+        close = getattr(body, "close", None)
+        if close is not None:
+            close()
+
+def error_response(
+    status: HttpStatus,
+    http_version: str = "1.1",
+    close: bool = True
+) -> CoraxResponse:
+    """
+        Builds a minimal HTML response for an error status, that closes the
+        connection unless `close` is False.
+    """
+    body = f"<h1>{status.code} {status.phrase}</h1>".encode("utf-8")
+    headers = Headers()
+    headers["Content-Length"] = str(len(body))
+    headers["Content-Type"] = "text/html"
+    if close:
+        headers["Connection"] = "close"
+
+    return CoraxResponse(
+        http_version,
+        status,
+        headers,
+        body
+    )
+
+def overload_response(retry_after: int, http_version: str = "1.1") -> CoraxResponse:
+    """
+        Builds the 503 response turning a client away while the server is
+        saturated, asking it to retry after `retry_after` seconds.
+    """
+    response = error_response(HttpStatus.SERVICE_UNAVAILABLE, http_version)
+    response.headers["Retry-After"] = str(retry_after)
+    return response
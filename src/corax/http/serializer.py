@@ -1,50 +1,252 @@
-from corax.http.response import CoraxResponse
+import io
+import os
+from typing import Iterable, Iterator
 
+from corax.http.body import FileBody
+from corax.http.enums import HttpStatus
+from corax.http.response import (
+    CoraxResponse,
+    ReadableBody,
+    SeekableBody,
+    close_body,
+)
+
+# Statuses that never carry a body, so they get no framing headers.
+BODYLESS_STATUS_CODES = frozenset({204, 304})
+
+# Status-lines of every status for the versions the server speaks.
+STATUS_LINES: dict[tuple[HttpStatus, str], bytes] = {
+    (status, http_version): f"HTTP/{http_version} {status.code} {status.phrase}\r\n".encode("utf-8")
+    for status in HttpStatus
+    for http_version in ("1.0", "1.1")
+}
+
+# Encoded names of the headers most responses carry, keyed in lowercase.
+HEADER_NAMES: dict[str, bytes] = {
+    name.lower(): f"{name}: ".encode("utf-8")
+    for name in (
+        "Accept-Ranges",
+        "Cache-Control",
+        "Connection",
+        "Content-Encoding",
+        "Content-Length",
+        "Content-Range",
+        "Content-Type",
+        "Date",
+        "ETag",
+        "Keep-Alive",
+        "Last-Modified",
+        "Location",
+        "Retry-After",
+        "Server",
+        "Set-Cookie",
+        "Transfer-Encoding",
+        "Vary",
+    )
+}
+
+CRLF = b"\r\n"
+LAST_CHUNK = b"0\r\n\r\n"
+
+Buffer = bytes | bytearray | memoryview
+
+def status_line(status: HttpStatus, http_version: str) -> bytes:
+    """
+        Returns the encoded status-line, CRLF included, of a response.
+    """
+    raw_status_line = STATUS_LINES.get((status, http_version))
+    if raw_status_line is None:
+        raw_status_line = f"HTTP/{http_version} {status.code} {status.phrase}\r\n".encode("utf-8")
+    return raw_status_line
 
 class ResponseSerializer:
     """
-        Serializes a CoraxResponse object into a raw byte-string.
+        Serializes a CoraxResponse object into raw bytes.
+
+        The response goes out as a list of buffers meant for scatter-gather
+        writes (`socket.sendmsg`, `transport.writelines`): the encoded head
+        followed by the body as is, so the body is never copied and the
+        cost of serializing only depends on the number of headers.
+
+        Creating a serializer settles how the body is framed and sets the
+        matching headers: Content-Length when the size is known up front,
+        chunked transfer-encoding for streams of unknown size, or, for
+        HTTP/1.0 clients, delimiting the body by closing the connection.
+
+        With `head_only`, for responses to HEAD requests, the framing
+        headers are set as for the full response but only the head is
+        written, the body is left for `close` to release.
     """
-    def __init__(self, response: CoraxResponse):
+    CHUNK_SIZE: int = 65536
+
+    def __init__(self, response: CoraxResponse, head_only: bool = False):
         self.response: CoraxResponse = response
+        self.head_only: bool = head_only
+        self.chunked: bool = False
+        self.delimited_by_close: bool = False
+        self._frame_body()
+
+    @property
+    def file_body(self) -> FileBody | None:
+        """
+            Returns the body when it is a file region that can be sent with
+            sendfile as is, i.e. without chunk framing around it.
+        """
+        body = self.response.body
+        if isinstance(body, FileBody) and not self.chunked and not self.head_only:
+            return body
+        return None
+
+    @property
+    def is_streaming(self) -> bool:
+        """
+            Tells whether the body is a stream rather than complete bytes.
+        """
+        if self.head_only:
+            return False
+        return not isinstance(self.response.body, (bytes, bytearray, memoryview))
 
     def serialize(self) -> bytes:
         """
             Builds the full HTTP response as a single bytes object.
+
+            This copies the body, prefer `serialize_buffers` for writing to
+            a socket.
         """
-        raw_start_line = self._build_start_line()
-        raw_headers = self._build_headers()
-        raw_body = self.response.body
+        return b"".join(self.serialize_buffers())
 
-        return b"\r\n".join([
-            raw_start_line,
-            raw_headers,
-            raw_body
-        ])
+    def serialize_buffers(self) -> list[Buffer]:
+        """
+            Builds the full HTTP response as a list of buffers, the head
+            followed by the body.
 
-    def _build_start_line(self) -> bytes:
+            Streaming bodies are drained into the list, use `serialize_head`
+            and `iter_body_buffers` to send them as they are produced.
         """
-            Constructs the status-line of the HTTP response.
+        buffers: list[Buffer] = [self.serialize_head()]
+        for chunk_buffers in self.iter_body_buffers():
+            buffers.extend(chunk_buffers)
+        return buffers
+
+    def serialize_head(self) -> bytes:
         """
-        http_version = self.response.http_version
-        status_code = self.response.status.code
-        status_phrase = self.response.status.phrase
-        start_line = f"HTTP/{http_version} {status_code} {status_phrase}"
+            Builds the status-line and the header block, including the empty
+            line that ends the head.
+        """
+        response = self.response
+        parts = [status_line(response.status, response.http_version)]
+
+        headers = response.headers
+        for key in headers:
+            raw_name = HEADER_NAMES.get(key.lower())
+            if raw_name is None:
+                raw_name = f"{key}: ".encode("utf-8")
+            for value in headers.get_all(key):
+                parts += (raw_name, value.encode("utf-8"), CRLF)
 
-        return start_line.encode("utf-8")
+        parts.append(CRLF)
+        return b"".join(parts)
 
-    def _build_headers(self) -> bytes:
+    def iter_body(self) -> Iterator[bytes]:
         """
-            Constructs the header block of the response.
+            Yields the body as it should go on the wire, chunk-framed when
+            chunked transfer-encoding was chosen.
+        """
+        for chunk_buffers in self.iter_body_buffers():
+            if len(chunk_buffers) == 1:
+                yield bytes(chunk_buffers[0])
+            else:
+                yield b"".join(chunk_buffers)
+
+    def iter_body_buffers(self) -> Iterator[list[Buffer]]:
+        """
+            Yields the body one write at a time, each as a list of buffers
+            with the chunk framing around the data kept apart from it.
+        """
+        if self.head_only:
+            return
+
+        body = self.response.body
+        if isinstance(body, (bytes, bytearray, memoryview)):
+            if body:
+                yield [body]
+            return
+
+        chunks = self._iter_stream(body)
+        if not self.chunked:
+            for chunk in chunks:
+                if chunk:
+                    yield [chunk]
+            return
+
+        for chunk in chunks:
+            if chunk:
+                yield [b"%x\r\n" % len(chunk), chunk, CRLF]
+        yield [LAST_CHUNK]
+
+    def close(self) -> None:
+        """
+            Releases a streaming body, e.g. closes the file it reads from.
+        """
+        close_body(self.response)
+
+    def _frame_body(self) -> None:
+        """
+            Chooses the body framing and sets the matching headers.
         """
         headers = self.response.headers
-        headers_list = []
+        status_code = self.response.status.code
 
-        for key in headers:
-            for value in headers.get_all(key):
-                header = ": ".join([key, value])
-                headers_list.append(header.encode("utf-8"))
+        if status_code < 200 or status_code in BODYLESS_STATUS_CODES:
+            return
+        if "Content-Length" in headers:
+            return
+
+        length = self._body_length()
+        if length is not None:
+            headers["Content-Length"] = str(length)
+        elif self.head_only:
+            return
+        elif self.response.http_version == "1.0":
+            self.delimited_by_close = True
+        else:
+            headers["Transfer-Encoding"] = "chunked"
+            self.chunked = True
+
+    def _body_length(self) -> int | None:
+        """
+            Returns the body size if it can be known without consuming it.
+        """
+        body = self.response.body
+        if isinstance(body, (bytes, bytearray, memoryview, FileBody)):
+            return len(body)
+
+        if not isinstance(body, SeekableBody):
+            return None
+
+        try:
+            position = body.tell()
+            return os.fstat(body.fileno()).st_size - position
+        except (OSError, io.UnsupportedOperation):
+            pass
+
+        try:
+            if not body.seekable():
+                return None
+            position = body.tell()
+            end = body.seek(0, io.SEEK_END)
+            body.seek(position)
+            return end - position
+        except (OSError, io.UnsupportedOperation):
+            return None
+
+    def _iter_stream(self, body: ReadableBody | Iterable[bytes]) -> Iterator[bytes]:
+        """
+            Reads a file-like body in fixed-size chunks, or walks an iterable one.
+        """
+        if isinstance(body, ReadableBody):
+            while chunk := body.read(self.CHUNK_SIZE):
+                yield chunk
+            return
 
-        raw_headers = b"\r\n".join(headers_list)
-        raw_headers += b"\r\n"
-        return raw_headers
+        yield from body
@@ -1,6 +1,8 @@
 import socket
 import logging
+import selectors
 
+from corax.config.server import SocketOptions
 from .errors.socket import (
     SocketConnectionOFF,
     SocketConnectionON,
@@ -21,23 +23,40 @@ class SocketListener:
     port: int
     family: socket.AddressFamily
     dualstack_ipv6: bool
+    reuse_port: bool
+    backlog: int | None
+    options: SocketOptions
     public_connection: socket.socket | None
+    selector: selectors.BaseSelector | None
 
     def __init__(
         self,
         address: tuple[str, int],
         family: socket.AddressFamily = socket.AF_INET6,
-        dualstack_ipv6: bool = True
+        dualstack_ipv6: bool = True,
+        reuse_port: bool = False,
+        backlog: int | None = None,
+        options: SocketOptions | None = None
     ) -> None:
         """
             Initializes the SocketListener with a given address, supports
             ipv6 by default.
+
+            With `reuse_port` several processes can bind their own listener
+            to the same address and let the kernel balance between them.
+            `backlog` bounds the queue of connections waiting to be
+            accepted, the system picks it when None. The TCP `options` are
+            set on the listening socket.
         """
 
         self.host, self.port = address
         self.family = family
         self.dualstack_ipv6 = dualstack_ipv6
+        self.reuse_port = reuse_port
+        self.backlog = backlog
+        self.options = SocketOptions() if options is None else options
         self.public_connection: socket.socket | None = None
+        self.selector = None
 
     def start(self) -> None:
         """
@@ -49,8 +68,57 @@ class SocketListener:
         self.public_connection = socket.create_server(
             (self.host, self.port),
             family=self.family,
-            dualstack_ipv6=self.dualstack_ipv6
+            dualstack_ipv6=self.dualstack_ipv6,
+            reuse_port=self.reuse_port,
+            backlog=self.backlog
         )
+        self._apply_options(self.public_connection)
+
+    def _apply_options(self, sock: socket.socket) -> None:
+        """
+            Sets the configured TCP options on the listening socket.
+
+            Accepted sockets inherit them, which saves a system call per
+            connection. Buffer sizes take effect on connections that
+            arrive afterwards, the window scale is chosen at the handshake.
+        """
+        options = self.options
+        settings: list[tuple[int, str, int]] = []
+        if options.no_delay:
+            settings.append((socket.IPPROTO_TCP, "TCP_NODELAY", 1))
+        if options.send_buffer:
+            settings.append((socket.SOL_SOCKET, "SO_SNDBUF", options.send_buffer))
+        if options.receive_buffer:
+            settings.append((socket.SOL_SOCKET, "SO_RCVBUF", options.receive_buffer))
+        if options.defer_accept:
+            settings.append((socket.IPPROTO_TCP, "TCP_DEFER_ACCEPT", options.defer_accept))
+        if options.fast_open:
+            settings.append((socket.IPPROTO_TCP, "TCP_FASTOPEN", options.fast_open))
+        if options.keep_alive:
+            settings.append((socket.SOL_SOCKET, "SO_KEEPALIVE", 1))
+            if options.keep_alive_idle:
+                settings.append((socket.IPPROTO_TCP, "TCP_KEEPIDLE", options.keep_alive_idle))
+            if options.keep_alive_interval:
+                settings.append((socket.IPPROTO_TCP, "TCP_KEEPINTVL", options.keep_alive_interval))
+            if options.keep_alive_count:
+                settings.append((socket.IPPROTO_TCP, "TCP_KEEPCNT", options.keep_alive_count))
+
+        for level, name, value in settings:
+            option = getattr(socket, name, None)
+            if option is None:
+                logger.warning("%s is not supported on this platform, skipping it", name)
+                continue
+            try:
+                sock.setsockopt(level, option, value)
+            except OSError as e:
+                logger.warning("Could not set %s: %s", name, e)
+
+    @property
+    def is_running(self) -> bool:
+        """
+            Tells whether the listening socket is open.
+        """
+        return self.public_connection is not None
 
     def accept(self) -> tuple[socket.socket, tuple[str, int, str, str]]:
         """
@@ -62,6 +130,33 @@ class SocketListener:
 
         return self.public_connection.accept()
 
+    def accept_batch(self, limit: int) -> list[tuple[socket.socket, tuple[str, int, str, str]]]:
+        """
+            Waits for pending connections and accepts up to `limit` of them
+            in one go, a burst of connections costs a single wakeup.
+
+            The listening socket is switched to non-blocking mode on the
+            first call. Returns an empty list when another process sharing
+            the listener took the pending connections first.
+        """
+        if self.public_connection is None:
+            raise SocketConnectionOFF()
+
+        if self.selector is None:
+            self.public_connection.setblocking(False)
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(self.public_connection, selectors.EVENT_READ)
+        self.selector.select()
+
+        accept = self.public_connection.accept
+        connections: list[tuple[socket.socket, tuple[str, int, str, str]]] = []
+        try:
+            while len(connections) < limit:
+                connections.append(accept())
+        except (BlockingIOError, InterruptedError):
+            pass
+        return connections
+
     def close (self, tries: int = 3) -> None:
         """
             Closes the listening socket gracefully.
@@ -81,3 +176,6 @@ class SocketListener:
                     raise OSError
 
         self.public_connection = None
+        if self.selector is not None:
+            self.selector.close()
+            self.selector = None
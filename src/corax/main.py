@@ -11,7 +11,7 @@ def dev() -> None:
     main()
 
 def start() -> None:
-    setup_logging()
+    setup_logging(queued=True)
     main()
 
 def main() -> None:
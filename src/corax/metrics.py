@@ -0,0 +1,292 @@
+import threading
+from bisect import bisect_left
+from typing import Iterator, TypeVar
+
+from corax.http.enums import HttpStatus
+from corax.http.headers import Headers
+from corax.http.response import CoraxResponse
+
+Labels = tuple[str, ...]
+
+# Upper bounds, in seconds, of the default latency histogram buckets.
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+class Metric:
+    """
+        Base class of the sharded metrics.
+
+        Every thread records into its own shard, a dict no other thread
+        writes to, so recording takes no lock. The lock is only taken when
+        a thread creates its shard and when the shards are collected.
+    """
+    kind: str = "untyped"
+
+    def __init__(self, name: str, description: str, label_names: Labels = ()) -> None:
+        """
+            Initializes a metric with no recorded value.
+        """
+        self.name: str = name
+        self.description: str = description
+        self.label_names: Labels = label_names
+        self.shards: list[dict] = []
+        self.local: threading.local = threading.local()
+        self.lock: threading.Lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        """
+            Returns the shard of the calling thread, creating it once.
+        """
+        try:
+            return self.local.shard
+        except AttributeError:
+            shard: dict = {}
+            with self.lock:
+                self.shards.append(shard)
+            self.local.shard = shard
+            return shard
+
+    def _snapshots(self) -> list[dict]:
+        """
+            Returns copies of every shard, copying a dict is atomic.
+        """
+        with self.lock:
+            shards = list(self.shards)
+        return [shard.copy() for shard in shards]
+
+    def render(self) -> Iterator[str]:
+        """
+            Yields the lines of the metric in the Prometheus text format.
+        """
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+    def _format_labels(self, labels: Labels, extra: str = "") -> str:
+        """
+            Formats a label set, with an optional extra pair such as `le`.
+        """
+        pairs = [
+            f'{name}="{_escape(value)}"'
+            for name, value in zip(self.label_names, labels)
+        ]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Counter(Metric):
+    """
+        A monotonically increasing value, per label set.
+    """
+    kind = "counter"
+
+    def inc(self, amount: float = 1, labels: Labels = ()) -> None:
+        """
+            Adds to the value of a label set.
+        """
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def collect(self) -> dict[Labels, float]:
+        """
+            Sums the shards into the value of every label set.
+        """
+        totals: dict[Labels, float] = {}
+        for shard in self._snapshots():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def render(self) -> Iterator[str]:
+        yield from super().render()
+        for labels, value in sorted(self.collect().items()):
+            yield f"{self.name}{self._format_labels(labels)} {_format_value(value)}"
+
+class Gauge(Counter):
+    """
+        A value that goes up and down, such as the number of open connections.
+
+        Increments and decrements may happen on different threads, the
+        value is the sum of the shards.
+    """
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, labels: Labels = ()) -> None:
+        """
+            Subtracts from the value of a label set.
+        """
+        self.inc(-amount, labels)
+
+class Histogram(Metric):
+    """
+        Counts observations into buckets of fixed upper bounds, along with
+        their sum, per label set.
+    """
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Labels = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ) -> None:
+        """
+            Initializes a histogram with sorted bucket upper bounds, the
+            +Inf bucket is implied.
+        """
+        super().__init__(name, description, label_names)
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        """
+            Records one observation.
+        """
+        shard = self._shard()
+        counts = shard.get(labels)
+        if counts is None:
+            # One slot per bucket, one for +Inf, then the sum.
+            counts = shard[labels] = [0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def collect(self) -> dict[Labels, list[float]]:
+        """
+            Sums the shards into the per-bucket counts and the sum of every
+            label set.
+        """
+        totals: dict[Labels, list[float]] = {}
+        for shard in self._snapshots():
+            for labels, counts in shard.items():
+                counts = list(counts)
+                total = totals.get(labels)
+                if total is None:
+                    totals[labels] = counts
+                else:
+                    totals[labels] = [a + b for a, b in zip(total, counts)]
+        return totals
+
+    def render(self) -> Iterator[str]:
+        yield from super().render()
+        upper_bounds = [*map(_format_value, self.buckets), "+Inf"]
+        for labels, counts in sorted(self.collect().items()):
+            cumulative = 0.0
+            for upper_bound, count in zip(upper_bounds, counts):
+                cumulative += count
+                bucket_labels = self._format_labels(labels, f'le="{upper_bound}"')
+                yield f"{self.name}_bucket{bucket_labels} {_format_value(cumulative)}"
+            yield f"{self.name}_sum{self._format_labels(labels)} {_format_value(counts[-1])}"
+            yield f"{self.name}_count{self._format_labels(labels)} {_format_value(cumulative)}"
+
+M = TypeVar("M", bound=Metric)
+
+class MetricsRegistry:
+    """
+        A set of metrics rendered together.
+    """
+    def __init__(self) -> None:
+        """
+            Initializes an empty registry.
+        """
+        self.metrics: list[Metric] = []
+
+    def register(self, metric: M) -> M:
+        """
+            Adds a metric and returns it.
+        """
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """
+            Renders every metric in the Prometheus text exposition format.
+        """
+        lines = [line for metric in self.metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+class ServerMetrics(MetricsRegistry):
+    """
+        The metrics recorded by the connection handlers.
+
+        Latencies are split into the phases of a request: `read` waits for
+        the rest of the request once its first bytes arrived, `parse` runs
+        the parser, `handle` runs the handler and `write` serializes and
+        sends the response. Pipelined responses sent together are timed as
+        one write.
+
+        Forked worker processes each record their own metrics, worker `i`
+        serves them on `admin_port + i`.
+    """
+    def __init__(self) -> None:
+        """
+            Registers the server metrics.
+        """
+        super().__init__()
+        self.requests: Counter = self.register(Counter(
+            "corax_requests_total",
+            "Requests served, by method and status code.",
+            ("method", "status")
+        ))
+        self.bytes_received: Counter = self.register(Counter(
+            "corax_received_bytes_total",
+            "Bytes read from clients."
+        ))
+        self.bytes_sent: Counter = self.register(Counter(
+            "corax_sent_bytes_total",
+            "Bytes written to clients."
+        ))
+        self.connections: Counter = self.register(Counter(
+            "corax_connections_total",
+            "Connections handled."
+        ))
+        self.active_connections: Gauge = self.register(Gauge(
+            "corax_active_connections",
+            "Connections currently being handled."
+        ))
+        self.shed_connections: Counter = self.register(Counter(
+            "corax_shed_connections_total",
+            "Connections turned away with a 503 while the server was saturated."
+        ))
+        self.accept_wait: Histogram = self.register(Histogram(
+            "corax_accept_queue_wait_seconds",
+            "Time accepted connections wait for a worker."
+        ))
+        self.phase_duration: Histogram = self.register(Histogram(
+            "corax_phase_duration_seconds",
+            "Time spent in each phase of a request.",
+            ("phase",)
+        ))
+
+    def response(self, http_version: str) -> CoraxResponse:
+        """
+            Builds a response exposing the metrics.
+        """
+        body = self.render().encode("utf-8")
+        headers = Headers()
+        headers["Content-Type"] = PROMETHEUS_CONTENT_TYPE
+        headers["Content-Length"] = str(len(body))
+        headers["Cache-Control"] = "no-store"
+
+        return CoraxResponse(
+            http_version,
+            HttpStatus.OK,
+            headers,
+            body
+        )
+
+def _escape(value: str) -> str:
+    """
+        Escapes a label value.
+    """
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    """
+        Formats a sample value, integral values without a decimal part.
+    """
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
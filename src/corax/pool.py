@@ -0,0 +1,118 @@
+import time
+import queue
+import logging
+import threading
+from typing import Callable
+
+from corax.config.server import OverflowPolicy
+
+logger = logging.getLogger(__name__)
+
+Task = Callable[[], None]
+
+class WorkerPool:
+    """
+        A fixed-size pool of threads fed by a bounded queue.
+
+        The overflow policy decides what `submit` does when the queue is
+        full: wait for a free slot, reject the task, or run it on the
+        calling thread.
+    """
+    def __init__(
+        self,
+        size: int,
+        queue_limit: int,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK
+    ) -> None:
+        """
+            Initializes the pool, no thread is started until `start` is called.
+        """
+        if size < 1:
+            raise ValueError("A worker pool needs at least one thread.")
+        if queue_limit < 1:
+            raise ValueError("The worker queue limit must be at least 1.")
+
+        self.size: int = size
+        self.overflow_policy: OverflowPolicy = overflow_policy
+        self.tasks: queue.Queue[Task | None] = queue.Queue(maxsize=queue_limit)
+        self.threads: list[threading.Thread] = []
+        self.stopping: threading.Event = threading.Event()
+
+    def start(self) -> None:
+        """
+            Spawns the worker threads.
+        """
+        for index in range(self.size):
+            thread = threading.Thread(
+                target=self._work,
+                name=f"corax-worker-{index}",
+                daemon=True
+            )
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, task: Task) -> bool:
+        """
+            Hands a task to the pool, returns False if it was rejected.
+        """
+        if self.overflow_policy is OverflowPolicy.BLOCK:
+            self.tasks.put(task)
+            return True
+
+        try:
+            self.tasks.put_nowait(task)
+        except queue.Full:
+            if self.overflow_policy is OverflowPolicy.REJECT:
+                return False
+            task()
+
+        return True
+
+    def shutdown(self, wait: bool = True, timeout: float = 5.0) -> None:
+        """
+            Lets the workers finish the queued tasks and stops them, waiting
+            at most `timeout` seconds for them when `wait` is set.
+
+            Never blocks on a full queue: the workers see the stop flag once
+            they have drained it, and wake each other up with a sentinel.
+        """
+        self.stopping.set()
+        self._wake_next()
+
+        if wait:
+            deadline = time.monotonic() + timeout
+            for thread in self.threads:
+                thread.join(max(deadline - time.monotonic(), 0.0))
+                if thread.is_alive():
+                    logger.warning("Worker thread %s did not stop in time", thread.name)
+
+        self.threads.clear()
+
+    def _work(self) -> None:
+        """
+            Runs queued tasks until a stop sentinel is received.
+        """
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                self._wake_next()
+                return
+
+            try:
+                task()
+            except Exception as e:
+                logger.error("Unhandled error in worker thread: %s", e)
+
+            if self.stopping.is_set() and self.tasks.empty():
+                self._wake_next()
+                return
+
+    def _wake_next(self) -> None:
+        """
+            Queues a stop sentinel for the next idle worker, unless the
+            queue is full and the workers will find the stop flag anyway.
+        """
+        try:
+            self.tasks.put_nowait(None)
+        except queue.Full:
+            pass
@@ -0,0 +1,167 @@
+import os
+import time
+import signal
+import logging
+from types import FrameType
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+class PreforkSupervisor:
+    """
+        Forks a fixed number of worker processes and keeps them alive.
+
+        Each worker runs the given callable with its index, from 0 to
+        `processes - 1`, the master only waits on its children, restarts
+        the ones that die under the same index and forwards shutdown
+        signals, along with any of `forwarded_signals` it receives.
+    """
+    # A worker dying sooner than this after its start is considered a crash loop.
+    MIN_WORKER_LIFETIME: float = 1.0
+
+    def __init__(
+        self,
+        processes: int,
+        worker: Callable[[int], None],
+        forwarded_signals: tuple[int, ...] = ()
+    ) -> None:
+        """
+            Initializes the supervisor, no process is forked until `run` is called.
+        """
+        if processes < 1:
+            raise ValueError("The supervisor needs at least one worker process.")
+        if not hasattr(os, "fork"):
+            raise OSError("Pre-fork mode requires a platform with os.fork.")
+
+        self.processes: int = processes
+        self.worker: Callable[[int], None] = worker
+        self.forwarded_signals: tuple[int, ...] = forwarded_signals
+        # Start time and index of every live worker, by pid.
+        self.children: dict[int, tuple[float, int]] = {}
+        self.stopping: bool = False
+
+    def run(self) -> None:
+        """
+            Spawns the workers and supervises them until a shutdown signal.
+        """
+        previous_handlers: dict[int, Callable[[int, FrameType | None], Any] | int | None] = {
+            signum: signal.signal(signum, self._on_shutdown_signal)
+            for signum in (signal.SIGINT, signal.SIGTERM)
+        }
+        previous_handlers.update({
+            signum: signal.signal(signum, self._on_forwarded_signal)
+            for signum in self.forwarded_signals
+        })
+
+        try:
+            for index in range(self.processes):
+                self._spawn(index)
+            logger.info("Master %d supervising %d workers", os.getpid(), self.processes)
+
+            while self.children:
+                try:
+                    pid, status = os.wait()
+                except ChildProcessError:
+                    break
+                except InterruptedError:
+                    continue
+
+                child = self.children.pop(pid, None)
+                if child is None or self.stopping:
+                    continue
+                started_at, index = child
+
+                logger.warning(
+                    "Worker %d exited with status %d, restarting it",
+                    pid,
+                    os.waitstatus_to_exitcode(status)
+                )
+                if time.monotonic() - started_at < self.MIN_WORKER_LIFETIME:
+                    time.sleep(self.MIN_WORKER_LIFETIME)
+                self._spawn(index)
+        finally:
+            self._stop_children()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+    def _spawn(self, index: int) -> None:
+        """
+            Forks a single worker process.
+        """
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            signal.signal(signal.SIGTERM, _stop_worker)
+            for signum in self.forwarded_signals:
+                signal.signal(signum, signal.SIG_DFL)
+
+            exit_code = 0
+            try:
+                self.worker(index)
+            except KeyboardInterrupt:
+                pass
+            except BaseException as e:
+                logger.error("Worker %d crashed: %s", os.getpid(), e)
+                exit_code = 1
+            finally:
+                # os._exit skips the exit handlers, flush the logs first.
+                logging.shutdown()
+                os._exit(exit_code)
+
+        self.children[pid] = (time.monotonic(), index)
+        logger.debug("Worker %d started as worker %d", pid, index)
+        if self.stopping:
+            # The shutdown signal came in before the worker was recorded.
+            self._signal(pid, signal.SIGTERM)
+
+    def _on_shutdown_signal(self, signum: int, frame: FrameType | None) -> None:
+        """
+            Marks the supervisor as stopping and asks every worker to exit.
+        """
+        if self.stopping:
+            return
+
+        logger.info("Shutting down the workers...")
+        self.stopping = True
+        for pid in self.children:
+            self._signal(pid, signal.SIGTERM)
+
+    def _on_forwarded_signal(self, signum: int, frame: FrameType | None) -> None:
+        """
+            Passes a signal meant for the workers on to every one of them.
+        """
+        for pid in self.children:
+            self._signal(pid, signum)
+
+    def _stop_children(self) -> None:
+        """
+            Terminates and reaps any worker that is still alive.
+        """
+        self.stopping = True
+        for pid in list(self.children):
+            self._signal(pid, signal.SIGTERM)
+
+        for pid in list(self.children):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+            self.children.pop(pid, None)
+
+    def _signal(self, pid: int, signum: int) -> None:
+        """
+            Sends a signal to a worker, ignoring workers that already exited.
+        """
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+def _stop_worker(signum: int, frame: FrameType | None) -> None:
+    """
+        Interrupts a worker on its first SIGTERM the way SIGINT does, so it
+        shuts down through its cleanup code, and ignores the later ones
+        while it does.
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    raise KeyboardInterrupt
@@ -0,0 +1,131 @@
+import os
+import sys
+import time
+import signal
+import logging
+import threading
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+logger = logging.getLogger(__name__)
+
+class SamplingProfiler:
+    """
+        A sampling profiler that can be switched on at runtime.
+
+        While running, a background thread snapshots the stack of every
+        other thread at a fixed interval and counts identical stacks. When
+        the run ends they are written in the collapsed format, one
+        `thread;outer;...;inner count` line per stack, which flame graph
+        tools read directly. Nothing runs while the profiler is off.
+    """
+    def __init__(self, interval: float = 0.005, directory: str | Path = ".") -> None:
+        """
+            Initializes a stopped profiler sampling every `interval` seconds
+            and writing its output files to `directory`.
+        """
+        self.interval: float = interval
+        self.directory: Path = Path(directory)
+        self.lock: threading.Lock = threading.Lock()
+        self.thread: threading.Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """
+            Tells whether a profiling run is in progress.
+        """
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, duration: float) -> Path | None:
+        """
+            Starts profiling for `duration` seconds and returns the path the
+            output will be written to, or None if a run is in progress.
+        """
+        with self.lock:
+            if self.is_running:
+                return None
+
+            output_path = self.directory / f"corax-profile-{os.getpid()}-{int(time.time())}.folded"
+            self.thread = threading.Thread(
+                target=self._run,
+                args=(duration, output_path),
+                name="corax-profiler",
+                daemon=True
+            )
+            self.thread.start()
+            return output_path
+
+    def install_signal(self, signum: int, duration: float) -> None:
+        """
+            Starts a run of `duration` seconds whenever the process receives
+            a signal, must be called from the main thread.
+        """
+        signal.signal(signum, lambda received, frame: self._on_signal(duration))
+
+    def _on_signal(self, duration: float) -> None:
+        """
+            Starts a run from a signal handler.
+
+            The handler interrupts the main thread, which may be holding the
+            profiler or logging locks, so the run is started from a thread.
+        """
+        threading.Thread(
+            target=self._start_logged,
+            args=(duration,),
+            name="corax-profiler-signal",
+            daemon=True
+        ).start()
+
+    def _start_logged(self, duration: float) -> None:
+        """
+            Starts a run and logs its outcome.
+        """
+        output_path = self.start(duration)
+        if output_path is None:
+            logger.warning("Profiling is already in progress, ignoring the signal")
+        else:
+            logger.info("Profiling for %s seconds into %s", duration, output_path)
+
+    def _run(self, duration: float, output_path: Path) -> None:
+        """
+            Samples the stacks until the duration elapses, then writes them.
+        """
+        own_id = threading.get_ident()
+        stacks: Counter[str] = Counter()
+        samples = 0
+
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stacks[self._collapse(thread_names.get(thread_id, str(thread_id)), frame)] += 1
+            samples += 1
+            time.sleep(self.interval)
+
+        try:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with output_path.open("w") as output:
+                for stack, count in stacks.most_common():
+                    output.write(f"{stack} {count}\n")
+        except OSError as e:
+            logger.error("Could not write the profile to %s: %s", output_path, e)
+            return
+
+        logger.info("Profile of %d samples written to %s", samples, output_path)
+
+    def _collapse(self, thread_name: str, frame: FrameType | None) -> str:
+        """
+            Formats a stack, outermost frame first.
+        """
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            module = frame.f_globals.get("__name__", "?")
+            names.append(f"{module}.{code.co_qualname}")
+            frame = frame.f_back
+
+        names.append(thread_name.replace(";", ":").replace(" ", "_"))
+        return ";".join(reversed(names))
@@ -1,9 +1,24 @@
 import socket
+import signal
 import logging
+import threading
+from dataclasses import replace
+from functools import partial
 
+from corax.access_log import AccessLog
+from corax.buffers import BufferPool
+from corax.config.server import ServerConfig
 from corax.connection import ConnectionHandler
 from corax.handler.base import BaseHandler
+from corax.handler.admin import AdminHandler
 from corax.handler.static import StaticHandler
+from corax.hooks import ConnectionHooks
+from corax.http.response import overload_response
+from corax.http.serializer import ResponseSerializer
+from corax.metrics import ServerMetrics
+from corax.pool import WorkerPool
+from corax.prefork import PreforkSupervisor
+from corax.profiler import SamplingProfiler
 import corax.listener as listener
 
 logger = logging.getLogger(__name__)
@@ -12,35 +27,276 @@ class CoraxServer:
     host: str
     port: int
     handler: BaseHandler
+    config: ServerConfig
     connection: listener.SocketListener
+    pool: WorkerPool | None
+    buffer_pool: BufferPool
+    metrics: ServerMetrics | None
+    profiler: SamplingProfiler | None
+    admin: AdminHandler | None
+    hooks: ConnectionHooks | None
+    access_log: AccessLog | None
+    connection_slots: threading.BoundedSemaphore | None
+    overload_payload: bytes
+    worker_index: int
 
-    def __init__(self, host: str, port: int, handler: BaseHandler) -> None:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        handler: BaseHandler,
+        config: ServerConfig | None = None,
+        hooks: ConnectionHooks | None = None
+    ) -> None:
         self.host = host
         self.port = port
         self.handler = handler
-        self.connection = listener.SocketListener((host, port))
+        self.config = ServerConfig() if config is None else config
+        self.connection = listener.SocketListener(
+            (host, port),
+            reuse_port=self.config.reuse_port,
+            backlog=self.config.listen_backlog,
+            options=self.config.socket_options
+        )
+        self.pool = None
+        self.buffer_pool = BufferPool(
+            self.config.recv_buffer_size,
+            self.config.recv_pool_size
+        )
+        self.metrics = ServerMetrics() if self.config.metrics else None
+        self.profiler, self.admin = build_admin(self.config, self.metrics)
+        self.hooks = hooks
+        self.access_log = build_access_log(self.config)
+        self.connection_slots = None
+        if self.config.max_connections > 0:
+            self.connection_slots = threading.BoundedSemaphore(self.config.max_connections)
+        self.overload_payload = build_overload_payload(self.config)
+        self.worker_index = 0
+
+        if self.config.worker_threads > 0:
+            self.pool = WorkerPool(
+                self.config.worker_threads,
+                self.config.queue_limit,
+                self.config.overflow_policy
+            )
+        elif self.config.keep_alive:
+            # Inline connections hold up the accept loop, an idle
+            # persistent one would keep every other client waiting.
+            self.config = replace(self.config, keep_alive=False)
 
     def main_loop(self) -> None:
+        if self.config.processes > 1:
+            self._supervise()
+            return
+
+        self._serve()
+
+    def _supervise(self) -> None:
+        """
+            Runs the accept loop in several forked worker processes.
+        """
+        supervisor = PreforkSupervisor(
+            self.config.processes,
+            self._serve,
+            profile_signals(self.config)
+        )
+        try:
+            if not self.config.reuse_port:
+                self.connection.start()
+            supervisor.run()
+        finally:
+            self.connection.close()
+
+    def _serve(self, worker_index: int = 0) -> None:
+        """
+            Accepts connections until interrupted, as the given prefork
+            worker.
+        """
+        self.worker_index = worker_index
         try:
-            self.connection.start()
-            logger.info(f"Server started running on port {self.port}")
+            if not self.connection.is_running:
+                self.connection.start()
+            logger.info("Server started running on port %d", self.port)
 
             if isinstance(self.handler, StaticHandler):
-                logger.debug(f"Serving static files from {self.handler.base_folder}")
+                logger.debug("Serving static files from %s", self.handler.base_folder)
+
+            start_admin(self.host, self.config, self.profiler, self.admin, worker_index)
+            if self.access_log is not None:
+                self.access_log.start()
 
+            if self.pool is not None:
+                self.pool.start()
+                logger.info("Handling connections with %d worker threads", self.pool.size)
+
+            accept_batch = self.config.accept_batch
             while True:
-                client_connection: socket.socket
-                client_address: tuple[str, int, str, str]
-                client_connection, client_address = self.connection.accept()
-                logger.debug(f"{client_connection}, {client_address}")
-
-                connection_handler = ConnectionHandler(
-                    client_connection,
-                    client_address,
-                    self.handler
-                )
-                connection_handler.handle()
+                if accept_batch > 1:
+                    connections = self.connection.accept_batch(accept_batch)
+                else:
+                    connections = [self.connection.accept()]
+
+                for client_connection, client_address in connections:
+                    logger.debug("Accepted connection from %s", client_address)
+                    self._dispatch(client_connection, client_address)
         except KeyboardInterrupt:
             logger.info("Shutting down the server...")
         finally:
+            if self.pool is not None:
+                self.pool.shutdown()
+            if self.access_log is not None:
+                self.access_log.close()
             self.connection.close()
+
+    def _dispatch(
+        self,
+        client_connection: socket.socket,
+        client_address: tuple[str, int, str, str]
+    ) -> None:
+        """
+            Handles an accepted connection inline or hands it to the worker
+            pool, or sheds it when the server is saturated.
+        """
+        if self.connection_slots is not None and not self.connection_slots.acquire(blocking=False):
+            self._shed(client_connection, client_address)
+            return
+
+        connection_handler = ConnectionHandler(
+            client_connection,
+            client_address,
+            self.handler,
+            self.config,
+            self.buffer_pool,
+            self.metrics,
+            None if self.config.admin_port else self.admin,
+            self.hooks,
+            self.access_log
+        )
+
+        if self.pool is None:
+            self._handle(connection_handler)
+            return
+
+        if not self.pool.submit(partial(self._handle, connection_handler)):
+            if self.connection_slots is not None:
+                self.connection_slots.release()
+            self._shed(client_connection, client_address)
+
+    def _handle(self, connection_handler: ConnectionHandler) -> None:
+        """
+            Serves a connection and frees its slot afterwards.
+        """
+        try:
+            connection_handler.handle()
+        finally:
+            if self.connection_slots is not None:
+                self.connection_slots.release()
+
+    def _shed(
+        self,
+        client_connection: socket.socket,
+        client_address: tuple[str, int, str, str]
+    ) -> None:
+        """
+            Turns a connection away with the pre-serialized 503.
+
+            The response is sent without blocking, a fresh socket has room
+            for it in its send buffer, and the request is never read.
+        """
+        logger.warning("Server saturated, shedding connection from %s", client_address)
+        if self.metrics is not None:
+            self.metrics.shed_connections.inc()
+
+        try:
+            client_connection.send(self.overload_payload, socket.MSG_DONTWAIT)
+        except OSError:
+            pass
+        finally:
+            client_connection.close()
+
+def build_admin(
+    config: ServerConfig,
+    metrics: ServerMetrics | None
+) -> tuple[SamplingProfiler | None, AdminHandler | None]:
+    """
+        Creates the profiler and the admin handler a configuration asks for.
+    """
+    profiler = None
+    if config.profile_signal or config.profile_path:
+        profiler = SamplingProfiler(config.profile_interval, config.profile_directory)
+
+    admin = AdminHandler(
+        metrics,
+        profiler,
+        config.metrics_path,
+        config.profile_path,
+        config.profile_duration
+    )
+    return profiler, admin if admin.paths else None
+
+def build_access_log(config: ServerConfig) -> AccessLog | None:
+    """
+        Creates the access log a configuration asks for.
+    """
+    if not config.access_log:
+        return None
+    return AccessLog(
+        config.access_log,
+        config.access_log_batch_size,
+        config.access_log_flush_interval,
+        config.access_log_queue_limit
+    )
+
+def build_overload_payload(config: ServerConfig) -> bytes:
+    """
+        Serializes, once, the 503 sent to connections shed under load.
+    """
+    return ResponseSerializer(overload_response(config.retry_after)).serialize()
+
+def profile_signals(config: ServerConfig) -> tuple[int, ...]:
+    """
+        Returns the signal starting the profiler, if one is configured.
+    """
+    if not config.profile_signal:
+        return ()
+    return (signal.Signals[config.profile_signal],)
+
+def start_admin(
+    host: str,
+    config: ServerConfig,
+    profiler: SamplingProfiler | None,
+    admin: AdminHandler | None,
+    worker_index: int = 0
+) -> None:
+    """
+        Sets up the admin features of a serving process: the profiler
+        signal, and the admin side port from a background thread.
+
+        Forked workers keep their own metrics, worker `i` serves them on
+        `admin_port + i` so that each one can be scraped.
+    """
+    if profiler is not None and config.profile_signal:
+        if threading.current_thread() is threading.main_thread():
+            profiler.install_signal(signal.Signals[config.profile_signal], config.profile_duration)
+        else:
+            logger.warning("The profiler signal can only be installed from the main thread")
+
+    if admin is None:
+        return
+    if not config.admin_port:
+        if config.processes > 1 and worker_index == 0:
+            logger.warning(
+                "Admin endpoints on the main port reach a random worker, "
+                "set admin_port to scrape every worker"
+            )
+        return
+
+    admin_port = config.admin_port + worker_index
+    side_server = CoraxServer(host, admin_port, admin)
+    thread = threading.Thread(
+        target=side_server.main_loop,
+        name="corax-admin",
+        daemon=True
+    )
+    thread.start()
+    logger.info("Serving admin endpoints on port %d", admin_port)
@@ -0,0 +1,82 @@
+import asyncio
+import socket
+import threading
+
+from corax.async_connection import AsyncConnectionHandler
+from corax.config.server import ServerConfig
+from corax.connection import ConnectionHandler
+from corax.handler.async_base import SyncHandlerAdapter
+from corax.handler.base import BaseHandler
+from corax.http.enums import HttpStatus
+from corax.http.headers import Headers
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse
+
+CLIENT_ADDRESS = ("127.0.0.1", 40000, "", "")
+
+def text_response(request: CoraxRequest, text: str, status: HttpStatus = HttpStatus.OK) -> CoraxResponse:
+    body = text.encode("utf-8")
+    headers = Headers()
+    headers["Content-Type"] = "text/plain"
+    headers["Content-Length"] = str(len(body))
+    return CoraxResponse(request.http_version, status, headers, body)
+
+def read_all(client: socket.socket) -> bytes:
+    chunks = []
+    while chunk := client.recv(65536):
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+def serve_sync(
+    handler: BaseHandler,
+    raw: bytes,
+    config: ServerConfig | None = None,
+    half_close: bool = True
+) -> bytes:
+    """
+        Runs one connection of the sync engine over a socket pair, sends
+        `raw` then half-closes, and returns everything the server wrote.
+        Without `half_close` the client keeps its side open until the
+        server closes the connection.
+    """
+    server, client = socket.socketpair()
+    connection = ConnectionHandler(server, CLIENT_ADDRESS, handler, config)
+    thread = threading.Thread(target=connection.handle)
+    thread.start()
+    with client:
+        client.sendall(raw)
+        if half_close:
+            client.shutdown(socket.SHUT_WR)
+        client.settimeout(5)
+        data = read_all(client)
+    thread.join(5)
+    return data
+
+def serve_async(
+    handler: BaseHandler,
+    raw: bytes,
+    config: ServerConfig | None = None,
+    half_close: bool = True
+) -> bytes:
+    """
+        Same as serve_sync with the asyncio engine.
+    """
+    server, client = socket.socketpair()
+
+    async def run() -> None:
+        reader, writer = await asyncio.open_connection(sock=server)
+        connection = AsyncConnectionHandler(reader, writer, SyncHandlerAdapter(handler), config)
+        await connection.handle()
+
+    thread = threading.Thread(target=asyncio.run, args=(run(),))
+    thread.start()
+    with client:
+        client.sendall(raw)
+        if half_close:
+            client.shutdown(socket.SHUT_WR)
+        client.settimeout(5)
+        data = read_all(client)
+    thread.join(5)
+    return data
+
+ENGINES = [serve_sync, serve_async]
@@ -0,0 +1,60 @@
+import json
+import time
+from pathlib import Path
+from typing import cast
+
+from corax.access_log import AccessLog, AccessRecord
+from corax.http.enums import HttpStatus
+from corax.http.headers import Headers
+from corax.http.response import CoraxResponse
+
+CLIENT_ADDRESS = ("127.0.0.1", 50000)
+
+def response_with_length(length: str) -> CoraxResponse:
+    headers = Headers()
+    headers["Content-Length"] = length
+    return CoraxResponse("1.1", HttpStatus.OK, headers, b"")
+
+def read_entries(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+def test_entries_are_written_on_close(tmp_path: Path) -> None:
+    path = tmp_path / "access.log"
+    access_log = AccessLog(str(path))
+    access_log.start()
+    access_log.record(CLIENT_ADDRESS, None, response_with_length("12"), 0.0015)
+    access_log.record(CLIENT_ADDRESS, None, response_with_length("not a number"), 0.0)
+    access_log.close()
+
+    entries = read_entries(path)
+    assert [entry["length"] for entry in entries] == [12, None]
+    assert entries[0]["duration_ms"] == 1.5
+    assert entries[0]["client"] == "127.0.0.1"
+
+def test_entries_past_the_queue_limit_are_dropped(tmp_path: Path) -> None:
+    path = tmp_path / "access.log"
+    access_log = AccessLog(str(path), queue_limit=2)
+    for _ in range(5):
+        access_log.record(CLIENT_ADDRESS, None, response_with_length("0"), 0.0)
+
+    assert len(access_log.records) == 2
+    assert access_log.dropped == 3
+
+    access_log.start()
+    access_log.close()
+    assert len(read_entries(path)) == 2
+    assert access_log.dropped == 0
+
+def test_writer_survives_a_failing_batch(tmp_path: Path) -> None:
+    path = tmp_path / "access.log"
+    access_log = AccessLog(str(path), flush_interval=0.01)
+    access_log.start()
+    access_log.records.append(cast(AccessRecord, ("not a record",)))
+    deadline = time.monotonic() + 5.0
+    while access_log.records and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    access_log.record(CLIENT_ADDRESS, None, response_with_length("3"), 0.0)
+    access_log.close()
+
+    assert [entry["length"] for entry in read_entries(path)] == [3]
@@ -0,0 +1,66 @@
+from typing import Callable
+
+import pytest
+
+from corax.handler.base import BaseHandler
+from corax.http.body import EMPTY_BODY, RequestBody
+from corax.http.parser import RequestParser
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse
+from tests.helpers import ENGINES
+
+def test_body_rolls_over_past_the_threshold() -> None:
+    body = RequestBody(spool_threshold=10)
+    body.write(b"x" * 10)
+    assert not body.on_disk
+
+    body.write(b"x")
+    body.finish()
+    assert body.on_disk
+    assert body.read() == b"x" * 11
+    body.close()
+
+def test_unbounded_body_stays_in_memory() -> None:
+    body = RequestBody(spool_threshold=0)
+    body.write(b"x" * 100000)
+
+    assert not body.on_disk
+    body.close()
+
+def test_readinto() -> None:
+    body = RequestBody.from_bytes(b"abcdef")
+    buffer = bytearray(4)
+
+    assert body.readinto(buffer) == 4
+    assert buffer == b"abcd"
+    assert body.readinto(buffer) == 2
+    assert body.readinto(buffer) == 0
+
+def test_bodyless_requests_share_the_empty_body() -> None:
+    first = RequestParser(b"GET /a HTTP/1.1\r\n\r\n").parse()
+    second = RequestParser(b"POST /b HTTP/1.1\r\nContent-Length: 0\r\n\r\n").parse()
+
+    assert first.body is EMPTY_BODY
+    assert second.body is EMPTY_BODY
+    assert EMPTY_BODY.file is None
+
+    first.body.close()
+    assert second.body.read() == b""
+    assert len(second.body) == 0
+
+class FailingHandler(BaseHandler):
+    def __init__(self) -> None:
+        self.bodies: list[RequestBody] = []
+
+    def handle(self, request: CoraxRequest) -> CoraxResponse:
+        self.bodies.append(request.body)
+        raise RuntimeError("handler failed")
+
+@pytest.mark.parametrize("serve", ENGINES)
+def test_body_is_closed_when_the_handler_fails(serve: Callable[..., bytes]) -> None:
+    handler = FailingHandler()
+    serve(handler, b"PUT /f HTTP/1.1\r\nContent-Length: 3\r\n\r\nabc")
+
+    assert len(handler.bodies) == 1
+    file = handler.bodies[0].file
+    assert file is not None and file.closed
@@ -0,0 +1,113 @@
+import gzip
+import os
+import zlib
+from pathlib import Path
+
+import pytest
+
+from corax.handler.static import StaticHandler
+from corax.http.encoding import is_compressible, negotiate_encoding, parse_accept_encoding
+from corax.http.enums import HttpStatus
+from tests.test_static import body_of, request
+
+TEXT = b"hello compression " * 100
+
+@pytest.mark.parametrize("header, available, expected", [
+    ("gzip", ["br", "gzip"], "gzip"),
+    ("gzip, br", ["br", "gzip"], "br"),
+    ("gzip;q=1.0, br;q=0.5", ["br", "gzip"], "gzip"),
+    ("*", ["br", "gzip"], "br"),
+    ("*;q=0, gzip", ["br", "gzip"], "gzip"),
+    ("br;q=0", ["br"], None),
+    ("identity", ["gzip"], None),
+    ("gzip;q=bad", ["gzip"], None),
+    ("", ["gzip"], None),
+    ("gzip", [], None),
+])
+def test_negotiate_encoding(header: str, available: list[str], expected: str | None) -> None:
+    assert negotiate_encoding(header, available) == expected
+
+def test_parse_accept_encoding_is_case_insensitive() -> None:
+    assert parse_accept_encoding(" GZip ; Q=0.5 ,br") == {"gzip": 0.5, "br": 1.0}
+
+@pytest.mark.parametrize("content_type, compressible", [
+    ("text/html; charset=utf-8", True),
+    ("application/json", True),
+    ("application/ld+json", True),
+    ("image/svg+xml", True),
+    ("image/png", False),
+    ("application/octet-stream", False),
+])
+def test_is_compressible(content_type: str, compressible: bool) -> None:
+    assert is_compressible(content_type) is compressible
+
+@pytest.fixture
+def root(tmp_path: Path) -> Path:
+    (tmp_path / "app.js").write_bytes(TEXT)
+    (tmp_path / "image.png").write_bytes(TEXT)
+    return tmp_path
+
+def test_compresses_on_the_fly(root: Path) -> None:
+    handler = StaticHandler(root, compression=True)
+    response = request(handler, "/app.js", "Accept-Encoding: gzip\r\n")
+    body = body_of(response)
+
+    assert response.headers.get("Content-Encoding") == "gzip"
+    assert response.headers.get("Vary") == "Accept-Encoding"
+    assert response.headers.get("Content-Length") == str(len(body))
+    assert response.headers.get("ETag", "").endswith('-gzip"')
+    assert gzip.decompress(body) == TEXT
+
+    deflated = request(handler, "/app.js", "Accept-Encoding: deflate\r\n")
+    assert zlib.decompress(body_of(deflated)) == TEXT
+
+def test_identity_without_accept_encoding_or_for_ranges(root: Path) -> None:
+    handler = StaticHandler(root, compression=True)
+    plain = request(handler, "/app.js")
+    ranged = request(handler, "/app.js", "Accept-Encoding: gzip\r\nRange: bytes=0-4\r\n")
+
+    assert body_of(plain) == TEXT
+    assert plain.headers.get("Vary") == "Accept-Encoding"
+    assert ranged.status is HttpStatus.PARTIAL_CONTENT
+    assert "Content-Encoding" not in ranged.headers
+    assert body_of(ranged) == TEXT[:5]
+
+def test_incompressible_types_are_sent_as_is(root: Path) -> None:
+    response = request(StaticHandler(root, compression=True), "/image.png", "Accept-Encoding: gzip\r\n")
+
+    assert "Content-Encoding" not in response.headers
+    assert "Vary" not in response.headers
+    assert body_of(response) == TEXT
+
+@pytest.mark.parametrize("options", [{}, {"use_index": True, "index_refresh_interval": 0}])
+def test_precompressed_sibling_is_preferred(root: Path, options: dict) -> None:
+    (root / "app.js.br").write_bytes(b"brotli bytes")
+    handler = StaticHandler(root, compression=True, **options)
+
+    response = request(handler, "/app.js", "Accept-Encoding: gzip, br\r\n")
+
+    assert response.headers.get("Content-Encoding") == "br"
+    assert response.headers.get("Content-Type") == "text/javascript"
+    assert body_of(response) == b"brotli bytes"
+
+def test_stale_sibling_is_ignored(root: Path) -> None:
+    sibling = root / "app.js.br"
+    sibling.write_bytes(b"old brotli bytes")
+    os.utime(sibling, ns=(0, 0))
+
+    response = request(StaticHandler(root, compression=True), "/app.js", "Accept-Encoding: br, gzip\r\n")
+
+    assert response.headers.get("Content-Encoding") == "gzip"
+    assert gzip.decompress(body_of(response)) == TEXT
+
+def test_missing_siblings_are_remembered(root: Path) -> None:
+    handler = StaticHandler(root, compression=True)
+    assert request(handler, "/app.js", "Accept-Encoding: br\r\n").headers.get("Content-Encoding") is None
+
+    (root / "app.js.br").write_bytes(b"brotli bytes")
+    assert request(handler, "/app.js", "Accept-Encoding: br\r\n").headers.get("Content-Encoding") is None
+
+    handler.missing_siblings.clear()
+    response = request(handler, "/app.js", "Accept-Encoding: br\r\n")
+    assert response.headers.get("Content-Encoding") == "br"
+    assert body_of(response) == b"brotli bytes"
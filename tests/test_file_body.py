@@ -0,0 +1,60 @@
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from corax.handler.base import BaseHandler
+from corax.http.body import FileBody
+from corax.http.enums import HttpStatus
+from corax.http.headers import Headers
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse
+from tests.helpers import ENGINES
+
+class FileHandler(BaseHandler):
+    def __init__(self, path: Path, header_value: str) -> None:
+        self.path = path
+        self.header_value = header_value
+        self.bodies: list[FileBody] = []
+
+    def handle(self, request: CoraxRequest) -> CoraxResponse:
+        body = FileBody(self.path.open("rb"))
+        self.bodies.append(body)
+        headers = Headers()
+        headers["X-Value"] = self.header_value
+        return CoraxResponse(request.http_version, HttpStatus.OK, headers, body)
+
+@pytest.mark.parametrize("serve", ENGINES)
+def test_file_is_sent_and_closed(serve: Callable[..., bytes], tmp_path: Path) -> None:
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"0123456789")
+    handler = FileHandler(path, "ok")
+
+    data = serve(handler, b"GET / HTTP/1.1\r\nConnection: close\r\n\r\n")
+
+    assert data.endswith(b"\r\n\r\n0123456789")
+    assert handler.bodies[0].file.closed
+
+@pytest.mark.parametrize("serve", ENGINES)
+def test_file_is_closed_when_the_response_is_dropped(serve: Callable[..., bytes], tmp_path: Path) -> None:
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"0123456789")
+    # A lone surrogate can't be encoded, the head fails to serialize.
+    handler = FileHandler(path, "\udc80")
+
+    data = serve(handler, b"GET / HTTP/1.1\r\nConnection: close\r\n\r\n")
+
+    assert data == b""
+    assert handler.bodies[0].file.closed
+
+@pytest.mark.parametrize("serve", ENGINES)
+def test_file_is_closed_unsent_for_head(serve: Callable[..., bytes], tmp_path: Path) -> None:
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"0123456789")
+    handler = FileHandler(path, "ok")
+
+    data = serve(handler, b"HEAD / HTTP/1.1\r\nConnection: close\r\n\r\n")
+
+    assert b"Content-Length: 10\r\n" in data
+    assert data.endswith(b"\r\n\r\n")
+    assert handler.bodies[0].file.closed
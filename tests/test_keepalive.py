@@ -0,0 +1,67 @@
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from corax.config.server import ServerConfig
+from corax.handler.base import BaseHandler
+from corax.handler.static import StaticHandler
+from corax.http.enums import HttpStatus
+from corax.http.headers import Headers
+from corax.http.keepalive import set_connection_headers, wants_keep_alive
+from corax.http.parser import RequestParser
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse
+from corax.server import CoraxServer
+from tests.helpers import ENGINES
+
+class EmptyHandler(BaseHandler):
+    def handle(self, request: CoraxRequest) -> CoraxResponse:
+        return CoraxResponse(request.http_version, HttpStatus.OK, Headers(), b"")
+
+def parse(raw: bytes) -> CoraxRequest:
+    return RequestParser(raw).parse()
+
+def test_http11_is_persistent_unless_closed() -> None:
+    assert wants_keep_alive(parse(b"GET / HTTP/1.1\r\nHost: x\r\n\r\n"))
+    assert not wants_keep_alive(parse(b"GET / HTTP/1.1\r\nConnection: Close\r\n\r\n"))
+
+def test_http10_needs_keep_alive_token() -> None:
+    assert not wants_keep_alive(parse(b"GET / HTTP/1.0\r\n\r\n"))
+    assert wants_keep_alive(parse(b"GET / HTTP/1.0\r\nConnection: keep-alive\r\n\r\n"))
+
+def test_keep_alive_timeout_is_rounded_up() -> None:
+    response = CoraxResponse("1.1", HttpStatus.OK, Headers(), b"")
+    set_connection_headers(response, True, 2.5, 7)
+
+    assert response.headers["Connection"] == "keep-alive"
+    assert response.headers["Keep-Alive"] == "timeout=3, max=7"
+
+def test_closing_drops_keep_alive_header() -> None:
+    response = CoraxResponse("1.1", HttpStatus.OK, Headers(), b"")
+    set_connection_headers(response, True, 5.0, 1)
+    set_connection_headers(response, False, 5.0, 0)
+
+    assert response.headers["Connection"] == "close"
+    assert "Keep-Alive" not in response.headers
+
+def test_inline_sync_server_disables_keep_alive() -> None:
+    assert not CoraxServer("127.0.0.1", 0, EmptyHandler()).config.keep_alive
+    pooled = CoraxServer("127.0.0.1", 0, EmptyHandler(), ServerConfig(worker_threads=2))
+    assert pooled.config.keep_alive
+
+@pytest.mark.parametrize("serve", ENGINES)
+@pytest.mark.parametrize("options", [{}, {"cache_size": 1 << 20}])
+def test_head_response_has_no_body(serve: Callable[..., bytes], options: dict, tmp_path: Path) -> None:
+    (tmp_path / "index.html").write_bytes(b"<p>" + b"x" * 83 + b"</p>")
+    raw = (
+        b"HEAD /index.html HTTP/1.1\r\nHost: x\r\n\r\n"
+        b"GET /nope HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"
+    )
+    data = serve(StaticHandler(tmp_path, **options), raw, ServerConfig(worker_threads=1))
+
+    head, separator, rest = data.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert b"Content-Length: 90\r\n" in head
+    assert rest.startswith(b"HTTP/1.1 404 Not Found\r\n")
+    assert b"x" * 83 not in data
@@ -0,0 +1,22 @@
+import socket
+
+from corax.listener import SocketListener
+
+def test_accept_batch_takes_the_pending_connections() -> None:
+    listener = SocketListener(("::1", 0))
+    listener.start()
+    assert listener.public_connection is not None
+    port = listener.public_connection.getsockname()[1]
+    clients = [socket.create_connection(("::1", port)) for _ in range(3)]
+    try:
+        accepted = listener.accept_batch(2)
+        accepted += listener.accept_batch(8)
+
+        assert len(accepted) == 3
+        for connection, address in accepted:
+            assert address[0] == "::1"
+            connection.close()
+    finally:
+        for client in clients:
+            client.close()
+        listener.close()
@@ -0,0 +1,36 @@
+import threading
+
+from corax.metrics import Counter, Histogram
+
+def test_counter_sums_the_thread_shards() -> None:
+    counter = Counter("hits_total", "Hits.", ("path",))
+
+    def record() -> None:
+        for _ in range(1000):
+            counter.inc(labels=("/",))
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc(0.5, ("/other",))
+
+    assert counter.collect() == {("/",): 4000, ("/other",): 0.5}
+    assert list(counter.render())[2:] == [
+        'hits_total{path="/"} 4000',
+        'hits_total{path="/other"} 0.5',
+    ]
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    histogram = Histogram("latency_seconds", "Latency.", buckets=(0.1, 0.5))
+    for value in (0.05, 0.1, 0.3, 2.0):
+        histogram.observe(value)
+
+    assert list(histogram.render())[2:] == [
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="0.5"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 2.45",
+        "latency_seconds_count 4",
+    ]
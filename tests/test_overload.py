@@ -0,0 +1,109 @@
+import asyncio
+import socket
+from typing import Callable
+
+import pytest
+
+from corax.async_server import AsyncCoraxServer
+from corax.config.server import OverflowPolicy, ServerConfig
+from corax.handler.base import BaseHandler
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse
+from corax.server import CoraxServer
+from tests.helpers import CLIENT_ADDRESS, ENGINES, read_all, text_response
+
+TIMEOUTS = ServerConfig(
+    worker_threads=1,
+    idle_timeout=0.1,
+    header_timeout=0.1,
+    body_timeout=0.1,
+    keep_alive_timeout=0.1
+)
+
+class HelloHandler(BaseHandler):
+    def handle(self, request: CoraxRequest) -> CoraxResponse:
+        return text_response(request, "hello")
+
+@pytest.mark.parametrize("serve", ENGINES)
+def test_idle_connection_is_closed_silently(serve: Callable[..., bytes]) -> None:
+    assert serve(HelloHandler(), b"", TIMEOUTS, half_close=False) == b""
+
+@pytest.mark.parametrize("serve", ENGINES)
+def test_persistent_connection_is_closed_silently_after_keep_alive_timeout(serve: Callable[..., bytes]) -> None:
+    data = serve(HelloHandler(), b"GET / HTTP/1.1\r\nHost: x\r\n\r\n", TIMEOUTS, half_close=False)
+
+    assert data.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert data.count(b"HTTP/1.1") == 1
+
+@pytest.mark.parametrize("serve", ENGINES)
+@pytest.mark.parametrize("raw", [
+    b"GET / HTTP/1.1\r\nHost: x\r\n",
+    b"POST / HTTP/1.1\r\nHost: x\r\nContent-Length: 10\r\n\r\nhello",
+])
+def test_stalled_request_gets_a_408(serve: Callable[..., bytes], raw: bytes) -> None:
+    data = serve(HelloHandler(), raw, TIMEOUTS, half_close=False)
+
+    assert data.startswith(b"HTTP/1.1 408 Request Timeout\r\n")
+    assert b"Connection: close\r\n" in data
+
+def assert_shed(data: bytes) -> None:
+    assert data.startswith(b"HTTP/1.1 503 Service Unavailable\r\n")
+    assert b"Retry-After: 7\r\n" in data
+
+def dispatch(server: CoraxServer) -> bytes:
+    server_side, client = socket.socketpair()
+    with client:
+        server._dispatch(server_side, CLIENT_ADDRESS)
+        client.settimeout(5)
+        return read_all(client)
+
+def test_sync_server_sheds_past_max_connections() -> None:
+    config = ServerConfig(max_connections=1, retry_after=7, metrics=True)
+    server = CoraxServer("127.0.0.1", 0, HelloHandler(), config)
+    assert server.connection_slots is not None
+    assert server.connection_slots.acquire(blocking=False)
+
+    assert_shed(dispatch(server))
+    assert server.metrics is not None
+    assert server.metrics.shed_connections.collect() == {(): 1}
+
+def test_sync_server_sheds_when_the_pool_rejects() -> None:
+    config = ServerConfig(
+        worker_threads=1,
+        queue_limit=1,
+        overflow_policy=OverflowPolicy.REJECT,
+        max_connections=4,
+        retry_after=7
+    )
+    server = CoraxServer("127.0.0.1", 0, HelloHandler(), config)
+    assert server.pool is not None and server.connection_slots is not None
+    queued, client = socket.socketpair()
+    try:
+        # The pool is not started, the first connection fills its queue.
+        server._dispatch(queued, CLIENT_ADDRESS)
+        assert_shed(dispatch(server))
+        # The slot of the shed connection was given back.
+        for _ in range(3):
+            assert server.connection_slots.acquire(blocking=False)
+        assert not server.connection_slots.acquire(blocking=False)
+    finally:
+        queued.close()
+        client.close()
+
+def test_async_server_sheds_past_max_connections() -> None:
+    server = AsyncCoraxServer("127.0.0.1", 0, HelloHandler(), ServerConfig(max_connections=1, retry_after=7))
+    server.active_connections = 1
+    server_side, client = socket.socketpair()
+
+    async def run() -> None:
+        reader, writer = await asyncio.open_connection(sock=server_side)
+        await server._on_connection(reader, writer)
+        await writer.wait_closed()
+
+    with client:
+        asyncio.run(run())
+        client.settimeout(5)
+        assert_shed(read_all(client))
+    assert server.active_connections == 1
+    if server.executor is not None:
+        server.executor.shutdown()
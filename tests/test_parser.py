@@ -0,0 +1,210 @@
+import pytest
+
+from corax.errors.request import (
+    InvalidRequest,
+    PayloadTooLarge,
+    RequestHeaderTooLarge,
+    UnsupportedTransferCoding,
+)
+from corax.http.enums import HttpMethod, ParseStatus
+from corax.http.parser import RequestParser
+
+REQUEST = (
+    b"POST /upload?x=1 HTTP/1.1\r\n"
+    b"Host: example.com\r\n"
+    b"Content-Type: text/plain\r\n"
+    b"Content-Length: 11\r\n"
+    b"\r\n"
+    b"hello world"
+)
+
+CHUNKED = (
+    b"POST /chunks HTTP/1.1\r\n"
+    b"Host: example.com\r\n"
+    b"Transfer-Encoding: chunked\r\n"
+    b"\r\n"
+    b"5;name=value\r\nhello\r\n"
+    b"6\r\n world\r\n"
+    b"0\r\n"
+    b"Trailer: ignored\r\n"
+    b"\r\n"
+)
+
+def test_parse_complete_request() -> None:
+    request = RequestParser(REQUEST).parse()
+
+    assert request.method is HttpMethod.POST
+    assert request.uri == "/upload?x=1"
+    assert request.http_version == "1.1"
+    assert request.headers.get("host") == "example.com"
+    assert request.headers.get("CONTENT-TYPE") == "text/plain"
+    assert request.body.read() == b"hello world"
+
+def test_feed_byte_by_byte() -> None:
+    parser = RequestParser()
+    statuses = [parser.feed(REQUEST[index:index + 1]) for index in range(len(REQUEST))]
+
+    assert statuses[:-1] == [ParseStatus.NEED_MORE] * (len(REQUEST) - 1)
+    assert statuses[-1] is ParseStatus.READY
+    assert parser.pop_request().body.read() == b"hello world"
+    assert parser.idle
+
+def test_pipelined_requests_come_out_in_order() -> None:
+    parser = RequestParser()
+    parser.feed(b"GET /a HTTP/1.1\r\n\r\n" + REQUEST + b"GET /b HTTP/1.1\r\n\r\nGET")
+
+    uris = []
+    while parser.feed() is ParseStatus.READY:
+        uris.append(parser.pop_request().uri)
+
+    assert uris == ["/a", "/upload?x=1", "/b"]
+    assert parser.buffered == 3
+    assert not parser.idle
+
+def test_feed_does_not_keep_the_given_buffer() -> None:
+    buffer = bytearray(REQUEST)
+    parser = RequestParser()
+    with memoryview(buffer) as view:
+        assert parser.feed(view[:40]) is ParseStatus.NEED_MORE
+    buffer[:40] = b"x" * 40
+    assert parser.feed(REQUEST[40:]) is ParseStatus.READY
+
+    assert parser.pop_request().uri == "/upload?x=1"
+
+def test_whole_head_is_parsed_from_a_reused_buffer() -> None:
+    buffer = bytearray(b"??" + REQUEST + b"GET /next HTTP/1.1\r\n")
+    parser = RequestParser()
+    with memoryview(buffer) as view:
+        assert parser.feed(view[2:]) is ParseStatus.READY
+    buffer[:] = b"x" * len(buffer)
+
+    request = parser.pop_request()
+    assert request.headers["Host"] == "example.com"
+    assert request.body.read() == b"hello world"
+    assert parser.buffered == len(b"GET /next HTTP/1.1\r\n")
+
+    assert parser.feed(b"\r\n") is ParseStatus.READY
+    assert parser.pop_request().uri == "/next"
+
+def test_whole_head_over_the_size_limit() -> None:
+    parser = RequestParser(max_header_size=32)
+
+    assert parser.feed(b"GET / HTTP/1.1\r\nX-Long: " + b"a" * 40 + b"\r\n\r\n") is ParseStatus.ERROR
+    assert isinstance(parser.error, RequestHeaderTooLarge)
+
+def test_repeated_identical_content_lengths_are_accepted() -> None:
+    raw = b"POST / HTTP/1.1\r\nContent-Length: 5\r\nContent-Length: 5, 5\r\n\r\nhello"
+
+    assert RequestParser(raw).parse().body.read() == b"hello"
+
+def test_chunked_body_is_decoded() -> None:
+    request = RequestParser(CHUNKED).parse()
+
+    assert request.body.read() == b"hello world"
+    assert len(request.body) == 11
+
+def test_chunked_body_fed_in_pieces() -> None:
+    parser = RequestParser()
+    for index in range(0, len(CHUNKED), 7):
+        status = parser.feed(CHUNKED[index:index + 7])
+
+    assert status is ParseStatus.READY
+    assert parser.pop_request().body.read() == b"hello world"
+
+def test_large_body_spools_to_disk() -> None:
+    body = b"x" * 5000
+    raw = b"PUT /f HTTP/1.1\r\nContent-Length: 5000\r\n\r\n" + body
+    request = RequestParser(raw, body_spool_threshold=1024).parse()
+
+    assert request.body.on_disk
+    assert request.body.read() == body
+
+@pytest.mark.parametrize("size_line", [b"0x5", b"+5", b" 5", b"5 ", b"5_0", b"-5", b"", b"\xb2"])
+def test_invalid_chunk_sizes_are_rejected(size_line: bytes) -> None:
+    raw = b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n" + size_line + b"\r\nhello\r\n0\r\n\r\n"
+    parser = RequestParser()
+
+    assert parser.feed(raw) is ParseStatus.ERROR
+    assert type(parser.error) is InvalidRequest
+
+def test_chunk_size_with_extensions() -> None:
+    raw = b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\nA \t; ext=1\r\n0123456789\r\n0\r\n\r\n"
+
+    assert RequestParser(raw).parse().body.read() == b"0123456789"
+
+@pytest.mark.parametrize("fields", [
+    b"Transfer-Encoding: chunked\r\nTransfer-Encoding: gzip\r\n",
+    b"Transfer-Encoding: gzip\r\nTransfer-Encoding: chunked\r\n",
+    b"Transfer-Encoding: chunked\r\nTransfer-Encoding: chunked\r\n",
+])
+def test_every_transfer_encoding_field_counts(fields: bytes) -> None:
+    parser = RequestParser()
+
+    assert parser.feed(b"POST / HTTP/1.1\r\n" + fields + b"\r\n0\r\n\r\n") is ParseStatus.ERROR
+    assert type(parser.error) is UnsupportedTransferCoding
+
+@pytest.mark.parametrize("raw, error", [
+    (b"GET /\r\n\r\n", InvalidRequest),
+    (b"GET / FTP/1.1\r\n\r\n", InvalidRequest),
+    (b"GET / HTTP/1.1\r\nNoColon\r\n\r\n", InvalidRequest),
+    (b"GET / HTTP/1.1\r\nName : value\r\n\r\n", InvalidRequest),
+    (b"POST / HTTP/1.1\r\nContent-Length: ten\r\n\r\n", InvalidRequest),
+    (b"POST / HTTP/1.1\r\nContent-Length: -1\r\n\r\n", InvalidRequest),
+    (b"POST / HTTP/1.1\r\nContent-Length: +5\r\n\r\nhello", InvalidRequest),
+    (b"POST / HTTP/1.1\r\nContent-Length: 5_0\r\n\r\nhello", InvalidRequest),
+    (b"POST / HTTP/1.1\r\nContent-Length: \xc2\xb2\r\n\r\nhello", InvalidRequest),
+    (b"POST / HTTP/1.1\r\nContent-Length: 5\r\nContent-Length: 0\r\n\r\nhello", InvalidRequest),
+    (b"POST / HTTP/1.1\r\nContent-Length: 5, 0\r\n\r\nhello", InvalidRequest),
+    (b"POST / HTTP/1.1\r\nContent-Length: 99999999999\r\n\r\n", PayloadTooLarge),
+    (b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\nContent-Length: 3\r\n\r\n", InvalidRequest),
+    (b"POST / HTTP/1.1\r\nTransfer-Encoding: gzip\r\n\r\n", UnsupportedTransferCoding),
+    (b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n", InvalidRequest),
+    (b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n3\r\nabcX\r\n", InvalidRequest),
+])
+def test_malformed_requests_are_rejected(raw: bytes, error: type[InvalidRequest]) -> None:
+    parser = RequestParser()
+
+    assert parser.feed(raw) is ParseStatus.ERROR
+    assert type(parser.error) is error
+
+def test_head_size_limit() -> None:
+    parser = RequestParser(max_header_size=64)
+
+    assert parser.feed(b"GET / HTTP/1.1\r\nX-Long: " + b"a" * 100) is ParseStatus.ERROR
+    assert isinstance(parser.error, RequestHeaderTooLarge)
+
+def test_header_count_limit() -> None:
+    headers = b"".join(b"X-%d: v\r\n" % index for index in range(5))
+    parser = RequestParser(max_header_count=4)
+
+    assert parser.feed(b"GET / HTTP/1.1\r\n" + headers + b"\r\n") is ParseStatus.ERROR
+    assert isinstance(parser.error, RequestHeaderTooLarge)
+
+def test_chunked_body_size_limit() -> None:
+    parser = RequestParser(max_body_size=4)
+
+    assert parser.feed(b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n5\r\n") is ParseStatus.ERROR
+    assert isinstance(parser.error, PayloadTooLarge)
+
+def test_parsed_headers_lookup() -> None:
+    parser = RequestParser()
+    parser.feed(
+        b"GET / HTTP/1.1\r\n"
+        b"Host: example.com\r\n"
+        b"Set-Cookie: a=1\r\n"
+        b"X-Other:  spaced  \r\n"
+        b"set-cookie: b=2\r\n"
+        b"\r\n"
+    )
+    headers = parser.parse().headers
+
+    assert headers.get_all("SET-COOKIE") == ["a=1", "b=2"]
+    assert headers["x-other"] == "spaced"
+    assert "Host" in headers
+    assert "Missing" not in headers
+    assert headers.get("Missing", "default") == "default"
+
+    headers["Host"] = "other.example"
+    assert headers["host"] == "other.example"
+    assert headers.get_all("Set-Cookie") == ["a=1", "b=2"]
+    assert len(headers) == 3
@@ -0,0 +1,38 @@
+from typing import Callable
+
+import pytest
+
+from corax.config.server import ServerConfig
+from corax.handler.base import BaseHandler
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse
+from tests.helpers import ENGINES, text_response
+
+CONFIG = ServerConfig(worker_threads=1)
+
+class FailingHandler(BaseHandler):
+    def handle(self, request: CoraxRequest) -> CoraxResponse:
+        if request.uri == "/fail":
+            raise RuntimeError("handler failed")
+        return text_response(request, request.uri)
+
+@pytest.mark.parametrize("serve", ENGINES)
+def test_pipelined_responses_keep_request_order(serve: Callable[..., bytes]) -> None:
+    raw = b"".join(f"GET /{index} HTTP/1.1\r\nHost: x\r\n\r\n".encode() for index in range(5))
+    data = serve(FailingHandler(), raw, CONFIG)
+
+    assert data.count(b"HTTP/1.1 200 OK") == 5
+    bodies = [data.index(f"\r\n\r\n/{index}".encode()) for index in range(5)]
+    assert bodies == sorted(bodies)
+
+@pytest.mark.parametrize("serve", ENGINES)
+def test_completed_responses_are_sent_before_a_failure(serve: Callable[..., bytes]) -> None:
+    raw = (
+        b"GET /first HTTP/1.1\r\nHost: x\r\n\r\n"
+        b"GET /second HTTP/1.1\r\nHost: x\r\n\r\n"
+        b"GET /fail HTTP/1.1\r\nHost: x\r\n\r\n"
+    )
+    data = serve(FailingHandler(), raw, CONFIG)
+
+    assert data.count(b"HTTP/1.1 200 OK") == 2
+    assert data.endswith(b"/second")
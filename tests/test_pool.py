@@ -0,0 +1,61 @@
+import threading
+import time
+from typing import Callable
+
+from corax.config.server import OverflowPolicy
+from corax.pool import WorkerPool
+
+def test_queued_tasks_run_before_shutdown() -> None:
+    done: list[int] = []
+    release = threading.Event()
+    pool = WorkerPool(2, 4)
+    pool.start()
+    def task_for(index: int) -> Callable[[], None]:
+        def task() -> None:
+            release.wait()
+            done.append(index)
+        return task
+
+    for index in range(6):
+        assert pool.submit(task_for(index))
+
+    release.set()
+    pool.shutdown()
+
+    assert sorted(done) == list(range(6))
+    assert pool.threads == []
+
+def test_shutdown_with_full_queue_does_not_block() -> None:
+    release = threading.Event()
+    pool = WorkerPool(3, 1, OverflowPolicy.REJECT)
+    pool.start()
+
+    def task() -> None:
+        release.wait()
+
+    while pool.submit(task):
+        pass
+
+    stopper = threading.Thread(target=pool.shutdown)
+    stopper.start()
+    time.sleep(0.05)
+    release.set()
+    stopper.join(2.0)
+
+    assert not stopper.is_alive()
+
+def test_shutdown_gives_up_on_stuck_workers() -> None:
+    release = threading.Event()
+    pool = WorkerPool(1, 1)
+    pool.start()
+
+    def task() -> None:
+        release.wait()
+
+    pool.submit(task)
+
+    started = time.monotonic()
+    pool.shutdown(timeout=0.1)
+
+    assert time.monotonic() - started < 1.0
+    release.set()
@@ -0,0 +1,39 @@
+import os
+import signal
+from pathlib import Path
+
+from corax.prefork import PreforkSupervisor
+
+def test_restarted_worker_keeps_its_index(tmp_path: Path) -> None:
+    log = tmp_path / "workers"
+
+    def worker(index: int) -> None:
+        with log.open("a") as file:
+            file.write(f"{index}\n")
+        starts = log.read_text().split()
+        if index == 1 and starts.count("1") == 1:
+            raise RuntimeError("first start of worker 1 crashes")
+        if len(starts) == 3:
+            os.kill(os.getppid(), signal.SIGTERM)
+        signal.pause()
+
+    supervisor = PreforkSupervisor(2, worker)
+    supervisor.MIN_WORKER_LIFETIME = 0.0
+    supervisor.run()
+
+    assert sorted(log.read_text().split()) == ["0", "1", "1"]
+    assert supervisor.children == {}
+
+def test_terminated_worker_runs_its_cleanup(tmp_path: Path) -> None:
+    log = tmp_path / "workers"
+
+    def worker(index: int) -> None:
+        try:
+            os.kill(os.getppid(), signal.SIGTERM)
+            signal.pause()
+        finally:
+            log.write_text("cleaned up")
+
+    PreforkSupervisor(1, worker).run()
+
+    assert log.read_text() == "cleaned up"
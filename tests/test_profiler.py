@@ -0,0 +1,21 @@
+import os
+import signal
+import time
+from pathlib import Path
+
+from corax.profiler import SamplingProfiler
+
+def test_signal_starts_a_run_while_the_lock_is_held(tmp_path: Path) -> None:
+    profiler = SamplingProfiler(interval=0.001, directory=tmp_path)
+    previous = signal.getsignal(signal.SIGUSR1)
+    profiler.install_signal(signal.SIGUSR1, 0.05)
+    try:
+        with profiler.lock:
+            os.kill(os.getpid(), signal.SIGUSR1)
+        deadline = time.monotonic() + 5.0
+        while not list(tmp_path.glob("*.folded")) and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
+
+    assert len(list(tmp_path.glob("corax-profile-*.folded"))) == 1
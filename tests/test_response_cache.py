@@ -0,0 +1,205 @@
+import threading
+import time
+
+import pytest
+
+from corax.handler.base import BaseHandler
+from corax.handler.response_cache import CachingHandler
+from corax.http.enums import HttpStatus
+from corax.http.parser import RequestParser
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse
+from tests.helpers import text_response
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 21 Oct 2026 07:28:00 GMT"
+
+class CountingHandler(BaseHandler):
+    """
+        Answers with the number of calls so far, after `gate` is set, with
+        the given extra response headers.
+    """
+    def __init__(self, **headers: str) -> None:
+        self.calls = 0
+        self.headers = {name.replace("_", "-"): value for name, value in headers.items()}
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def handle(self, request: CoraxRequest) -> CoraxResponse:
+        self.gate.wait(5)
+        self.calls += 1
+        response = text_response(request, f"call {self.calls} {request.headers.get('Accept-Language')}")
+        for name, value in self.headers.items():
+            response.headers[name] = value
+        return response
+
+def get(handler: BaseHandler, uri: str = "/page", headers: str = "", method: str = "GET") -> CoraxResponse:
+    raw = f"{method} {uri} HTTP/1.1\r\nHost: example.com\r\n{headers}\r\n".encode("utf-8")
+    return handler.handle(RequestParser(raw).parse())
+
+def text_of(response: CoraxResponse) -> str:
+    assert isinstance(response.body, bytes)
+    return response.body.decode("utf-8")
+
+def test_fresh_responses_are_served_from_the_cache() -> None:
+    inner = CountingHandler()
+    cache = CachingHandler(inner, default_ttl=60)
+
+    first = get(cache)
+    second = get(cache)
+
+    assert text_of(first) == text_of(second) == "call 1 None"
+    assert second.headers["Age"] == "0"
+    assert second.headers is not first.headers
+    assert inner.calls == 1
+
+def test_entries_expire_after_their_ttl() -> None:
+    inner = CountingHandler()
+    cache = CachingHandler(inner, default_ttl=0.05)
+
+    assert text_of(get(cache)) == "call 1 None"
+    assert text_of(get(cache)) == "call 1 None"
+    time.sleep(0.1)
+    assert text_of(get(cache)) == "call 2 None"
+
+def test_concurrent_misses_are_coalesced() -> None:
+    inner = CountingHandler()
+    inner.gate.clear()
+    cache = CachingHandler(inner, default_ttl=60)
+    responses: list[CoraxResponse] = []
+
+    threads = [threading.Thread(target=lambda: responses.append(get(cache))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while not cache.flights and time.monotonic() < deadline:
+        time.sleep(0.001)
+    time.sleep(0.05)
+    inner.gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert inner.calls == 1
+    assert [text_of(response) for response in responses] == ["call 1 None"] * 8
+
+def test_vary_rekeys_the_request() -> None:
+    inner = CountingHandler(Vary="Accept-Language")
+    cache = CachingHandler(inner, default_ttl=60)
+
+    assert text_of(get(cache, headers="Accept-Language: en\r\n")) == "call 1 en"
+    assert text_of(get(cache, headers="Accept-Language: fr\r\n")) == "call 2 fr"
+    assert text_of(get(cache, headers="Accept-Language: en\r\n")) == "call 1 en"
+    assert text_of(get(cache, headers="Accept-Language: fr\r\n")) == "call 2 fr"
+    assert inner.calls == 2
+
+def test_coalesced_request_with_another_vary_value_is_rekeyed() -> None:
+    inner = CountingHandler(Vary="Accept-Language")
+    inner.gate.clear()
+    cache = CachingHandler(inner, default_ttl=60)
+    responses: dict[str, CoraxResponse] = {}
+
+    def fetch(language: str) -> None:
+        responses[language] = get(cache, headers=f"Accept-Language: {language}\r\n")
+
+    leader = threading.Thread(target=fetch, args=("en",))
+    leader.start()
+    deadline = time.monotonic() + 5
+    while not cache.flights and time.monotonic() < deadline:
+        time.sleep(0.001)
+    follower = threading.Thread(target=fetch, args=("fr",))
+    follower.start()
+    time.sleep(0.05)
+    inner.gate.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert text_of(responses["en"]) == "call 1 en"
+    assert text_of(responses["fr"]) == "call 2 fr"
+
+@pytest.mark.parametrize("method, headers", [
+    ("POST", ""),
+    ("GET", "Authorization: Bearer token\r\n"),
+    ("GET", "Cache-Control: no-store\r\n"),
+    ("GET", "Range: bytes=0-3\r\n"),
+])
+def test_requests_bypassing_the_cache(method: str, headers: str) -> None:
+    inner = CountingHandler()
+    cache = CachingHandler(inner, default_ttl=60)
+    get(cache)
+
+    assert text_of(get(cache, headers=headers, method=method)) == "call 2 None"
+    assert text_of(get(cache)) == "call 1 None"
+
+def test_no_cache_request_refreshes_the_entry() -> None:
+    inner = CountingHandler()
+    cache = CachingHandler(inner, default_ttl=60)
+    get(cache)
+
+    assert text_of(get(cache, headers="Cache-Control: no-cache\r\n")) == "call 2 None"
+    assert text_of(get(cache)) == "call 2 None"
+
+@pytest.mark.parametrize("headers", [
+    {"Cache_Control": "private"},
+    {"Cache_Control": "no-store"},
+    {"Set_Cookie": "session=1"},
+    {"Vary": "*"},
+])
+def test_uncacheable_responses_are_not_stored(headers: dict[str, str]) -> None:
+    inner = CountingHandler(**headers)
+    cache = CachingHandler(inner, default_ttl=60)
+
+    get(cache)
+    get(cache)
+    assert inner.calls == 2
+
+def test_uncacheable_status_is_not_stored() -> None:
+    class FailingHandler(CountingHandler):
+        def handle(self, request: CoraxRequest) -> CoraxResponse:
+            self.calls += 1
+            return text_response(request, "error", HttpStatus.INTERNAL_SERVER_ERROR)
+
+    inner = FailingHandler()
+    cache = CachingHandler(inner, default_ttl=60)
+    get(cache)
+    get(cache)
+    assert inner.calls == 2
+
+@pytest.mark.parametrize("headers", [
+    f"If-None-Match: {ETAG}\r\n",
+    f'If-None-Match: "other", W/{ETAG}\r\n',
+    f"If-Modified-Since: {LAST_MODIFIED}\r\n",
+])
+def test_conditional_requests_get_a_304_from_the_cache(headers: str) -> None:
+    inner = CountingHandler(ETag=ETAG, Last_Modified=LAST_MODIFIED, Cache_Control="max-age=60")
+    cache = CachingHandler(inner)
+    get(cache)
+
+    response = get(cache, headers=headers)
+    assert response.status is HttpStatus.NOT_MODIFIED
+    assert response.body == b""
+    assert response.headers["ETag"] == ETAG
+    assert response.headers["Last-Modified"] == LAST_MODIFIED
+    assert response.headers["Cache-Control"] == "max-age=60"
+    assert "Content-Length" not in response.headers
+    assert inner.calls == 1
+
+@pytest.mark.parametrize("headers", [
+    'If-None-Match: "other"\r\n',
+    "If-Modified-Since: Tue, 20 Oct 2026 07:28:00 GMT\r\n",
+    f'If-None-Match: "other"\r\nIf-Modified-Since: {LAST_MODIFIED}\r\n',
+])
+def test_failed_conditions_get_the_full_response(headers: str) -> None:
+    inner = CountingHandler(ETag=ETAG, Last_Modified=LAST_MODIFIED)
+    cache = CachingHandler(inner, default_ttl=60)
+    get(cache)
+
+    response = get(cache, headers=headers)
+    assert response.status is HttpStatus.OK
+    assert text_of(response) == "call 1 None"
+
+def test_conditional_miss_is_answered_from_the_stored_response() -> None:
+    inner = CountingHandler(ETag=ETAG)
+    cache = CachingHandler(inner, default_ttl=60)
+
+    assert get(cache, headers=f"If-None-Match: {ETAG}\r\n").status is HttpStatus.NOT_MODIFIED
+    assert text_of(get(cache)) == "call 1 None"
@@ -0,0 +1,99 @@
+import pytest
+
+from corax.handler.base import BaseHandler
+from corax.handler.router import Router
+from corax.http.enums import HttpMethod, HttpStatus
+from corax.http.parser import RequestParser
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse
+from tests.helpers import text_response
+
+class NamedHandler(BaseHandler):
+    """
+        Answers with its name, the URI and the path parameters it received.
+    """
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def handle(self, request: CoraxRequest) -> CoraxResponse:
+        params = ",".join(f"{key}={value}" for key, value in sorted(request.params.items()))
+        return text_response(request, f"{self.name} {request.uri} {params}".rstrip())
+
+def route(router: Router, uri: str, method: str = "GET") -> CoraxResponse:
+    raw = f"{method} {uri} HTTP/1.1\r\nHost: example.com\r\n\r\n".encode("utf-8")
+    return router.handle(RequestParser(raw).parse())
+
+def text_of(response: CoraxResponse) -> str:
+    assert isinstance(response.body, bytes)
+    return response.body.decode("utf-8")
+
+@pytest.fixture
+def router() -> Router:
+    router = Router()
+    router.add("/", NamedHandler("index"))
+    router.add("/users/{id}", NamedHandler("user"), (HttpMethod.GET, HttpMethod.PUT))
+    router.add("/users/me", NamedHandler("create-me"), (HttpMethod.POST,))
+    router.add("/users/{id}/posts/{post}", NamedHandler("post"))
+    router.add("/users/admin/posts", NamedHandler("admin-posts"))
+    router.mount("/static", NamedHandler("static"))
+    router.mount("/static/vendor", NamedHandler("vendor"))
+    return router
+
+def test_static_segments_take_precedence(router: Router) -> None:
+    assert text_of(route(router, "/users/me", "POST")) == "create-me /users/me"
+    assert text_of(route(router, "/users/42")) == "user /users/42 id=42"
+    assert text_of(route(router, "/")) == "index /"
+
+def test_static_segment_without_the_method_falls_back_to_the_parameter(router: Router) -> None:
+    assert text_of(route(router, "/users/me")) == "user /users/me id=me"
+    assert text_of(route(router, "/users/me", "PUT")) == "user /users/me id=me"
+
+def test_dead_end_static_branch_is_backtracked_from(router: Router) -> None:
+    response = route(router, "/users/admin/posts/7")
+    assert text_of(response) == "post /users/admin/posts/7 id=admin,post=7"
+
+def test_parameters_are_unquoted(router: Router) -> None:
+    assert text_of(route(router, "/users/a%20b")) == "user /users/a%20b id=a b"
+
+def test_head_falls_back_to_get(router: Router) -> None:
+    assert text_of(route(router, "/users/42", "HEAD")) == "user /users/42 id=42"
+
+def test_method_not_allowed_lists_every_matching_route(router: Router) -> None:
+    response = route(router, "/users/me", "DELETE")
+
+    assert response.status is HttpStatus.METHOD_NOT_ALLOWED
+    assert response.headers["Allow"] == "GET, POST, PUT, HEAD"
+    assert "Connection" not in response.headers
+
+def test_method_not_allowed_is_not_passed_to_a_mount() -> None:
+    router = Router()
+    router.add("/static/app.js", NamedHandler("app"))
+    router.mount("/static", NamedHandler("static"))
+
+    response = route(router, "/static/app.js", "POST")
+    assert response.status is HttpStatus.METHOD_NOT_ALLOWED
+    assert response.headers["Allow"] == "GET, HEAD"
+
+def test_deepest_mount_gets_the_rest_of_the_path(router: Router) -> None:
+    assert text_of(route(router, "/static/css/site.css?v=2")) == "static /css/site.css?v=2"
+    assert text_of(route(router, "/static/vendor/lib.js")) == "vendor /lib.js"
+    assert text_of(route(router, "/static")) == "static /"
+
+def test_unmatched_paths_are_not_found(router: Router) -> None:
+    response = route(router, "/missing")
+    assert response.status is HttpStatus.NOT_FOUND
+    assert "Connection" not in response.headers
+    assert route(router, "/users/42/posts").status is HttpStatus.NOT_FOUND
+
+    fallback = Router(not_found=NamedHandler("fallback"))
+    assert text_of(route(fallback, "/missing")) == "fallback /missing"
+
+def test_conflicting_routes_are_rejected(router: Router) -> None:
+    with pytest.raises(ValueError):
+        router.add("/users/{name}", NamedHandler("other"))
+    with pytest.raises(ValueError):
+        router.add("/users/{id}", NamedHandler("other"), (HttpMethod.PUT,))
+    with pytest.raises(ValueError):
+        router.mount("/static", NamedHandler("other"))
+    with pytest.raises(ValueError):
+        router.add("users", NamedHandler("other"))
@@ -0,0 +1,62 @@
+import io
+from typing import Callable
+
+import pytest
+
+from corax.handler.base import BaseHandler
+from corax.http.enums import HttpStatus
+from corax.http.headers import Headers
+from corax.http.request import CoraxRequest
+from corax.http.response import CoraxResponse, ResponseBody
+from corax.http.serializer import ResponseSerializer
+from tests.helpers import ENGINES
+
+def serializer(body: ResponseBody, http_version: str = "1.1", status: HttpStatus = HttpStatus.OK) -> ResponseSerializer:
+    return ResponseSerializer(CoraxResponse(http_version, status, Headers(), body))
+
+def test_bytes_body_gets_a_content_length() -> None:
+    raw = serializer(b"hello").serialize()
+
+    assert raw == b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nhello"
+
+def test_seekable_stream_gets_a_content_length() -> None:
+    stream = io.BytesIO(b"0123456789")
+    stream.seek(4)
+    response_serializer = serializer(stream)
+
+    assert response_serializer.response.headers.get("Content-Length") == "6"
+    assert not response_serializer.chunked
+    assert response_serializer.serialize().endswith(b"\r\n\r\n456789")
+
+def test_iterable_body_is_chunked() -> None:
+    response_serializer = serializer(iter([b"hello", b"", b" world"]))
+
+    assert response_serializer.chunked
+    assert response_serializer.response.headers.get("Transfer-Encoding") == "chunked"
+    assert b"".join(response_serializer.iter_body()) == b"5\r\nhello\r\n6\r\n world\r\n0\r\n\r\n"
+
+def test_http10_stream_is_delimited_by_close() -> None:
+    response_serializer = serializer(iter([b"a", b"b"]), http_version="1.0")
+
+    assert response_serializer.delimited_by_close
+    assert "Transfer-Encoding" not in response_serializer.response.headers
+    assert b"".join(response_serializer.iter_body()) == b"ab"
+
+@pytest.mark.parametrize("status", [HttpStatus.NO_CONTENT, HttpStatus.NOT_MODIFIED])
+def test_bodyless_statuses_get_no_framing(status: HttpStatus) -> None:
+    raw = serializer(b"", status=status).serialize()
+
+    assert b"Content-Length" not in raw
+    assert b"Transfer-Encoding" not in raw
+
+class StreamingHandler(BaseHandler):
+    def handle(self, request: CoraxRequest) -> CoraxResponse:
+        return CoraxResponse(request.http_version, HttpStatus.OK, Headers(), iter([b"abc", b"defg"]))
+
+@pytest.mark.parametrize("serve", ENGINES)
+def test_streamed_response_on_the_wire(serve: Callable[..., bytes]) -> None:
+    data = serve(StreamingHandler(), b"GET / HTTP/1.1\r\nConnection: close\r\n\r\n")
+
+    head, _, body = data.partition(b"\r\n\r\n")
+    assert b"Transfer-Encoding: chunked" in head
+    assert body == b"3\r\nabc\r\n4\r\ndefg\r\n0\r\n\r\n"
@@ -0,0 +1,202 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from corax.handler.static import StaticHandler
+from corax.http.body import FileBody
+from corax.http.enums import HttpStatus
+from corax.http.parser import RequestParser
+from corax.http.ranges import MultipartRanges, parse_range_header
+from corax.http.response import CoraxResponse, close_body
+
+def request(handler: StaticHandler, uri: str, headers: str = "", method: str = "GET") -> CoraxResponse:
+    raw = f"{method} {uri} HTTP/1.1\r\nHost: x\r\n{headers}\r\n".encode()
+    return handler.handle(RequestParser(raw).parse())
+
+def body_of(response: CoraxResponse) -> bytes:
+    body = response.body
+    if isinstance(body, FileBody):
+        data = b"".join(body)
+        body.close()
+        return data
+    assert isinstance(body, bytes)
+    return body
+
+@pytest.fixture
+def root(tmp_path: Path) -> Path:
+    (tmp_path / "index.html").write_bytes(b"<h1>home</h1>")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "index.html").write_bytes(b"<h1>docs</h1>")
+    (tmp_path / "f.txt").write_bytes(b"x" * 100)
+    (tmp_path.parent / "secret.txt").write_bytes(b"secret")
+    return tmp_path
+
+@pytest.mark.parametrize("options", [{}, {"cache_size": 1 << 20}, {"use_index": True, "index_refresh_interval": 0}])
+def test_serves_files_and_directory_indexes(root: Path, options: dict) -> None:
+    handler = StaticHandler(root, **options)
+
+    response = request(handler, "/f.txt")
+    assert response.status is HttpStatus.OK
+    assert response.headers.get("Content-Type") == "text/plain"
+    assert body_of(response) == b"x" * 100
+    assert body_of(request(handler, "/")) == b"<h1>home</h1>"
+    assert body_of(request(handler, "/docs")) == b"<h1>docs</h1>"
+
+@pytest.mark.parametrize("options", [{}, {"cache_size": 1 << 20}, {"use_index": True, "index_refresh_interval": 0}])
+@pytest.mark.parametrize("uri", ["/../secret.txt", "/docs/../../secret.txt", "/missing", "secret.txt"])
+def test_paths_outside_the_root_are_not_found(root: Path, options: dict, uri: str) -> None:
+    response = request(StaticHandler(root, **options), uri)
+
+    assert response.status is HttpStatus.NOT_FOUND
+
+def test_cache_follows_changes_on_disk(root: Path) -> None:
+    handler = StaticHandler(root, cache_size=1 << 20)
+    path = root / "f.txt"
+    assert body_of(request(handler, "/f.txt")) == b"x" * 100
+    assert body_of(request(handler, "/f.txt")) == b"x" * 100
+
+    path.write_bytes(b"changed")
+    os.utime(path, ns=(0, 1_000_000_000))
+    response = request(handler, "/f.txt")
+    assert body_of(response) == b"changed"
+    assert response.headers.get("Content-Length") == "7"
+
+    path.unlink()
+    assert request(handler, "/f.txt").status is HttpStatus.NOT_FOUND
+
+def test_cache_hit_does_not_resolve_the_path_again(root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    handler = StaticHandler(root, cache_size=1 << 20)
+    close_body(request(handler, "/f.txt"))
+
+    def fail(uri: str) -> None:
+        raise AssertionError("the path was resolved again")
+
+    monkeypatch.setattr(handler, "_get_safe_path", fail)
+    assert body_of(request(handler, "/f.txt")) == b"x" * 100
+
+def test_validators_and_cache_control(root: Path) -> None:
+    handler = StaticHandler(root, cache_control=[("/docs/*", "max-age=60"), ("*", "no-cache")])
+
+    response = request(handler, "/f.txt")
+    close_body(response)
+    assert response.headers.get("ETag", "").startswith('"')
+    assert response.headers.get("Last-Modified", "").endswith(" GMT")
+    assert response.headers.get("Cache-Control") == "no-cache"
+    assert request(handler, "/docs/").headers.get("Cache-Control") == "max-age=60"
+
+@pytest.mark.parametrize("condition, not_modified", [
+    ("If-None-Match: {etag}", True),
+    ("If-None-Match: W/{etag}", True),
+    ('If-None-Match: "other", {etag}', True),
+    ("If-None-Match: *", True),
+    ('If-None-Match: "other"', False),
+    ("If-Modified-Since: {last_modified}", True),
+    ("If-Modified-Since: Thu, 01 Jan 1970 00:00:00 GMT", False),
+    ("If-Modified-Since: not a date", False),
+    ('If-None-Match: "other"\r\nIf-Modified-Since: {last_modified}', False),
+])
+def test_conditional_get(root: Path, condition: str, not_modified: bool) -> None:
+    handler = StaticHandler(root)
+    full = request(handler, "/f.txt")
+    close_body(full)
+    etag = full.headers.get("ETag")
+    last_modified = full.headers.get("Last-Modified")
+
+    response = request(handler, "/f.txt", condition.format(etag=etag, last_modified=last_modified) + "\r\n")
+    close_body(response)
+
+    if not_modified:
+        assert response.status is HttpStatus.NOT_MODIFIED
+        assert response.body == b""
+        assert response.headers.get("ETag") == etag
+        assert response.headers.get("Last-Modified") == last_modified
+    else:
+        assert response.status is HttpStatus.OK
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-9", [(0, 9)]),
+    ("bytes=90-", [(90, 99)]),
+    ("bytes=-10", [(90, 99)]),
+    ("bytes=95-200", [(95, 99)]),
+    ("bytes=0-0, -1", [(0, 0), (99, 99)]),
+    ("bytes=100-", []),
+    ("bytes=-0", []),
+    ("bytes=5-1", None),
+    ("bytes=a-b", None),
+    ("bytes=\u00b2-", None),
+    ("bytes=0-\u0661", None),
+    ("items=0-1", None),
+    ("bytes=" + ",".join(["0-1"] * 17), None),
+])
+def test_parse_range_header(header: str, expected: list | None) -> None:
+    assert parse_range_header(header, 100) == expected
+
+def test_malformed_range_is_ignored(root: Path) -> None:
+    response = request(StaticHandler(root), "/f.txt", "Range: bytes=\u00b2-\r\n")
+
+    assert response.status is HttpStatus.OK
+    assert "Content-Range" not in response.headers
+
+@pytest.mark.parametrize("options", [{}, {"cache_size": 1 << 20}])
+def test_single_range(root: Path, options: dict) -> None:
+    (root / "digits.txt").write_bytes(bytes(range(48, 58)) * 10)
+    response = request(StaticHandler(root, **options), "/digits.txt", "Range: bytes=3-6\r\n")
+
+    assert response.status is HttpStatus.PARTIAL_CONTENT
+    assert response.headers.get("Content-Range") == "bytes 3-6/100"
+    assert response.headers.get("Content-Length") == "4"
+    assert body_of(response) == b"3456"
+
+@pytest.mark.parametrize("options", [{}, {"cache_size": 1 << 20}])
+def test_multiple_ranges(root: Path, options: dict) -> None:
+    (root / "digits.txt").write_bytes(bytes(range(48, 58)) * 10)
+    response = request(StaticHandler(root, **options), "/digits.txt", "Range: bytes=0-1, 98-\r\n")
+
+    body = response.body
+    assert isinstance(body, MultipartRanges)
+    data = b"".join(body)
+    body.close()
+    assert response.status is HttpStatus.PARTIAL_CONTENT
+    assert response.headers.get("Content-Type") == body.content_type
+    assert response.headers.get("Content-Length") == str(len(data))
+    assert b"Content-Range: bytes 0-1/100\r\n\r\n01\r\n" in data
+    assert b"Content-Range: bytes 98-99/100\r\n\r\n89\r\n" in data
+    assert data.endswith(f"--{body.boundary}--\r\n".encode())
+
+def test_unsatisfiable_range(root: Path) -> None:
+    response = request(StaticHandler(root), "/f.txt", "Range: bytes=500-\r\n")
+
+    assert response.status is HttpStatus.RANGE_NOT_SATISFIABLE
+    assert response.headers.get("Content-Range") == "bytes */100"
+
+def test_range_is_ignored_when_if_range_does_not_match(root: Path) -> None:
+    handler = StaticHandler(root)
+    response = request(handler, "/f.txt", 'Range: bytes=0-1\r\nIf-Range: "stale"\r\n')
+    close_body(response)
+    assert response.status is HttpStatus.OK
+
+    etag = response.headers.get("ETag")
+    response = request(handler, "/f.txt", f"Range: bytes=0-1\r\nIf-Range: {etag}\r\n")
+    close_body(response)
+    assert response.status is HttpStatus.PARTIAL_CONTENT
+
+def test_range_is_ignored_on_head(root: Path) -> None:
+    response = request(StaticHandler(root), "/f.txt", "Range: bytes=0-1\r\n", method="HEAD")
+    close_body(response)
+
+    assert response.status is HttpStatus.OK
+
+@pytest.mark.parametrize("name, content_type", [
+    ("backup.tar.gz", "application/gzip"),
+    ("data.tar.xz", "application/x-xz"),
+    ("page.html", "text/html"),
+    ("blob", "application/octet-stream"),
+])
+def test_content_type_of_compressed_files(root: Path, name: str, content_type: str) -> None:
+    (root / name).write_bytes(b"data")
+    response = request(StaticHandler(root), "/" + name)
+    close_body(response)
+
+    assert response.headers.get("Content-Type") == content_type
+    assert "Content-Encoding" not in response.headers